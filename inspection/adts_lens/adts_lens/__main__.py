@@ -1,4 +1,8 @@
+from adts_lens.aac_remuxer import AccessUnits
 from adts_lens.adts_format import AdtsFormat, FrameHeader
+from adts_lens.adts_resync import AdtsResync
+from adts_lens.timing_index import TimingIndex
+import mmap
 import os
 from enum import Enum
 import sys
@@ -6,30 +10,51 @@ from typing import Optional
 
 class AacLens:
 
-    def __init__(self, filename: str):
+    MAX_PRINTED_SPANS: int = 20
+    PEAK_WINDOW: float = 1.0 # seconds
+
+    def __init__(self, filename: str, use_mmap: bool = False):
         self.frame_offsets: [int] = []
         self.data = None
+        self.mmap = None
         self.headers = []
+        self.timing_index = None
+        self.corrupt_spans = []
+        self.crc_error_count = 0
+        self.use_mmap = use_mmap
         self.handle_file(filename)
 
     def handle_file(self, filename: str):
-        # read file
+        # read file or map it, mapped data is paged in by the os on access.
+        # Empty files can not be mapped.
         with open(filename, 'rb') as file:
-            self.data = file.read()
+            if self.use_mmap and os.fstat(file.fileno()).st_size > 0:
+                self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = memoryview(self.mmap)
+            else:
+                self.data = file.read()
 
-            print('File length:', len(self.data))
+        print('File length:', len(self.data))
 
-            beginning = self.data[0:8]
-            print('File begins with:', beginning)
-            
-            # find frame headers
-            self.headers = self.__get_headers(self.data)
+        beginning = bytes(self.data[0:8])
+        print('File begins with:', beginning)
+        
+        # find frame headers
+        self.headers = self.__get_headers(self.data)
+
+    def close(self):
+        # release mapped file, frame views must not be used afterwards. While
+        # views are still alive the mapping is closed when they are freed.
+        if self.mmap:
+            try:
+                self.data.release()
+                self.mmap.close()
+            except BufferError:
+                pass
+            self.mmap = None
+            self.data = None
 
     def print_summary(self, log_filename: str = ''):
-        log_file = None
-        if log_filename:
-            log_file = open(log_filename, 'a+')
-
         message = '----------\n'
         
         message += 'Frame headers: ' + str(len(self.headers)) + '\n'
@@ -47,17 +72,31 @@ class AacLens:
                 incomplete_frame_count += 1
             new_offset = header.offset + header.frame_size
         message += 'incomplete frames: ' + str(incomplete_frame_count) + '\n'
+
+        corrupt_size = sum(span.size for span in self.corrupt_spans)
+        timing_index = self.timing_index
+        message += 'duration: {0:.3f} s\n'.format(timing_index.duration())
+        message += 'bitrate: {0:.0f} bps average, {1:.0f} bps peak ({2} s window)\n'.format(timing_index.get_average_bitrate(), timing_index.get_peak_bitrate(self.PEAK_WINDOW), self.PEAK_WINDOW)
+        message += 'crc errors: ' + str(self.crc_error_count) + '\n'
+        message += 'corrupt spans: ' + str(len(self.corrupt_spans)) + ' (' + str(corrupt_size) + ' bytes)\n'
+        for span in self.corrupt_spans[:self.MAX_PRINTED_SPANS]:
+            message += '  {0}-{1}: {2}\n'.format(span.offset, span.offset + span.size, span.reason.value)
+        if len(self.corrupt_spans) > self.MAX_PRINTED_SPANS:
+            message += '  ...\n'
         
         print(message)
         
         # write to log file
-        if log_file:
-            log_file.write(message)
+        if log_filename:
+            with open(log_filename, 'a+') as log_file:
+                log_file.write(message)
 
     def print_headers(self, log_filename: str = ''):
-        log_file = None
+        # write to log file
         if log_filename:
-            log_file = open(log_filename, 'w')
+            with open(log_filename, 'w') as log_file:
+                for header in self.headers:
+                    log_file.write(header.format_string())
 
         if not self.headers:
             print ('No headers found')
@@ -65,10 +104,6 @@ class AacLens:
 
         for header in self.headers:
             header.print_me()
-            
-            # write to log file
-            if log_file:
-                log_file.write(header.format_string())
 
     def print_no_headers(self, log_filename: str):
         message = 'No headers found'
@@ -76,38 +111,49 @@ class AacLens:
         if not self.headers:
             print (message)
         
-        log_file = None
-        if log_filename:
-            log_file = open(log_filename, 'w')
-
         # write to log file
-        if log_file:
-            log_file.write(message)
+        if log_filename:
+            with open(log_filename, 'w') as log_file:
+                log_file.write(message)
 
-    def write_frames(self, path: str, base_filename: str):
+    def write_frames(self, path: str, base_filename: str, raw: bool = False):
+        # raw: access units without adts header, one file per raw data block
         frames_path = '{0}/frames/'.format(path)
         try:
             os.mkdir(frames_path)
         except Exception as _:
             pass
 
+        view = memoryview(self.data) # slices without copy
         index = 0
         for header in self.headers:
-            filename = '{0}{1}_{2}'.format(frames_path, base_filename, index)
-            with open(filename, 'wb') as file:
-                file.write(self.data[header.offset : header.offset + header.frame_size])
-            index += 1
+            if raw:
+                units = AccessUnits.get_access_units(view, header)
+            else:
+                units = [view[header.offset : header.offset + header.frame_size]]
+            for unit in units:
+                filename = '{0}{1}_{2}'.format(frames_path, base_filename, index)
+                with open(filename, 'wb') as file:
+                    file.write(unit)
+                unit.release()
+                index += 1
+        view.release()
 
     # headers
     
     def __get_headers(self, data: bytearray):
-        return AdtsFormat.get_all_headers(data)
+        # frames which pass consistency and crc checks, the rest is reported as corrupt
+        result = AdtsResync.scan(data)
+        self.corrupt_spans = result.corrupt_spans
+        self.crc_error_count = result.crc_error_count
+        self.timing_index = TimingIndex(result.offsets, result.words)
+        return AdtsFormat.get_headers(data, result.offsets, result.words)
         
 # Main
 
 def main():
     if len(sys.argv) < 5:
-        print('Please parse folder containing the file, filename, extension and if separate frames should be written to files.\n python3 -m concat FOLDER FILENAME EXTENSION WRITE_FRAMES\n e.g. python3 -m adts_lens ./files music opus 1')
+        print('Please parse folder containing the file, filename, extension, if separate frames should be written to files and optionally if the file should be memory mapped.\n python3 -m adts_lens FOLDER FILENAME EXTENSION WRITE_FRAMES [USE_MMAP]\n e.g. python3 -m adts_lens ./files music aac 1 1')
         sys.exit()
 
     args = sys.argv
@@ -115,6 +161,7 @@ def main():
     filename = args[2]
     extension = args[3]
     write_frames = int(args[4])
+    use_mmap = len(args) > 5 and int(args[5]) == 1
 
     # discard extension -> mp3 will be set
     filename = os.path.splitext(filename)[0]
@@ -122,13 +169,17 @@ def main():
     filepath = '{0}/{1}.{2}'.format(folder, filename, extension)
     log_filepath = '{0}/{1}_log'.format(folder, filename)
 
-    lens = AacLens(filepath)
+    lens = AacLens(filepath, use_mmap)
     lens.print_headers(log_filepath)
 
     lens.print_summary(log_filepath)
 
+    # 1: adts frames, 2: raw access units
     if write_frames == 1:
         lens.write_frames(folder, filename)
+    elif write_frames == 2:
+        lens.write_frames(folder, filename, raw=True)
+    lens.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,300 @@
+from enum import Enum
+import mmap
+import os
+import struct
+import sys
+import traceback
+from adts_lens.adts_field_helper import AdtsFieldHelper
+from adts_lens.adts_format import AdtsFormat, FrameHeader
+from adts_lens.adts_resync import AdtsResync, ResyncResult
+
+class RemuxFormat(Enum):
+    LATM = 'latm'
+    MP4 = 'mp4'
+
+class AccessUnits:
+    # Raw access units (ADTS payload without header and crc) as slices of
+    # the frame data, frames with several raw data blocks are split.
+    #
+    # With crc the header holds the start of each raw data block relative to
+    # the first one and each block is followed by its own crc:
+    # header, positions (16 bit * (count - 1)), crc, (block, crc) * count
+    # Without crc the block borders are only known after decoding.
+
+    @staticmethod
+    def get_access_units(view: memoryview, header: FrameHeader) -> [memoryview]:
+        offset = header.offset
+        end = offset + header.frame_size
+        count = header.aac_frame_count
+
+        if header.protection_absent:
+            if count > 1:
+                raise ValueError('Raw data blocks of frame at {0} can not be split without crc'.format(offset))
+            return [view[offset + FrameHeader.MIN_HEADER_SIZE : end]]
+
+        if count == 1:
+            return [view[offset + FrameHeader.MIN_HEADER_SIZE + AdtsFormat.CRC_SIZE : end]]
+
+        # header, positions and crc
+        first = offset + FrameHeader.MIN_HEADER_SIZE + (count - 1) * 2 + AdtsFormat.CRC_SIZE
+        starts = [first]
+        for index in range(count - 1):
+            position_offset = offset + FrameHeader.MIN_HEADER_SIZE + index * 2
+            starts.append(first + int.from_bytes(view[position_offset : position_offset + 2], 'big'))
+        starts.append(end)
+
+        units = []
+        for index in range(count):
+            start = starts[index]
+            unit_end = starts[index + 1] - AdtsFormat.CRC_SIZE
+            if unit_end <= start or unit_end > end:
+                raise ValueError('Invalid raw data block position in frame at {0}'.format(offset))
+            units.append(view[start:unit_end])
+        return units
+
+    @staticmethod
+    def get_audio_specific_config(header: FrameHeader) -> bytes:
+        # 5 bit object type, 4 bit sampling frequency index, 4 bit channel
+        # config, GASpecificConfig: frame length 1024, no core coder, no extension
+        object_type = header.profile_index + 1
+        config = (object_type << 11) | (header.sampling_frequency_index << 7) | (header.channel_config_index << 3)
+        return config.to_bytes(2, 'big')
+
+class LatmWriter:
+    # LOAS AudioSyncStream with one AudioMuxElement per access unit. The
+    # StreamMuxConfig is repeated in every element, decoders can join at any
+    # element.
+    #
+    # AudioSyncStream: 11 bit sync 0x2B7, 13 bit length of AudioMuxElement
+    # AudioMuxElement: 1 bit useSameStreamMux (0), StreamMuxConfig,
+    # PayloadLengthInfo (255 per byte), payload, byte alignment
+    #
+    # The payload starts at a bit offset, it is shifted and copied.
+
+    SYNC_WORD: int = 0x2B7
+    MAX_ELEMENT_SIZE: int = 0x1FFF
+    HEADER_BIT_COUNT: int = 45 # useSameStreamMux and StreamMuxConfig
+
+    def __init__(self, file, audio_specific_config: bytes):
+        self.file = file
+        self.unit_count = 0
+
+        # audioMuxVersion 0, allStreamsSameTimeFraming 1, numSubFrames 0,
+        # numProgram 0, numLayer 0, AudioSpecificConfig, frameLengthType 0,
+        # latmBufferFullness 0xFF, otherDataPresent 0, crcCheckPresent 0
+        config = 0b01 << 13
+        config = (config << 16) | int.from_bytes(audio_specific_config, 'big')
+        config = (config << 3) | 0
+        config = (config << 8) | 0xFF
+        config = (config << 2) | 0
+        self.header = config # useSameStreamMux 0 in front
+
+    def write(self, unit: memoryview):
+        size = len(unit)
+        length_info = b'\xff' * (size // 255) + bytes([size % 255])
+
+        bit_count = LatmWriter.HEADER_BIT_COUNT + (len(length_info) + size) * 8
+        padding = -bit_count % 8
+        element_size = (bit_count + padding) // 8
+        if element_size > LatmWriter.MAX_ELEMENT_SIZE:
+            raise ValueError('Access unit too large for LATM: {0}'.format(size))
+
+        element = (self.header << ((len(length_info) + size) * 8)) | int.from_bytes(length_info + bytes(unit), 'big')
+        element <<= padding
+
+        self.file.write(((LatmWriter.SYNC_WORD << 13) | element_size).to_bytes(3, 'big'))
+        self.file.write(element.to_bytes(element_size, 'big'))
+        self.unit_count += 1
+
+    def close(self):
+        pass
+
+class Mp4FragmentWriter:
+    # Fragmented MP4 with one AAC track: ftyp and moov with empty sample
+    # tables, then moof and mdat per FRAGMENT_SIZE access units. Access units
+    # are kept as slices until their fragment is written.
+
+    FRAGMENT_SIZE: int = 256 # access units, ~6 s at 44.1 kHz
+    SAMPLES_PER_UNIT: int = 1024
+    TRACK_ID: int = 1
+    MOVIE_TIMESCALE: int = 1000
+
+    def __init__(self, file, audio_specific_config: bytes, sample_rate: int, channel_count: int):
+        self.file = file
+        self.audio_specific_config = audio_specific_config
+        self.sample_rate = sample_rate
+        self.channel_count = channel_count
+        self.units = []
+        self.sequence_number = 0
+        self.decode_time = 0
+        self.unit_count = 0
+
+        file.write(Mp4FragmentWriter.__box(b'ftyp', b'iso6' + (0).to_bytes(4, 'big') + b'iso6mp41'))
+        file.write(self.__get_moov())
+
+    def write(self, unit: memoryview):
+        self.units.append(unit)
+        self.unit_count += 1
+        if len(self.units) >= Mp4FragmentWriter.FRAGMENT_SIZE:
+            self.__write_fragment()
+
+    def close(self):
+        if self.units:
+            self.__write_fragment()
+
+    def __write_fragment(self):
+        self.sequence_number += 1
+        sizes = [len(unit) for unit in self.units]
+        mdat_size = 8 + sum(sizes)
+
+        # sample sizes only, duration is the default of tfhd, data offset
+        # relative to moof, points behind the mdat header
+        mfhd = Mp4FragmentWriter.__full_box(b'mfhd', 0, 0, struct.pack('>I', self.sequence_number))
+        tfhd = Mp4FragmentWriter.__full_box(b'tfhd', 0, 0x020008, struct.pack('>II', Mp4FragmentWriter.TRACK_ID, Mp4FragmentWriter.SAMPLES_PER_UNIT))
+        tfdt = Mp4FragmentWriter.__full_box(b'tfdt', 1, 0, struct.pack('>Q', self.decode_time))
+        sample_sizes = struct.pack('>{0}I'.format(len(sizes)), *sizes)
+        trun_size = 8 + 4 + 8 + len(sample_sizes)
+        moof_size = 8 + len(mfhd) + 8 + len(tfhd) + len(tfdt) + trun_size
+        trun = Mp4FragmentWriter.__full_box(b'trun', 0, 0x000201, struct.pack('>Ii', len(sizes), moof_size + 8) + sample_sizes)
+        traf = Mp4FragmentWriter.__box(b'traf', tfhd + tfdt + trun)
+        moof = Mp4FragmentWriter.__box(b'moof', mfhd + traf)
+
+        self.file.write(moof)
+        self.file.write(struct.pack('>I4s', mdat_size, b'mdat'))
+        self.file.writelines(self.units)
+
+        self.decode_time += len(sizes) * Mp4FragmentWriter.SAMPLES_PER_UNIT
+        self.units = []
+
+    def __get_moov(self) -> bytes:
+        box = Mp4FragmentWriter.__box
+        full_box = Mp4FragmentWriter.__full_box
+        matrix = struct.pack('>9I', 0x10000, 0, 0, 0, 0x10000, 0, 0, 0, 0x40000000)
+
+        mvhd = full_box(b'mvhd', 0, 0, struct.pack('>IIII', 0, 0, Mp4FragmentWriter.MOVIE_TIMESCALE, 0) + struct.pack('>IH', 0x10000, 0x100) + bytes(10) + matrix + bytes(24) + struct.pack('>I', Mp4FragmentWriter.TRACK_ID + 1))
+        tkhd = full_box(b'tkhd', 0, 0x000003, struct.pack('>IIIII', 0, 0, Mp4FragmentWriter.TRACK_ID, 0, 0) + bytes(8) + struct.pack('>hhhH', 0, 0, 0x100, 0) + matrix + struct.pack('>II', 0, 0))
+        mdhd = full_box(b'mdhd', 0, 0, struct.pack('>IIII', 0, 0, self.sample_rate, 0) + struct.pack('>HH', 0x55C4, 0)) # language und
+        hdlr = full_box(b'hdlr', 0, 0, struct.pack('>I4s', 0, b'soun') + bytes(12) + b'SoundHandler\0')
+        smhd = full_box(b'smhd', 0, 0, bytes(4))
+        dinf = box(b'dinf', full_box(b'dref', 0, 0, struct.pack('>I', 1) + full_box(b'url ', 0, 1, b'')))
+
+        stsd = full_box(b'stsd', 0, 0, struct.pack('>I', 1) + self.__get_mp4a())
+        empty_tables = full_box(b'stts', 0, 0, bytes(4)) + full_box(b'stsc', 0, 0, bytes(4)) + full_box(b'stsz', 0, 0, bytes(8)) + full_box(b'stco', 0, 0, bytes(4))
+        stbl = box(b'stbl', stsd + empty_tables)
+        minf = box(b'minf', smhd + dinf + stbl)
+        mdia = box(b'mdia', mdhd + hdlr + minf)
+        trak = box(b'trak', tkhd + mdia)
+
+        trex = full_box(b'trex', 0, 0, struct.pack('>IIIII', Mp4FragmentWriter.TRACK_ID, 1, Mp4FragmentWriter.SAMPLES_PER_UNIT, 0, 0))
+        mvex = box(b'mvex', trex)
+        return box(b'moov', mvhd + trak + mvex)
+
+    def __get_mp4a(self) -> bytes:
+        # sample rate is 16.16 fixed point, rates above 16 bit are left 0
+        sample_rate = self.sample_rate if self.sample_rate <= 0xFFFF else 0
+        entry = bytes(6) + struct.pack('>H', 1) + bytes(8) + struct.pack('>HHHHI', self.channel_count, 16, 0, 0, sample_rate << 16)
+
+        # ES descriptor with decoder config (AAC, audio stream) and AudioSpecificConfig
+        descriptor = Mp4FragmentWriter.__descriptor
+        decoder_specific_info = descriptor(0x05, self.audio_specific_config)
+        decoder_config = descriptor(0x04, struct.pack('>BB', 0x40, 0x15) + bytes(3) + struct.pack('>II', 0, 0) + decoder_specific_info)
+        sl_config = descriptor(0x06, b'\x02')
+        es = descriptor(0x03, struct.pack('>HB', Mp4FragmentWriter.TRACK_ID, 0) + decoder_config + sl_config)
+        esds = Mp4FragmentWriter.__full_box(b'esds', 0, 0, es)
+        return Mp4FragmentWriter.__box(b'mp4a', entry + esds)
+
+    @staticmethod
+    def __box(box_type: bytes, payload: bytes) -> bytes:
+        return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+    @staticmethod
+    def __full_box(box_type: bytes, version: int, flags: int, payload: bytes) -> bytes:
+        return Mp4FragmentWriter.__box(box_type, struct.pack('>I', (version << 24) | flags) + payload)
+
+    @staticmethod
+    def __descriptor(tag: int, payload: bytes) -> bytes:
+        # size in 4 bytes of 7 bits
+        size = len(payload)
+        size_bytes = bytes([0x80 | ((size >> 21) & 0x7F), 0x80 | ((size >> 14) & 0x7F), 0x80 | ((size >> 7) & 0x7F), size & 0x7F])
+        return bytes([tag]) + size_bytes + payload
+
+class AacRemuxer:
+    # Remux of an ADTS file: frames of the mapped file are found by the
+    # vectorized resync walk (same checks as the stream parser), access units
+    # are slices of the mapping, the file data is never copied. The copying
+    # AdtsStreamParser is only used for network input.
+
+    @staticmethod
+    def get_format(filename: str) -> RemuxFormat:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension in ['.latm', '.loas']:
+            return RemuxFormat.LATM
+        return RemuxFormat.MP4
+
+    @staticmethod
+    def remux(input_filename: str, output_filename: str, remux_format: RemuxFormat = RemuxFormat.MP4) -> ResyncResult:
+        # returns taken frames, corrupt spans and crc errors
+        with open(input_filename, 'rb') as input_file:
+            if os.fstat(input_file.fileno()).st_size == 0:
+                raise ValueError('Empty file')
+            data = mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(data)
+            try:
+                result = AdtsResync.scan(view)
+                with open(output_filename, 'wb') as output_file:
+                    AacRemuxer.__remux_view(view, result, output_file, remux_format)
+            except Exception as error:
+                # locals of the failed frames (pending access units of the
+                # writer) are slices of the mapping, it can't be closed with them
+                traceback.clear_frames(error.__traceback__)
+                raise
+            finally:
+                view.release()
+                data.close()
+        return result
+
+    @staticmethod
+    def __remux_view(view: memoryview, result: ResyncResult, output_file, remux_format: RemuxFormat):
+        if len(result.offsets) == 0:
+            raise ValueError('No frames found')
+
+        writer = None
+        config = None
+        for offset, word in zip(result.offsets.tolist(), result.words.tolist()):
+            header = FrameHeader(offset, word)
+            if writer is None:
+                config = word & AdtsFormat.CONFIG_MASK
+                writer = AacRemuxer.__get_writer(output_file, header, remux_format)
+            elif word & AdtsFormat.CONFIG_MASK != config:
+                raise ValueError('Audio config changed at {0}'.format(offset))
+
+            for unit in AccessUnits.get_access_units(view, header):
+                writer.write(unit)
+        writer.close()
+
+    @staticmethod
+    def __get_writer(output_file, header: FrameHeader, remux_format: RemuxFormat):
+        config = AccessUnits.get_audio_specific_config(header)
+        if remux_format == RemuxFormat.LATM:
+            return LatmWriter(output_file, config)
+
+        sample_rate = AdtsFieldHelper.get_sample_rate(header.sampling_frequency_index)
+        channel_count = AdtsFieldHelper.get_channel_count(header.channel_config_index)
+        return Mp4FragmentWriter(output_file, config, sample_rate, channel_count)
+
+# Main
+
+def main():
+    if len(sys.argv) < 3:
+        print('Please parse input adts file and output file (.mp4, .m4a or .latm, .loas).\n python3 -m adts_lens.aac_remuxer INPUT OUTPUT\n e.g. python3 -m adts_lens.aac_remuxer ./files/audio.aac ./files/audio.m4a')
+        sys.exit()
+
+    args = sys.argv
+    input_filename = args[1]
+    output_filename = args[2]
+
+    result = AacRemuxer.remux(input_filename, output_filename, AacRemuxer.get_format(output_filename))
+    print('frames: {0}, corrupt spans: {1} ({2} bytes), crc errors: {3}'.format(len(result.offsets), len(result.corrupt_spans), result.get_corrupt_size(), result.crc_error_count))
+
+if __name__ == '__main__':
+    main()
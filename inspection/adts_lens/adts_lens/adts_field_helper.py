@@ -21,6 +21,13 @@ class AdtsFieldHelper:
         else:
             return "???"
 
+    @staticmethod
+    def get_channel_count(index: int) -> int:
+        if index < len(AdtsFieldHelper.CHANNEL_COUNTS):
+            return AdtsFieldHelper.CHANNEL_COUNTS[index]
+        else:
+            return -1
+
     NAMES = ["AAC Main",
             "AAC LC (Low Complexity)",
             "AAC SSR (Scalable Sample Rate)",
@@ -99,4 +106,6 @@ class AdtsFieldHelper:
                               "r",
                               "r",
                               "r",
-                              "r"]
\ No newline at end of file
+                              "r"]
+
+    CHANNEL_COUNTS = [0, 1, 2, 3, 4, 5, 6, 8] # 0: defined in stream
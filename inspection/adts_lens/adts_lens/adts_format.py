@@ -1,38 +1,88 @@
 from enum import Enum
+import numpy as np
 from typing import Optional
 from adts_lens.adts_field_helper import AdtsFieldHelper
 from adts_lens.byte_helper import ByteHelper
 
 class FrameHeader:
     # https://wiki.multimedia.cx/index.php/ADTS
-    # 8 bit version: 1
-    # 8 bit channel count:
-    # 16 bit pre-skip:
-    # 32 bit input sample rate:
-    # 16 bit output gain:
-    # 8 bit mapping family: 
     MAGIC_STRUCTURE: bytearray = bytes.fromhex('FFF0')
     MAGIC_STRUCTURE_COMPARATOR: bytearray = bytes.fromhex('FFF6')
     MIN_HEADER_SIZE: int = 7 # if contains crc -> 9
-    version: int = 1
-    layer: int = 0
-    protection_absent: bool = False
-    profile_index: int = 0
-    sampling_frequency_index: int = 0
-    private_bit: int = 0
-    channel_config_index: int = 0
-    originality: int = 0
-    home: int = 0
-    copyright_id_bit: int = 0
-    copyright_id_start: int = 0
-    frame_size: int = 0 #  this value must include 7 or 9 bytes of header length: FrameLength = (ProtectionAbsent == 1 ? 7 : 9) + size(AACFrame)
-    bufferfullness: int = 0
-    aac_frame_count: int = 0 # -1 is the real amount
-    crc: int = 0 # CRC if protection absent is 0
+
+    # Only offset, header word and crc are stored, fields are decoded on
+    # access. Frames of a file share the header word objects.
+    __slots__ = ('offset', 'word', 'crc')
+
+    def __init__(self, offset: int = 0, word: int = 0, crc: int = -1):
+        self.offset = offset # offset in file
+        self.word = word # 56 bit header without crc
+        self.crc = crc # CRC if protection absent is 0
+
+    @property
+    def version(self) -> int:
+        return (self.word >> 43) & 0x01
+
+    @property
+    def layer(self) -> int:
+        return (self.word >> 41) & 0x03
+
+    @property
+    def protection_absent(self) -> int:
+        return (self.word >> 40) & 0x01
+
+    @property
+    def profile_index(self) -> int:
+        return (self.word >> 38) & 0x03
+
+    @property
+    def sampling_frequency_index(self) -> int:
+        return (self.word >> 34) & 0x0F
+
+    @property
+    def private_bit(self) -> int:
+        return (self.word >> 33) & 0x01
+
+    @property
+    def channel_config_index(self) -> int:
+        return (self.word >> 30) & 0x07
+
+    @property
+    def originality(self) -> int:
+        return (self.word >> 29) & 0x01
+
+    @property
+    def home(self) -> int:
+        return (self.word >> 28) & 0x01
+
+    @property
+    def copyright_id_bit(self) -> int:
+        return (self.word >> 27) & 0x01
+
+    @property
+    def copyright_id_start(self) -> int:
+        return (self.word >> 26) & 0x01
+
+    @property
+    def frame_size(self) -> int:
+        # this value must include 7 or 9 bytes of header length: FrameLength = (ProtectionAbsent == 1 ? 7 : 9) + size(AACFrame)
+        return (self.word >> 13) & 0x1FFF
+
+    @property
+    def bufferfullness(self) -> int:
+        return (self.word >> 2) & 0x7FF
+
+    @property
+    def aac_frame_count(self) -> int:
+        return (self.word & 0x03) + 1
 
     # help values
-    frame_size_data: int = 0
-    offset: int = 0 # offset in file
+
+    @property
+    def frame_size_data(self) -> int:
+        if self.protection_absent:
+            return self.frame_size - FrameHeader.MIN_HEADER_SIZE
+        return self.frame_size - FrameHeader.MIN_HEADER_SIZE - 2
 
     def print_me(self):
         # if self.sample_rate == compare.sample_rate and self.version == compare.version:
@@ -88,45 +138,138 @@ class AdtsFormat:
     # P	        2           	Number of AAC frames (RDBs) in ADTS frame minus 1, for maximum compatibility always use 1 AAC frame per ADTS frame
     # Q	        16          	CRC if protection absent is 0
 
+    FRAME_SIZE_SHIFT: int = 13
+    FRAME_SIZE_MASK: int = 0x1FFF
+    CRC_SIZE: int = 2
+    PROTECTION_ABSENT_MASK: int = 1 << 40
+    AAC_FRAME_COUNT_MASK: int = 0x03
+    CONFIG_MASK: int = (0x03 << 38) | (0x0F << 34) | (0x07 << 30) # profile, sampling frequency, channels
+    CRC_DATA_SIZE: int = 24 # leading 192 bits of the raw data block protected by the crc
+
+    CRC_TABLE = []
+
+    @staticmethod
+    def get_all_headers(data: bytearray) -> [FrameHeader]:
+        offsets, words = AdtsFormat.get_frame_words(data)
+        return AdtsFormat.get_headers(data, offsets, words)
+
     @staticmethod
-    def get_all_headers(data: bytearray):
+    def get_headers(data: bytearray, offsets: np.ndarray, words: np.ndarray) -> [FrameHeader]:
+        # frames with equal header word share the word object
+        shared_words = {}
         headers = []
-        offset = 0
-        while offset < len(data) - FrameHeader.MIN_HEADER_SIZE:
-            if AdtsFormat.is_magic_structure(data, offset):
-                header = AdtsFormat.get_header(data, offset)
-                if header:
-                    headers.append(header)
-                offset += header.frame_size
-                continue
-            offset += 1
+        for offset, word in zip(offsets.tolist(), words.tolist()):
+            word = shared_words.setdefault(word, word)
+            header = FrameHeader(offset, word)
+            if not word & AdtsFormat.PROTECTION_ABSENT_MASK:
+                AdtsFormat.__read_crc(data, header)
+            headers.append(header)
         return headers
 
+    @staticmethod
+    def get_frame_words(data: bytearray) -> (np.ndarray, np.ndarray):
+        # Offsets and 56 bit header words of all frames. Header words of all
+        # sync word candidates are unpacked in one vectorized pass, the frame
+        # chain is then followed by index. Where a frame size does not lead
+        # exactly to another candidate (or the end of the data) the frame is
+        # not trusted and the walk continues with the next candidate, a false
+        # sync with a large size must not swallow the real frames behind it.
+        candidates = AdtsFormat.find_sync_candidates(data)
+        if len(candidates) == 0:
+            return candidates, np.empty(0, dtype=np.uint64)
+
+        words = AdtsFormat.get_header_words(data, candidates)
+        frame_sizes = ((words >> np.uint64(AdtsFormat.FRAME_SIZE_SHIFT)) & np.uint64(AdtsFormat.FRAME_SIZE_MASK)).astype(np.int64)
+
+        # index of candidate to continue with, the next one on invalid size or
+        # if no candidate starts where the frame ends
+        ends = candidates + frame_sizes
+        next_indices = np.searchsorted(candidates, ends)
+        found = np.minimum(next_indices, len(candidates) - 1)
+        is_chained = (candidates[found] == ends) | (ends == len(data))
+        invalid = frame_sizes < FrameHeader.MIN_HEADER_SIZE
+        following = np.arange(1, len(candidates) + 1)
+        next_indices = np.where(is_chained & ~invalid, next_indices, following)
+
+        chain = []
+        next_indices = next_indices.tolist()
+        candidate_count = len(candidates)
+        index = 0
+        while index < candidate_count:
+            if not invalid[index]:
+                chain.append(index)
+            index = next_indices[index]
+
+        return candidates[chain], words[chain]
+
+    @staticmethod
+    def find_sync_candidates(data: bytearray) -> np.ndarray:
+        # offsets of 0xFFF sync word with layer 0 and room for a header behind
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        if len(buffer) <= FrameHeader.MIN_HEADER_SIZE:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.flatnonzero(buffer[:-FrameHeader.MIN_HEADER_SIZE] == 0xFF)
+        return candidates[(buffer[candidates + 1] & 0xF6) == 0xF0]
+
+    @staticmethod
+    def get_header_words(data: bytearray, offsets: np.ndarray) -> np.ndarray:
+        # big endian 7 byte header words at offsets
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        words = np.zeros(len(offsets), dtype=np.uint64)
+        for index in range(FrameHeader.MIN_HEADER_SIZE):
+            words = (words << np.uint64(8)) | buffer[offsets + index]
+        return words
+
     @staticmethod
     def get_header(data: bytearray, offset: int = 0) -> Optional[FrameHeader]:
-        if len(data) - offset < 19:
+        if len(data) - offset < FrameHeader.MIN_HEADER_SIZE:
             return None
 
-        header = FrameHeader()
-        header.offset = offset
-        header.version = AdtsFormat.get_version(data, offset)
-        header.layer = AdtsFormat.get_layer(data, offset)
-        header.protection_absent = AdtsFormat.get_protection(data, offset)
-        header.profile_index = AdtsFormat.get_profile_index(data, offset)
-        header.sampling_frequency_index = AdtsFormat.get_sample_rate_index(data, offset)
-        header.private_bit = AdtsFormat.get_private_bit(data, offset)
-        header.channel_config_index = AdtsFormat.get_channel_config_index(data, offset)
-        header.originality = AdtsFormat.get_originality_bit(data, offset)
-        header.home = AdtsFormat.get_home_bit(data, offset)
-        header.copyright_id_bit = AdtsFormat.get_copyright_id_bit(data, offset)
-        header.copyright_id_start = AdtsFormat.get_copyright_id_start(data, offset)
-        header.frame_size = AdtsFormat.get_frame_size(data, offset)
-        header.bufferfullness = AdtsFormat.get_buffer_fullness(data, offset)
-        header.aac_frame_count = AdtsFormat.get_aac_frames_count(data, offset)
-        header.crc = AdtsFormat.get_crc(data, offset)
-        
+        header = FrameHeader(offset, int.from_bytes(data[offset : offset + FrameHeader.MIN_HEADER_SIZE], 'big'))
+        if not header.protection_absent:
+            AdtsFormat.__read_crc(data, header)
         return header
 
+    @staticmethod
+    def get_frame_crc(data: bytearray, offset: int, frame_size: int) -> int:
+        # crc of header (without crc field) and the leading 192 bits of a
+        # single raw data block frame. That is the protected region of a
+        # single channel (or lfe) element. For channel pair and multi element
+        # frames ISO/IEC 14496-3 protects a bit count per element and channel,
+        # locating it needs the channel streams parsed, so the crc differs.
+        header_end = offset + FrameHeader.MIN_HEADER_SIZE
+        data_start = header_end + AdtsFormat.CRC_SIZE
+        data_end = min(data_start + AdtsFormat.CRC_DATA_SIZE, offset + frame_size)
+        crc = AdtsFormat.crc16(data[offset:header_end])
+        return AdtsFormat.crc16(data[data_start:data_end], crc)
+
+    @staticmethod
+    def crc16(data: bytearray, crc: int = 0xFFFF) -> int:
+        # CRC-16 (poly 0x8005, init 0xFFFF, not reflected) as in ISO/IEC 11172-3
+        if not AdtsFormat.CRC_TABLE:
+            AdtsFormat.CRC_TABLE = AdtsFormat.__build_crc_table()
+
+        table = AdtsFormat.CRC_TABLE
+        for byte in bytes(data):
+            crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+        return crc
+
+    @staticmethod
+    def __build_crc_table() -> [int]:
+        table = []
+        for index in range(256):
+            crc = index << 8
+            for _ in range(8):
+                crc = ((crc << 1) ^ 0x8005) & 0xFFFF if crc & 0x8000 else (crc << 1) & 0xFFFF
+            table.append(crc)
+        return table
+
+    @staticmethod
+    def __read_crc(data: bytearray, header: FrameHeader):
+        crc_offset = header.offset + FrameHeader.MIN_HEADER_SIZE
+        if len(data) >= crc_offset + AdtsFormat.CRC_SIZE:
+            header.crc = int.from_bytes(data[crc_offset : crc_offset + AdtsFormat.CRC_SIZE], 'big')
+
     @staticmethod
     def is_magic_structure(data: bytearray, offset: int = 0) -> bool:
         first = int.from_bytes(data[offset: offset + 2], 'big')
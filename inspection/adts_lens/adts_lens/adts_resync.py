@@ -0,0 +1,125 @@
+from enum import Enum
+import numpy as np
+from adts_lens.adts_format import AdtsFormat, FrameHeader
+
+class SpanReason(Enum):
+    NO_SYNC = 'no sync' # no sync word where the next frame was expected
+    INVALID = 'invalid header'
+    INCONSISTENT = 'inconsistent header' # sample rate, profile or channels changed
+    TRUNCATED = 'truncated frame'
+
+class CorruptSpan:
+
+    def __init__(self, offset: int, size: int, reason: SpanReason):
+        self.offset = offset
+        self.size = size
+        self.reason = reason # why the frame expected at offset was not taken
+
+class ResyncResult:
+
+    def __init__(self, offsets: np.ndarray, words: np.ndarray, corrupt_spans: [CorruptSpan], crc_error_count: int):
+        self.offsets = offsets
+        self.words = words
+        self.corrupt_spans = corrupt_spans
+        self.crc_error_count = crc_error_count
+
+    def get_corrupt_size(self) -> int:
+        return sum(span.size for span in self.corrupt_spans)
+
+class AdtsResync:
+    # Frame walk that only trusts a sync word if the header is plausible:
+    # - in sync: same sample rate, profile and channels as the frame before
+    # - out of sync: the frame behind it has to start with a matching header
+    #   (or the frame ends with the data)
+    # Bytes between taken frames are reported as corrupt spans. Crc mismatches
+    # (if verify_crc) are only counted, the frames are kept: the checked
+    # region is exact for single channel element frames only (see
+    # AdtsFormat.get_frame_crc).
+    #
+    # Every candidate is looked at at most once, the walk is linear in the
+    # number of sync word candidates.
+
+    MAX_SAMPLING_FREQUENCY_INDEX: int = 12 # 13, 14 reserved, 15 forbidden
+
+    @staticmethod
+    def scan(data: bytearray, verify_crc: bool = True) -> ResyncResult:
+        data_size = len(data)
+        candidates = AdtsFormat.find_sync_candidates(data)
+        words = AdtsFormat.get_header_words(data, candidates)
+
+        # per candidate checks, vectorized
+        frame_sizes = ((words >> np.uint64(AdtsFormat.FRAME_SIZE_SHIFT)) & np.uint64(AdtsFormat.FRAME_SIZE_MASK)).astype(np.int64)
+        has_crc = (words & np.uint64(AdtsFormat.PROTECTION_ABSENT_MASK)) == 0
+        header_sizes = np.where(has_crc, FrameHeader.MIN_HEADER_SIZE + AdtsFormat.CRC_SIZE, FrameHeader.MIN_HEADER_SIZE)
+        sampling_frequency_indices = (words >> np.uint64(34)) & np.uint64(0x0F)
+        valid = (frame_sizes > header_sizes) & (sampling_frequency_indices <= AdtsResync.MAX_SAMPLING_FREQUENCY_INDEX)
+        ends = candidates + frame_sizes
+        configs = words & np.uint64(AdtsFormat.CONFIG_MASK)
+
+        # candidate at end of frame, len(candidates) if there is none
+        next_indices = np.searchsorted(candidates, ends)
+        padded_candidates = np.append(candidates, -1)
+        is_followed = padded_candidates[next_indices] == ends
+
+        frames = []
+        corrupt_spans = []
+        crc_error_count = 0
+
+        offsets = candidates.tolist()
+        frame_sizes = frame_sizes.tolist()
+        has_crc = has_crc.tolist()
+        valid = valid.tolist()
+        ends = ends.tolist()
+        configs = configs.tolist()
+        next_indices = next_indices.tolist()
+        is_followed = is_followed.tolist()
+        multiple_blocks = ((words & np.uint64(AdtsFormat.AAC_FRAME_COUNT_MASK)) != 0).tolist()
+
+        expected = 0 # end of last taken frame
+        reason = SpanReason.NO_SYNC
+        config = None # of last taken frame if in sync
+        index = 0
+        candidate_count = len(offsets)
+        while index < candidate_count:
+            offset = offsets[index]
+            failure = None
+            if not valid[index]:
+                failure = SpanReason.INVALID
+            elif ends[index] > data_size:
+                failure = SpanReason.TRUNCATED
+            elif config is not None:
+                if configs[index] != config:
+                    failure = SpanReason.INCONSISTENT
+            elif ends[index] != data_size:
+                following = next_indices[index]
+                if not is_followed[index] or not valid[following] or configs[following] != configs[index]:
+                    failure = SpanReason.NO_SYNC
+
+            if failure:
+                if offset == expected:
+                    reason = failure
+                config = None
+                index += 1
+                continue
+
+            if offset > expected:
+                corrupt_spans.append(CorruptSpan(expected, offset - expected, reason))
+            frames.append(index)
+            expected = ends[index]
+
+            # crc is not located for frames with several raw data blocks
+            if verify_crc and has_crc[index] and not multiple_blocks[index]:
+                crc = int.from_bytes(data[offset + FrameHeader.MIN_HEADER_SIZE : offset + FrameHeader.MIN_HEADER_SIZE + AdtsFormat.CRC_SIZE], 'big')
+                if crc != AdtsFormat.get_frame_crc(data, offset, frame_sizes[index]):
+                    crc_error_count += 1
+            config = configs[index]
+
+            if not is_followed[index]:
+                config = None
+                reason = SpanReason.NO_SYNC
+            index = next_indices[index]
+
+        if expected < data_size:
+            corrupt_spans.append(CorruptSpan(expected, data_size - expected, reason))
+
+        return ResyncResult(candidates[frames], words[frames], corrupt_spans, crc_error_count)
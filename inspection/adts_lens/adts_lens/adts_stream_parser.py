@@ -0,0 +1,185 @@
+from collections import deque
+import sys
+import time
+import urllib.request
+from adts_lens.adts_field_helper import AdtsFieldHelper
+from adts_lens.adts_format import AdtsFormat, FrameHeader
+from adts_lens.adts_resync import CorruptSpan, SpanReason
+
+class AdtsStreamParser:
+    # Incremental frame parser for live streams. Chunks of any size are
+    # passed to feed, complete frames are returned as soon as their last byte
+    # arrived. Only the unfinished tail (less than one frame) is kept between
+    # chunks, every byte is looked at once.
+    #
+    # Same checks as AdtsResync: while in sync headers have to keep sample
+    # rate, profile and channels, out of sync a frame is only taken if the
+    # next header behind it matches. Skipped bytes are discontinuities, crc
+    # mismatches are counted only.
+
+    MAX_SPANS: int = 100 # most recent discontinuities kept
+    SAMPLES_PER_BLOCK: int = 1024
+
+    def __init__(self, verify_crc: bool = True):
+        self.verify_crc = verify_crc
+        self.buffer = bytearray()
+        self.buffer_offset = 0 # stream offset of buffer start
+        self.config = None # of last frame if in sync
+        self.skip_offset = -1 # start of skipped bytes, -1 if none
+        self.skip_reason = SpanReason.NO_SYNC
+
+        # stats
+        self.frame_count = 0
+        self.frame_bytes = 0
+        self.duration = 0.0 # seconds of audio
+        self.discontinuity_count = 0
+        self.skipped_size = 0
+        self.crc_error_count = 0
+        self.corrupt_spans = deque(maxlen=AdtsStreamParser.MAX_SPANS)
+
+    def feed(self, chunk: bytes) -> [FrameHeader]:
+        self.buffer += chunk
+        headers = []
+        buffer = self.buffer
+        buffer_size = len(buffer)
+        position = 0
+
+        while buffer_size - position >= FrameHeader.MIN_HEADER_SIZE:
+            if buffer[position] != 0xFF or not AdtsFormat.is_magic_structure(buffer, position):
+                position = self.__skip_to_sync(position, SpanReason.NO_SYNC)
+                continue
+
+            word = int.from_bytes(buffer[position : position + FrameHeader.MIN_HEADER_SIZE], 'big')
+            failure, header = self.__check_word(word)
+            frame_size = header.frame_size
+            if not failure:
+                # wait for frame, out of sync also for the header behind it
+                end = position + frame_size
+                required = end if self.config is not None else end + FrameHeader.MIN_HEADER_SIZE
+                if required > buffer_size:
+                    break
+                failure = self.__check_frame(position, word, frame_size)
+
+            if failure:
+                self.config = None
+                position = self.__skip_to_sync(position, failure)
+                continue
+
+            headers.append(self.__take_frame(position, word, header))
+            position += frame_size
+
+        # keep unfinished tail only
+        if position > 0:
+            del buffer[:position]
+            self.buffer_offset += position
+        return headers
+
+    def get_bitrate(self) -> float:
+        # bits per second of audio
+        if self.duration <= 0:
+            return 0.0
+        return self.frame_bytes * 8 / self.duration
+
+    def get_frame_rate(self) -> float:
+        # frames per second of audio
+        if self.duration <= 0:
+            return 0.0
+        return self.frame_count / self.duration
+
+    def format_string(self) -> str:
+        string = 'frames: {0}, duration: {1:.1f} s, bitrate: {2:.0f} bps, frame rate: {3:.2f} fps, '.format(self.frame_count, self.duration, self.get_bitrate(), self.get_frame_rate())
+        string += 'discontinuities: {0} ({1} bytes), crc errors: {2}'.format(self.discontinuity_count, self.skipped_size, self.crc_error_count)
+        return string
+
+    def __check_word(self, word: int) -> (SpanReason, FrameHeader):
+        header = FrameHeader(0, word) # offset is set when the frame is taken
+        header_size = FrameHeader.MIN_HEADER_SIZE if header.protection_absent else FrameHeader.MIN_HEADER_SIZE + AdtsFormat.CRC_SIZE
+        if header.frame_size <= header_size or AdtsFieldHelper.get_sample_rate(header.sampling_frequency_index) <= 0:
+            return SpanReason.INVALID, header
+        if self.config is not None and word & AdtsFormat.CONFIG_MASK != self.config:
+            return SpanReason.INCONSISTENT, header
+        return None, header
+
+    def __check_frame(self, position: int, word: int, frame_size: int) -> SpanReason:
+        buffer = self.buffer
+        if self.config is None:
+            following = position + frame_size
+            if not AdtsFormat.is_magic_structure(buffer, following):
+                return SpanReason.NO_SYNC
+            following_word = int.from_bytes(buffer[following : following + FrameHeader.MIN_HEADER_SIZE], 'big')
+            if following_word & AdtsFormat.CONFIG_MASK != word & AdtsFormat.CONFIG_MASK:
+                return SpanReason.NO_SYNC
+
+        # crc is not located for frames with several raw data blocks
+        has_crc = not word & AdtsFormat.PROTECTION_ABSENT_MASK
+        if self.verify_crc and has_crc and not word & AdtsFormat.AAC_FRAME_COUNT_MASK:
+            crc_offset = position + FrameHeader.MIN_HEADER_SIZE
+            crc = int.from_bytes(buffer[crc_offset : crc_offset + AdtsFormat.CRC_SIZE], 'big')
+            if crc != AdtsFormat.get_frame_crc(buffer, position, frame_size):
+                self.crc_error_count += 1
+        return None
+
+    def __take_frame(self, position: int, word: int, header: FrameHeader) -> FrameHeader:
+        offset = self.buffer_offset + position
+        if self.skip_offset >= 0:
+            self.__add_span(CorruptSpan(self.skip_offset, offset - self.skip_offset, self.skip_reason))
+            self.skip_offset = -1
+
+        header.offset = offset
+        if not header.protection_absent:
+            crc_offset = position + FrameHeader.MIN_HEADER_SIZE
+            header.crc = int.from_bytes(self.buffer[crc_offset : crc_offset + AdtsFormat.CRC_SIZE], 'big')
+        self.config = word & AdtsFormat.CONFIG_MASK
+
+        self.frame_count += 1
+        self.frame_bytes += header.frame_size
+        sample_rate = AdtsFieldHelper.get_sample_rate(header.sampling_frequency_index)
+        self.duration += header.aac_frame_count * AdtsStreamParser.SAMPLES_PER_BLOCK / sample_rate
+        return header
+
+    def __skip_to_sync(self, position: int, reason: SpanReason) -> int:
+        # next possible sync byte behind position, skipped bytes start a discontinuity
+        if self.skip_offset < 0:
+            self.skip_offset = self.buffer_offset + position
+            self.skip_reason = reason
+        index = self.buffer.find(b'\xff', position + 1)
+        if index < 0:
+            return len(self.buffer)
+        return index
+
+    def __add_span(self, span: CorruptSpan):
+        self.discontinuity_count += 1
+        self.skipped_size += span.size
+        self.corrupt_spans.append(span)
+
+# Main
+
+def main():
+    if len(sys.argv) < 2:
+        print('Please parse url or file of an adts stream and optionally the interval of printed stats in seconds.\n python3 -m adts_lens.adts_stream_parser SOURCE [INTERVAL]\n e.g. python3 -m adts_lens.adts_stream_parser https://www.superstream.com:5000 10')
+        sys.exit()
+
+    args = sys.argv
+    source = args[1]
+    interval = float(args[2]) if len(args) > 2 else 10.0
+
+    parser = AdtsStreamParser()
+    stream = urllib.request.urlopen(source) if '://' in source else open(source, 'rb')
+    last_print = time.monotonic()
+    try:
+        while True:
+            chunk = stream.read(1 << 14)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            if time.monotonic() - last_print >= interval:
+                print(parser.format_string())
+                last_print = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream.close()
+    print(parser.format_string())
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import glob
+import json
+import mmap
+import numpy as np
+import os
+import sys
+from adts_lens.adts_format import AdtsFormat
+from adts_lens.adts_resync import AdtsResync, ResyncResult
+from adts_lens.timing_index import TimingIndex
+
+class BatchValidator:
+    # Validates all adts files of a folder or glob pattern in a process pool
+    # and writes one report line per file as soon as its result arrives.
+    # Workers only return small result dicts. Headers are only written (to
+    # FILENAME_log next to each file) if asked for.
+
+    EXTENSIONS: [str] = ['.aac', '.adts']
+    CHUNK_SIZE: int = 16 # files per task, amortizes pickling for small ad files
+    FIELDS = ['filename', 'size', 'frame_count', 'duration', 'average_bitrate', 'incomplete_frames', 'layer_mismatches', 'multiple_blocks', 'crc_errors', 'corrupt_spans', 'corrupt_size', 'error']
+
+    @staticmethod
+    def get_filenames(path: str) -> [str]:
+        if os.path.isdir(path):
+            filenames = []
+            for folder, _, files in os.walk(path):
+                for filename in files:
+                    if os.path.splitext(filename)[1].lower() in BatchValidator.EXTENSIONS:
+                        filenames.append(os.path.join(folder, filename))
+            return sorted(filenames)
+        return sorted(glob.glob(path, recursive=True))
+
+    @staticmethod
+    def validate_file(filename: str, write_headers: bool = False) -> dict:
+        result = dict.fromkeys(BatchValidator.FIELDS)
+        result['filename'] = filename
+        try:
+            result['size'] = os.path.getsize(filename)
+            if result['size'] == 0:
+                raise ValueError('Empty file')
+
+            with open(filename, 'rb') as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    resync_result = AdtsResync.scan(data)
+                    if write_headers:
+                        BatchValidator.__write_headers(data, resync_result, os.path.splitext(filename)[0] + '_log')
+            result.update(BatchValidator.get_stats(resync_result))
+        except Exception as error:
+            result['error'] = '{0}: {1}'.format(type(error).__name__, error)
+        return result
+
+    @staticmethod
+    def get_stats(resync_result: ResyncResult) -> dict:
+        offsets = resync_result.offsets
+        words = resync_result.words
+        timing_index = TimingIndex(offsets, words)
+
+        # frames not starting where the frame before ended
+        expected = np.zeros(len(offsets), dtype=np.int64)
+        expected[1:] = offsets[:-1] + timing_index.frame_sizes[:-1]
+
+        return {
+            'frame_count': len(offsets),
+            'duration': round(timing_index.duration(), 3),
+            'average_bitrate': round(timing_index.get_average_bitrate()),
+            'incomplete_frames': int(np.count_nonzero(offsets != expected)),
+            'layer_mismatches': int(np.count_nonzero((words >> np.uint64(41)) & np.uint64(0x03))),
+            'multiple_blocks': int(np.count_nonzero(words & np.uint64(AdtsFormat.AAC_FRAME_COUNT_MASK))),
+            'crc_errors': resync_result.crc_error_count,
+            'corrupt_spans': len(resync_result.corrupt_spans),
+            'corrupt_size': resync_result.get_corrupt_size()
+        }
+
+    @staticmethod
+    def run(path: str, report_filename: str, workers: int = os.cpu_count(), write_headers: bool = False) -> int:
+        # returns number of invalid files (error or corrupt spans)
+        filenames = BatchValidator.get_filenames(path)
+        invalid_count = 0
+
+        with open(report_filename, 'w', newline='') as report_file:
+            write = BatchValidator.__get_writer(report_file, report_filename)
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(BatchValidator.validate_file, filenames, [write_headers] * len(filenames), chunksize=BatchValidator.CHUNK_SIZE)
+                for index, result in enumerate(results):
+                    write(result)
+                    report_file.flush()
+                    if result['error'] or result['corrupt_spans']:
+                        invalid_count += 1
+                    print('{0}/{1} {2}'.format(index + 1, len(filenames), result['filename']))
+
+        return invalid_count
+
+    @staticmethod
+    def __write_headers(data: bytearray, resync_result: ResyncResult, log_filename: str):
+        with open(log_filename, 'w') as log_file:
+            for header in AdtsFormat.get_headers(data, resync_result.offsets, resync_result.words):
+                log_file.write(header.format_string())
+
+    @staticmethod
+    def __get_writer(report_file, report_filename: str):
+        # csv for .csv reports, json lines otherwise
+        if report_filename.lower().endswith('.csv'):
+            writer = csv.DictWriter(report_file, fieldnames=BatchValidator.FIELDS)
+            writer.writeheader()
+            return writer.writerow
+
+        def write_json(result: dict):
+            report_file.write(json.dumps(result) + '\n')
+        return write_json
+
+# Main
+
+def main():
+    if len(sys.argv) < 3:
+        print('Please parse folder or glob pattern of files, report file (.csv or .jsonl), optionally number of workers and if headers should be written to FILENAME_log.\n python3 -m adts_lens.batch_validator PATH REPORT [WORKERS] [WRITE_HEADERS]\n e.g. python3 -m adts_lens.batch_validator ./files report.jsonl 4 0')
+        sys.exit()
+
+    args = sys.argv
+    path = args[1]
+    report_filename = args[2]
+    workers = int(args[3]) if len(args) > 3 else os.cpu_count()
+    write_headers = len(args) > 4 and int(args[4]) == 1
+
+    invalid_count = BatchValidator.run(path, report_filename, workers, write_headers)
+    print('Invalid files:', invalid_count)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+import mmap
+import numpy as np
+import os
+import struct
+import zlib
+from typing import Optional
+from adts_lens.adts_field_helper import AdtsFieldHelper
+from adts_lens.adts_format import AdtsFormat
+from adts_lens.adts_resync import AdtsResync
+
+class TimingIndex:
+    # Offsets and header words of all frames with cumulative sample counts
+    # (1024 samples per raw data block). Sample rate of the first frame,
+    # resync keeps it constant.
+    #
+    # Sidecar file:
+    # 8 byte magic structure: ADTSTIX2
+    # 64 bit frame count
+    # 64 bit size of source file
+    # 64 bit mtime of source file [ns]
+    # 32 bit crc32 of first and last CHECK_SIZE bytes of source file, 32 bit padding
+    # frame count * (64 bit frame offset, 64 bit header word)
+    #
+    # All values are little endian. load returns None if size, mtime or
+    # checksum of the source file differ.
+
+    MAGIC_STRUCTURE: bytes = b'ADTSTIX2'
+    HEADER = struct.Struct('<8sQQQI4x')
+    CHECK_SIZE: int = 1 << 16
+    EXTENSION: str = '.tidx'
+    SAMPLES_PER_BLOCK: int = 1024
+
+    def __init__(self, offsets: np.ndarray, words: np.ndarray):
+        self.offsets = offsets
+        self.words = words
+
+        words = np.asarray(words, dtype=np.uint64)
+        self.frame_sizes = ((words >> np.uint64(AdtsFormat.FRAME_SIZE_SHIFT)) & np.uint64(AdtsFormat.FRAME_SIZE_MASK)).astype(np.uint16)
+        block_counts = (words & np.uint64(AdtsFormat.AAC_FRAME_COUNT_MASK)) + np.uint64(1)
+
+        # start sample of each frame, followed by the total sample count
+        self.samples = np.zeros(len(words) + 1, dtype=np.uint64)
+        np.cumsum(block_counts * np.uint64(TimingIndex.SAMPLES_PER_BLOCK), out=self.samples[1:])
+
+        self.sample_rate = 0
+        if len(words):
+            self.sample_rate = AdtsFieldHelper.get_sample_rate(int(words[0] >> np.uint64(34)) & 0x0F)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @staticmethod
+    def get_index_filename(filename: str) -> str:
+        return filename + TimingIndex.EXTENSION
+
+    @staticmethod
+    def from_file(filename: str, use_index: bool = True) -> 'TimingIndex':
+        # sidecar if valid, else scan file and write sidecar
+        if use_index:
+            index = TimingIndex.load(filename)
+            if index:
+                return index
+
+        with open(filename, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return TimingIndex(np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64))
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                result = AdtsResync.scan(data)
+
+        index = TimingIndex(result.offsets, result.words)
+        if use_index:
+            index.write(filename)
+        return index
+
+    # timing
+
+    def duration(self) -> float:
+        # seconds
+        if self.sample_rate <= 0:
+            return 0.0
+        return float(self.samples[-1]) / self.sample_rate
+
+    def get_start_time(self, index: int) -> float:
+        return float(self.samples[index]) / self.sample_rate
+
+    def frame_at(self, seconds: float) -> int:
+        # index of frame playing at seconds, -1 if out of range
+        if self.sample_rate <= 0 or seconds < 0:
+            return -1
+        sample = int(seconds * self.sample_rate)
+        index = int(np.searchsorted(self.samples, np.uint64(sample), side='right')) - 1
+        return index if index < len(self.offsets) else -1
+
+    # bitrate
+
+    def get_average_bitrate(self) -> float:
+        # bits per second
+        duration = self.duration()
+        if duration <= 0:
+            return 0.0
+        return float(np.sum(self.frame_sizes, dtype=np.uint64)) * 8 / duration
+
+    def bitrate_timeline(self, window: float) -> (np.ndarray, np.ndarray):
+        # start time and bitrate of the window starting at each frame, only
+        # windows within the file (or one window over the whole file if shorter)
+        if window <= 0:
+            raise ValueError('Window has to be positive')
+        if len(self.offsets) == 0 or self.sample_rate <= 0:
+            return np.empty(0), np.empty(0)
+
+        window_samples = max(int(window * self.sample_rate), 1)
+        starts = self.samples[:-1]
+        ends = np.searchsorted(self.samples, starts + np.uint64(window_samples), side='left')
+        ends = np.minimum(ends, len(self.offsets))
+        complete = starts + np.uint64(window_samples) <= self.samples[-1]
+        if not np.any(complete):
+            complete[0] = True
+
+        byte_counts = np.zeros(len(self.offsets) + 1, dtype=np.uint64)
+        np.cumsum(self.frame_sizes, out=byte_counts[1:])
+
+        indices = np.flatnonzero(complete)
+        bits = (byte_counts[ends[indices]] - byte_counts[indices]).astype(np.float64) * 8
+        seconds = (self.samples[ends[indices]] - self.samples[indices]).astype(np.float64) / self.sample_rate
+        return starts[indices].astype(np.float64) / self.sample_rate, bits / seconds
+
+    def get_peak_bitrate(self, window: float) -> float:
+        _, bitrates = self.bitrate_timeline(window)
+        return float(np.max(bitrates)) if len(bitrates) else 0.0
+
+    # sidecar
+
+    def write(self, filename: str):
+        rows = np.empty((len(self.offsets), 2), dtype='<u8')
+        rows[:, 0] = self.offsets
+        rows[:, 1] = self.words
+        header = TimingIndex.HEADER.pack(TimingIndex.MAGIC_STRUCTURE, len(rows), *TimingIndex.__get_source_state(filename))
+
+        # readers see either the old sidecar or the complete new one (rename)
+        index_filename = TimingIndex.get_index_filename(filename)
+        part_filename = index_filename + '.part'
+        with open(part_filename, 'wb') as file:
+            file.write(header)
+            file.write(rows.tobytes())
+        os.replace(part_filename, index_filename)
+
+    @staticmethod
+    def load(filename: str) -> Optional['TimingIndex']:
+        # None if missing, malformed or stale
+        index_filename = TimingIndex.get_index_filename(filename)
+        try:
+            with open(index_filename, 'rb') as file:
+                header = file.read(TimingIndex.HEADER.size)
+                index_size = os.fstat(file.fileno()).st_size
+        except OSError:
+            return None
+
+        if len(header) != TimingIndex.HEADER.size:
+            return None
+        magic, count, *state = TimingIndex.HEADER.unpack(header)
+        if magic != TimingIndex.MAGIC_STRUCTURE or index_size != TimingIndex.HEADER.size + count * 16:
+            return None
+        if tuple(state) != TimingIndex.__get_source_state(filename):
+            return None
+        if count == 0:
+            return TimingIndex(np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64))
+
+        # one mapping, offsets and words are column views of it
+        rows = np.memmap(index_filename, dtype='<u8', mode='r', offset=TimingIndex.HEADER.size, shape=(count, 2))
+        return TimingIndex(rows[:, 0], rows[:, 1])
+
+    @staticmethod
+    def __get_source_state(filename: str) -> (int, int, int):
+        # size, mtime [ns] and crc32 of the leading and trailing CHECK_SIZE
+        # bytes, catches rewrites keeping size and mtime
+        stat = os.stat(filename)
+        with open(filename, 'rb') as file:
+            checksum = zlib.crc32(file.read(TimingIndex.CHECK_SIZE))
+            if stat.st_size > TimingIndex.CHECK_SIZE:
+                file.seek(max(TimingIndex.CHECK_SIZE, stat.st_size - TimingIndex.CHECK_SIZE))
+                checksum = zlib.crc32(file.read(TimingIndex.CHECK_SIZE), checksum)
+        return stat.st_size, stat.st_mtime_ns, checksum
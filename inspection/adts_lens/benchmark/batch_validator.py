@@ -0,0 +1,38 @@
+from adts_lens.batch_validator import BatchValidator
+import os
+import sys
+import tempfile
+import time
+from tests.synthetic import make_stream
+
+# Throughput of the batch validator with the number of worker processes.
+#
+# python3 -m benchmark.batch_validator [FOLDER]
+
+WORKERS = [1, 2, 4, 8]
+
+def compare(path: str):
+    file_count = len(BatchValidator.get_filenames(path))
+    print('Path:', path, 'files:', file_count, 'cpus:', os.cpu_count())
+
+    report_filename = os.path.join(tempfile.mkdtemp(), 'report.jsonl')
+    for workers in WORKERS:
+        start = time.perf_counter()
+        BatchValidator.run(path, report_filename, workers)
+        duration = time.perf_counter() - start
+        print('workers: {0:2d} {1:8.3f} s, {2:8.1f} files/s'.format(workers, duration, file_count / duration))
+
+def main():
+    if len(sys.argv) > 1:
+        compare(sys.argv[1])
+        return
+
+    # 200 ads of about 30 s
+    folder = tempfile.mkdtemp()
+    for index in range(200):
+        with open(os.path.join(folder, 'ad_{0:04d}.aac'.format(index)), 'wb') as file:
+            file.write(make_stream(1300, seed=index))
+    compare(folder)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+from adts_lens.adts_format import AdtsFormat, FrameHeader
+import gc
+import mmap
+import numpy as np
+import sys
+import time
+from benchmark.legacy import LegacyFrameHeader
+from tests.synthetic import make_header
+
+# Memory and time of header objects for 24 hours of 128 kbps frames
+# (~3.7 million frames): all fields decoded into the instance dict against
+# slots with offset and header word only, fields decoded on access.
+#
+# python3 -m benchmark.header_memory [FILEPATH]
+
+FRAME_COUNT: int = 24 * 155000
+FRAME_SIZE: int = 372
+
+def get_legacy_headers(offsets: np.ndarray, words: np.ndarray) -> [LegacyFrameHeader]:
+    headers = []
+    for offset, word in zip(offsets.tolist(), words.tolist()):
+        decoded = FrameHeader(offset, word)
+        header = LegacyFrameHeader()
+        header.version = decoded.version
+        header.layer = decoded.layer
+        header.protection_absent = decoded.protection_absent
+        header.profile_index = decoded.profile_index
+        header.sampling_frequency_index = decoded.sampling_frequency_index
+        header.private_bit = decoded.private_bit
+        header.channel_config_index = decoded.channel_config_index
+        header.originality = decoded.originality
+        header.home = decoded.home
+        header.copyright_id_bit = decoded.copyright_id_bit
+        header.copyright_id_start = decoded.copyright_id_start
+        header.frame_size = decoded.frame_size
+        header.bufferfullness = decoded.bufferfullness
+        header.aac_frame_count = decoded.aac_frame_count
+        header.crc = decoded.crc
+        header.frame_size_data = decoded.frame_size_data
+        header.offset = offset
+        headers.append(header)
+    return headers
+
+def get_rss() -> int:
+    # resident memory in bytes
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) * 1024
+    return -1
+
+def measure(name: str, function, *args):
+    gc.collect()
+    rss = get_rss()
+    start = time.perf_counter()
+    headers = function(*args)
+    duration = time.perf_counter() - start
+    size = get_rss() - rss
+
+    # typical use: one field of every frame
+    start = time.perf_counter()
+    total_size = sum(header.frame_size for header in headers)
+    access_duration = time.perf_counter() - start
+
+    print('{0:8} build {1:7.3f} s, access {2:7.3f} s, {3:8.1f} MB, {4:6.1f} bytes/frame'.format(name, duration, access_duration, size / 1e6, size / len(headers)))
+    return total_size
+
+def main():
+    data = b''
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        offsets, words = AdtsFormat.get_frame_words(data)
+    else:
+        # headers without crc do not touch the data
+        offsets = np.arange(FRAME_COUNT, dtype=np.int64) * FRAME_SIZE
+        words = np.full(FRAME_COUNT, int.from_bytes(make_header(FRAME_SIZE), 'big'), dtype=np.uint64)
+    print('Frames:', len(offsets))
+
+    legacy_size = measure('dict:', get_legacy_headers, offsets, words)
+    size = measure('slots:', AdtsFormat.get_headers, data, offsets, words)
+    print('equal:', legacy_size == size)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+from adts_lens.adts_format import AdtsFormat
+import sys
+import time
+from benchmark.legacy import get_legacy_headers
+from tests.synthetic import make_stream
+
+# Frame walk of per field getters against the vectorized walker and single
+# word decoding on one hour of 128 kbps frames (~155000 frames).
+#
+# python3 -m benchmark.header_walker [FILEPATH]
+
+FRAME_COUNT: int = 155000
+
+def get_walker_offsets(data: bytearray) -> [int]:
+    offsets, _ = AdtsFormat.get_frame_words(data)
+    return offsets.tolist()
+
+def get_header_offsets(data: bytearray) -> [int]:
+    return [header.offset for header in AdtsFormat.get_all_headers(data)]
+
+def get_legacy_offsets(data: bytearray) -> [int]:
+    return [header.offset for header in get_legacy_headers(data)]
+
+def measure(name: str, function, data: bytearray) -> ([int], float):
+    start = time.perf_counter()
+    offsets = function(data)
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:10.0f} frames/s'.format(name, duration, len(offsets) / duration))
+    return offsets, duration
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = make_stream(FRAME_COUNT)
+    print('Size:', len(data))
+
+    # walker: offsets and header words only, headers: FrameHeader objects on top
+    legacy_offsets, legacy_duration = measure('legacy:', get_legacy_offsets, data)
+    walker_offsets, walker_duration = measure('walker:', get_walker_offsets, data)
+    header_offsets, header_duration = measure('headers:', get_header_offsets, data)
+
+    print('Frames:', len(walker_offsets), 'equal:', walker_offsets == legacy_offsets and header_offsets == legacy_offsets)
+    print('Speedup walker: {0:.1f}x, headers: {1:.1f}x'.format(legacy_duration / walker_duration, legacy_duration / header_duration))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+from adts_lens.adts_format import AdtsFormat, FrameHeader
+
+# Header decoding before single word decoding and slots, for comparison.
+
+class LegacyFrameHeader:
+    # all fields decoded and kept in the instance dict
+
+    def __init__(self):
+        self.version = 1
+        self.layer = 0
+        self.protection_absent = False
+        self.profile_index = 0
+        self.sampling_frequency_index = 0
+        self.private_bit = 0
+        self.channel_config_index = 0
+        self.originality = 0
+        self.home = 0
+        self.copyright_id_bit = 0
+        self.copyright_id_start = 0
+        self.frame_size = 0
+        self.bufferfullness = 0
+        self.aac_frame_count = 0
+        self.crc = 0
+        self.frame_size_data = 0
+        self.offset = 0
+
+def get_legacy_header(data: bytearray, offset: int) -> LegacyFrameHeader:
+    # byte wise decoding as done before, one getter per field
+    header = LegacyFrameHeader()
+    header.version = AdtsFormat.get_version(data, offset)
+    header.layer = AdtsFormat.get_layer(data, offset)
+    header.protection_absent = AdtsFormat.get_protection(data, offset)
+    header.profile_index = AdtsFormat.get_profile_index(data, offset)
+    header.sampling_frequency_index = AdtsFormat.get_sample_rate_index(data, offset)
+    header.private_bit = AdtsFormat.get_private_bit(data, offset)
+    header.channel_config_index = AdtsFormat.get_channel_config_index(data, offset)
+    header.originality = AdtsFormat.get_originality_bit(data, offset)
+    header.home = AdtsFormat.get_home_bit(data, offset)
+    header.copyright_id_bit = AdtsFormat.get_copyright_id_bit(data, offset)
+    header.copyright_id_start = AdtsFormat.get_copyright_id_start(data, offset)
+    header.frame_size = AdtsFormat.get_frame_size(data, offset)
+    header.bufferfullness = AdtsFormat.get_buffer_fullness(data, offset)
+    header.aac_frame_count = AdtsFormat.get_aac_frames_count(data, offset)
+    header.crc = AdtsFormat.get_crc(data, offset)
+    header.frame_size_data = AdtsFormat.get_frame_size_data(data, offset)
+    header.offset = offset
+    return header
+
+def get_legacy_headers(data: bytearray) -> [LegacyFrameHeader]:
+    headers = []
+    offset = 0
+    data_size = len(data)
+    while offset < data_size - FrameHeader.MIN_HEADER_SIZE:
+        if AdtsFormat.is_magic_structure(data, offset):
+            header = get_legacy_header(data, offset)
+            if header.frame_size >= FrameHeader.MIN_HEADER_SIZE:
+                headers.append(header)
+                offset += header.frame_size
+                continue
+        offset += 1
+    return headers
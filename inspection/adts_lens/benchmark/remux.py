@@ -0,0 +1,38 @@
+from adts_lens.aac_remuxer import AacRemuxer, RemuxFormat
+import os
+import sys
+import tempfile
+import time
+from benchmark.mmap_input import get_status_value
+from tests.synthetic import make_stream
+
+# Remux of one hour of 128 kbps frames to fragmented MP4 and LATM.
+#
+# python3 -m benchmark.remux [FILEPATH]
+
+FRAME_COUNT: int = 155000
+
+def main():
+    folder = tempfile.mkdtemp()
+    if len(sys.argv) > 1:
+        filepath = sys.argv[1]
+    else:
+        filepath = os.path.join(folder, 'synthetic.aac')
+        with open(filepath, 'wb') as file:
+            file.write(make_stream(FRAME_COUNT))
+
+    size = os.path.getsize(filepath)
+    print('File:', filepath, 'size:', size)
+
+    for remux_format in [RemuxFormat.MP4, RemuxFormat.LATM]:
+        output_filename = os.path.join(folder, 'output.' + remux_format.value)
+        start = time.perf_counter()
+        result = AacRemuxer.remux(filepath, output_filename, remux_format)
+        duration = time.perf_counter() - start
+        print('{0:6} {1:8.3f} s, {2:8.1f} MB/s, {3} frames, output {4} bytes'.format(remux_format.value + ':', duration, size / duration / 1e6, len(result.offsets), os.path.getsize(output_filename)))
+        os.remove(output_filename)
+
+    print('Anonymous rss:', get_status_value('RssAnon'), 'kB')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+from adts_lens.adts_resync import AdtsResync
+import random
+import sys
+import time
+from tests.synthetic import make_stream
+
+# Resync scan of streams with crc and injected corruption (flipped bytes and
+# dropped chunks) at growing length, time per frame should stay constant.
+#
+# python3 -m benchmark.resync [FILEPATH]
+
+FRAME_COUNTS: [int] = [38750, 77500, 155000] # 15, 30, 60 minutes at 128 kbps
+CORRUPTION_COUNT: int = 100 # per 15 minutes
+
+def corrupt(data: bytes, count: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    data = bytearray(data)
+    for _ in range(count):
+        offset = rng.randrange(len(data) - 1000)
+        if rng.random() < 0.5:
+            data[offset] ^= 0xFF
+        else:
+            del data[offset : offset + rng.randrange(1, 1000)]
+    return bytes(data)
+
+def measure(name: str, data: bytes):
+    start = time.perf_counter()
+    result = AdtsResync.scan(data)
+    duration = time.perf_counter() - start
+    frame_count = len(result.offsets)
+    print('{0:12} {1:8.3f} s, {2:8.0f} frames, {3:6.2f} us/frame, {4} corrupt spans, {5} bytes, {6} crc errors'.format(
+        name, duration, frame_count, duration / max(frame_count, 1) * 1e6, len(result.corrupt_spans), result.get_corrupt_size(), result.crc_error_count))
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            measure('file:', file.read())
+        return
+
+    for frame_count in FRAME_COUNTS:
+        data = make_stream(frame_count, protection_absent=False)
+        data = corrupt(data, CORRUPTION_COUNT * frame_count // FRAME_COUNTS[0])
+        measure('{0} frames:'.format(frame_count), data)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+from adts_lens.timing_index import TimingIndex
+import os
+import sys
+import tempfile
+import time
+from tests.synthetic import make_stream
+
+# Timing index of one hour of 128 kbps frames: scan and write sidecar,
+# load sidecar, duration, peak bitrate and seeks.
+#
+# python3 -m benchmark.timing_index [FILEPATH]
+
+FRAME_COUNT: int = 155000
+SEEK_COUNT: int = 10000
+
+def main():
+    if len(sys.argv) > 1:
+        filepath = sys.argv[1]
+    else:
+        filepath = os.path.join(tempfile.mkdtemp(), 'synthetic.aac')
+        with open(filepath, 'wb') as file:
+            file.write(make_stream(FRAME_COUNT))
+
+    index_filename = TimingIndex.get_index_filename(filepath)
+    if os.path.exists(index_filename):
+        os.remove(index_filename)
+
+    start = time.perf_counter()
+    index = TimingIndex.from_file(filepath)
+    print('scan:     {0:8.3f} s, {1} frames'.format(time.perf_counter() - start, len(index)))
+
+    start = time.perf_counter()
+    index = TimingIndex.from_file(filepath)
+    duration = index.duration()
+    print('sidecar:  {0:8.3f} s, duration {1:.3f} s'.format(time.perf_counter() - start, duration))
+
+    start = time.perf_counter()
+    peak = index.get_peak_bitrate(1.0)
+    print('timeline: {0:8.3f} s, peak {1:.0f} bps'.format(time.perf_counter() - start, peak))
+
+    start = time.perf_counter()
+    for seek in range(SEEK_COUNT):
+        index.frame_at(seek * duration / SEEK_COUNT)
+    print('seek:     {0:8.3f} us'.format((time.perf_counter() - start) / SEEK_COUNT * 1e6))
+
+    os.remove(index_filename)
+
+if __name__ == '__main__':
+    main()
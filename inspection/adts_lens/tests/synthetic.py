@@ -0,0 +1,57 @@
+import random
+
+# Synthetic adts frames, input of tests and benchmarks.
+
+def make_header(frame_size: int, profile_index: int = 1, sampling_frequency_index: int = 4, channel_config_index: int = 2, protection_absent: bool = True, aac_frame_count: int = 1) -> bytes:
+    # MPEG-4 ADTS header, with 2 zero crc bytes if protection is not absent
+    word = 0xFFF << 44
+    word |= int(protection_absent) << 40
+    word |= profile_index << 38
+    word |= sampling_frequency_index << 34
+    word |= channel_config_index << 30
+    word |= frame_size << 13
+    word |= 0x7FF << 2
+    word |= aac_frame_count - 1
+    header = word.to_bytes(7, 'big')
+    if not protection_absent:
+        header += bytes(2)
+    return header
+
+def make_frame(frame_size: int, payload: bytes) -> bytes:
+    # single channel element frame with valid crc over header and the leading
+    # 192 bits of the payload
+    frame = bytearray(make_header(frame_size, protection_absent=False) + payload)
+    frame[7:9] = get_reference_crc(frame[:7] + frame[9:33]).to_bytes(2, 'big')
+    return bytes(frame)
+
+def get_bitwise_crc(byte: int, crc: int) -> int:
+    # one byte of CRC-16, polynomial 0x8005, not reflected
+    crc ^= byte << 8
+    for _ in range(8):
+        crc = ((crc << 1) ^ 0x8005 if crc & 0x8000 else crc << 1) & 0xFFFF
+    return crc
+
+# crc register after one byte, for all high register bytes
+CRC_TABLE = [get_bitwise_crc(value, 0) for value in range(256)]
+
+def get_reference_crc(data: bytes) -> int:
+    # CRC-16 with init 0xFFFF, independent of AdtsFormat.crc16
+    crc = 0xFFFF
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ CRC_TABLE[(crc >> 8) ^ byte]
+    return crc
+
+def make_stream(frame_count: int, frame_size: int = 372, seed: int = 0, protection_absent: bool = True) -> bytes:
+    # 128 kbps at 44.1 kHz is about 372 bytes per frame
+    rng = random.Random(seed)
+    header = make_header(frame_size, protection_absent=protection_absent)
+    payload_size = frame_size - len(header)
+
+    parts = []
+    for _ in range(frame_count):
+        if protection_absent:
+            parts.append(header)
+            parts.append(rng.randbytes(payload_size))
+        else:
+            parts.append(make_frame(frame_size, rng.randbytes(payload_size)))
+    return b''.join(parts)
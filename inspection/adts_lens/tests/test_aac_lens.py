@@ -0,0 +1,31 @@
+import contextlib
+import io
+from adts_lens.__main__ import AacLens
+from tests.helpers import FileTestCase
+from tests.synthetic import make_stream
+
+class AacLensTests(FileTestCase):
+
+    def open_lens(self, data: bytes, use_mmap: bool) -> AacLens:
+        filename = self.write_file('audio.aac', data)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return AacLens(filename, use_mmap)
+
+    def test_mmap(self):
+        lens = self.open_lens(make_stream(10, frame_size=200), True)
+        self.assertIsNotNone(lens.mmap)
+        self.assertEqual(len(lens.headers), 10)
+        lens.close()
+        self.assertIsNone(lens.data)
+
+    def test_mmap_empty_file(self):
+        lens = self.open_lens(b'', True)
+        self.assertIsNone(lens.mmap)
+        self.assertEqual(lens.headers, [])
+
+    def test_close_with_view(self):
+        # a view still in use keeps the mapping open instead of raising
+        lens = self.open_lens(make_stream(10, frame_size=200), True)
+        view = lens.data[0:200]
+        lens.close()
+        self.assertEqual(bytes(view[0:2]), b'\xff\xf1')
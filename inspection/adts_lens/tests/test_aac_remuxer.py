@@ -0,0 +1,133 @@
+import struct
+from adts_lens.aac_remuxer import AacRemuxer, AccessUnits, RemuxFormat
+from adts_lens.adts_format import AdtsFormat
+from tests.helpers import FileTestCase
+from tests.synthetic import make_header, make_stream
+
+class AacRemuxerTests(FileTestCase):
+
+    def get_units(self, data: bytes) -> [bytes]:
+        view = memoryview(data)
+        units = []
+        for header in AdtsFormat.get_all_headers(data):
+            units += [bytes(unit) for unit in AccessUnits.get_access_units(view, header)]
+        return units
+
+    def remux(self, data: bytes, remux_format: RemuxFormat) -> bytes:
+        input_filename = self.write_file('input.aac', data)
+        output_filename = self.get_filename('output')
+        AacRemuxer.remux(input_filename, output_filename, remux_format)
+        with open(output_filename, 'rb') as file:
+            return file.read()
+
+    # Access units
+
+    def test_audio_specific_config(self):
+        # AAC LC, 44.1 kHz, stereo
+        header = AdtsFormat.get_header(make_header(100))
+        self.assertEqual(AccessUnits.get_audio_specific_config(header), bytes.fromhex('1210'))
+
+    def test_access_units(self):
+        data = make_header(20) + bytes(range(13)) + make_header(20, protection_absent=False) + bytes(range(11))
+        self.assertEqual(self.get_units(data), [bytes(range(13)), bytes(range(11))])
+
+    def test_split_raw_data_blocks(self):
+        # header, position of second block, crc, block, crc, block, crc
+        frame_size = 7 + 2 + 2 + 5 + 2 + 3 + 2
+        data = make_header(frame_size, protection_absent=False, aac_frame_count=2)[:7]
+        data += (7).to_bytes(2, 'big') + bytes(2) + b'abcde' + bytes(2) + b'fgh' + bytes(2)
+        self.assertEqual(self.get_units(data), [b'abcde', b'fgh'])
+
+    def test_split_raw_data_blocks_without_crc(self):
+        data = make_header(20, aac_frame_count=2) + bytes(13)
+        with self.assertRaises(ValueError):
+            self.get_units(data)
+
+    def test_remux_error(self):
+        # errors of the remux reach the caller, the mapping is closed anyway
+        data = make_stream(300, frame_size=300) + make_header(300, aac_frame_count=2) + bytes(293)
+        with self.assertRaisesRegex(ValueError, 'can not be split'):
+            self.remux(data, RemuxFormat.MP4)
+
+        data = make_stream(300, frame_size=300) + (make_header(300, sampling_frequency_index=3) + bytes(293)) * 5
+        with self.assertRaisesRegex(ValueError, 'Audio config changed'):
+            self.remux(data, RemuxFormat.MP4)
+
+    def test_remux_result(self):
+        # frames behind garbage are found on the mapped file, garbage is reported
+        data = bytes(50) + make_stream(20, frame_size=300)
+        input_filename = self.write_file('input.aac', data)
+        result = AacRemuxer.remux(input_filename, self.get_filename('output'), RemuxFormat.LATM)
+        self.assertEqual(result.offsets.tolist(), list(range(50, 50 + 20 * 300, 300)))
+        self.assertEqual(result.get_corrupt_size(), 50)
+
+    # LATM
+
+    def test_latm(self):
+        data = make_stream(20, frame_size=300)
+        output = self.remux(data, RemuxFormat.LATM)
+
+        units = []
+        offset = 0
+        while offset < len(output):
+            sync = int.from_bytes(output[offset : offset + 3], 'big')
+            self.assertEqual(sync >> 13, 0x2B7)
+            size = sync & 0x1FFF
+            element = int.from_bytes(output[offset + 3 : offset + 3 + size], 'big')
+            bits = bin(element)[2:].zfill(size * 8)
+
+            # useSameStreamMux, StreamMuxConfig with AudioSpecificConfig at bit 16
+            self.assertEqual(bits[0], '0')
+            self.assertEqual(int(bits[16:32], 2), 0x1210)
+            position = 45
+            unit_size = 0
+            while True:
+                value = int(bits[position : position + 8], 2)
+                position += 8
+                unit_size += value
+                if value != 255:
+                    break
+            unit = int(bits[position : position + unit_size * 8], 2).to_bytes(unit_size, 'big')
+            units.append(unit)
+            offset += 3 + size
+
+        self.assertEqual(units, self.get_units(data))
+
+    # MP4
+
+    def get_boxes(self, data: bytes, offset: int = 0, end: int = -1) -> [(bytes, int, int)]:
+        # type, offset, size
+        end = len(data) if end < 0 else end
+        boxes = []
+        while offset < end:
+            size, box_type = struct.unpack('>I4s', data[offset : offset + 8])
+            boxes.append((box_type, offset, size))
+            offset += size
+        return boxes
+
+    def test_mp4(self):
+        data = make_stream(600, frame_size=300)
+        output = self.remux(data, RemuxFormat.MP4)
+        boxes = self.get_boxes(output)
+        self.assertEqual([box[0] for box in boxes], [b'ftyp', b'moov'] + [b'moof', b'mdat'] * 3)
+        self.assertIn(b'esds', output[boxes[1][1] : boxes[1][1] + boxes[1][2]])
+
+        units = []
+        for index in range(2, len(boxes), 2):
+            _, moof_offset, moof_size = boxes[index]
+            _, mdat_offset, mdat_size = boxes[index + 1]
+
+            # moof: mfhd, traf: tfhd, tfdt, trun
+            traf = self.get_boxes(output, moof_offset + 8, moof_offset + moof_size)[1]
+            trun = self.get_boxes(output, traf[1] + 8, traf[1] + traf[2])[2]
+            count, data_offset = struct.unpack('>Ii', output[trun[1] + 12 : trun[1] + 20])
+            sizes = struct.unpack('>{0}I'.format(count), output[trun[1] + 20 : trun[1] + 20 + 4 * count])
+            self.assertEqual(moof_offset + data_offset, mdat_offset + 8)
+
+            position = mdat_offset + 8
+            for size in sizes:
+                units.append(output[position : position + size])
+                position += size
+            self.assertEqual(position, mdat_offset + mdat_size)
+
+        self.assertEqual(units, self.get_units(data))
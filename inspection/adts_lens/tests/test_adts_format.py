@@ -0,0 +1,73 @@
+import unittest
+from adts_lens.adts_format import AdtsFormat
+from tests.synthetic import make_frame, make_header, make_stream
+
+class AdtsFormatTests(unittest.TestCase):
+
+    # Header
+
+    def test_header_fields(self):
+        data = make_header(300, profile_index=1, sampling_frequency_index=3, channel_config_index=2, aac_frame_count=2) + bytes(293)
+        header = AdtsFormat.get_header(data)
+        self.assertEqual(header.version, 0)
+        self.assertEqual(header.layer, 0)
+        self.assertEqual(header.protection_absent, 1)
+        self.assertEqual(header.profile_index, 1)
+        self.assertEqual(header.sampling_frequency_index, 3)
+        self.assertEqual(header.channel_config_index, 2)
+        self.assertEqual(header.frame_size, 300)
+        self.assertEqual(header.frame_size_data, 293)
+        self.assertEqual(header.bufferfullness, 0x7FF)
+        self.assertEqual(header.aac_frame_count, 2)
+        self.assertEqual(header.crc, -1)
+
+    def test_header_matches_field_getters(self):
+        data = make_header(400, profile_index=2, sampling_frequency_index=11, channel_config_index=6, protection_absent=False) + bytes(391)
+        header = AdtsFormat.get_header(data)
+        self.assertEqual(header.profile_index, AdtsFormat.get_profile_index(data))
+        self.assertEqual(header.sampling_frequency_index, AdtsFormat.get_sample_rate_index(data))
+        self.assertEqual(header.channel_config_index, AdtsFormat.get_channel_config_index(data))
+        self.assertEqual(header.frame_size, AdtsFormat.get_frame_size(data))
+        self.assertEqual(header.bufferfullness, AdtsFormat.get_buffer_fullness(data))
+        self.assertEqual(header.crc, AdtsFormat.get_crc(data))
+        self.assertEqual(header.frame_size_data, AdtsFormat.get_frame_size_data(data))
+
+    # All headers
+
+    def test_all_headers(self):
+        data = make_stream(50, frame_size=200)
+        headers = AdtsFormat.get_all_headers(data)
+        self.assertEqual([header.offset for header in headers], list(range(0, 50 * 200, 200)))
+
+    def test_all_headers_skips_garbage(self):
+        frame = make_header(100) + bytes(93)
+        data = bytes(5) + frame + b'\x00\x01\x02' + frame + frame
+        headers = AdtsFormat.get_all_headers(data)
+        self.assertEqual([header.offset for header in headers], [5, 108, 208])
+
+    def test_all_headers_skips_zero_frame_size(self):
+        frame = make_header(100) + bytes(93)
+        data = make_header(0) + frame
+        headers = AdtsFormat.get_all_headers(data)
+        self.assertEqual([header.offset for header in headers], [7])
+
+    def test_all_headers_false_sync_with_large_size(self):
+        # sync in junk claims 8000 bytes, no frame starts there
+        data = b'junk' + make_header(8000) + bytes(3) + make_stream(20, frame_size=200)
+        headers = AdtsFormat.get_all_headers(data)
+        self.assertEqual([header.offset for header in headers], [4] + list(range(14, 14 + 20 * 200, 200)))
+
+    def test_all_headers_empty(self):
+        self.assertEqual(AdtsFormat.get_all_headers(bytes(100)), [])
+        self.assertEqual(AdtsFormat.get_all_headers(b''), [])
+
+    # Crc
+
+    def test_crc16_check_value(self):
+        self.assertEqual(AdtsFormat.crc16(b'123456789'), 0xAEE7)
+
+    def test_frame_crc(self):
+        # header with crc and 24 protected bytes 0x00..0x17, crc computed bit by bit
+        frame = bytes.fromhex('FFF050800C9FFC691A') + bytes(range(24)) + bytes(67)
+        self.assertEqual(AdtsFormat.get_frame_crc(frame, 0, 100), 0x691A)
+        self.assertEqual(make_frame(100, bytes(range(24)) + bytes(67)), frame)
@@ -0,0 +1,81 @@
+import unittest
+from adts_lens.adts_resync import AdtsResync, SpanReason
+from tests.synthetic import make_frame, make_header, make_stream
+
+class AdtsResyncTests(unittest.TestCase):
+
+    def get_spans(self, result) -> [(int, int, SpanReason)]:
+        return [(span.offset, span.size, span.reason) for span in result.corrupt_spans]
+
+    # Clean streams
+
+    def test_clean_stream(self):
+        data = make_stream(20, frame_size=200)
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.offsets.tolist(), list(range(0, 4000, 200)))
+        self.assertEqual(result.corrupt_spans, [])
+
+    def test_clean_stream_with_crc(self):
+        data = make_stream(20, frame_size=200, protection_absent=False)
+        result = AdtsResync.scan(data)
+        self.assertEqual(len(result.offsets), 20)
+        self.assertEqual(result.crc_error_count, 0)
+        self.assertEqual(result.corrupt_spans, [])
+
+    # Corruption
+
+    def test_leading_garbage(self):
+        data = b'\x00\xFF\xF1' + bytes(7) + make_stream(5, frame_size=100)
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.offsets.tolist(), [10, 110, 210, 310, 410])
+        self.assertEqual(self.get_spans(result), [(0, 10, SpanReason.NO_SYNC)])
+
+    def test_crc_mismatch(self):
+        data = bytearray(make_stream(5, frame_size=100, protection_absent=False))
+        data[215] ^= 0x01
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.offsets.tolist(), [0, 100, 200, 300, 400])
+        self.assertEqual(result.crc_error_count, 1)
+        self.assertEqual(result.corrupt_spans, [])
+
+    def test_crc_mismatch_behind_protected_region(self):
+        # bytes behind the leading 192 bits do not count
+        data = bytearray(make_stream(5, frame_size=100, protection_absent=False))
+        data[250] ^= 0x01
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.crc_error_count, 0)
+
+    def test_crc_mismatch_not_verified(self):
+        data = bytearray(make_stream(5, frame_size=100, protection_absent=False))
+        data[215] ^= 0x01
+        result = AdtsResync.scan(data, verify_crc=False)
+        self.assertEqual(result.crc_error_count, 0)
+
+    def test_inconsistent_header(self):
+        frame = make_header(100) + bytes(93)
+        other = make_header(100, sampling_frequency_index=3) + bytes(93)
+        data = frame + frame + other + frame
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.offsets.tolist(), [0, 100, 300])
+        self.assertEqual(self.get_spans(result), [(200, 100, SpanReason.INCONSISTENT)])
+
+    def test_zero_frame_size(self):
+        frame = make_header(100) + bytes(93)
+        data = frame + frame + make_header(0) + frame + frame
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.offsets.tolist(), [0, 100, 207, 307])
+        self.assertEqual(self.get_spans(result), [(200, 7, SpanReason.INVALID)])
+
+    def test_lost_sync(self):
+        frame = make_header(100) + bytes(93)
+        data = frame + frame + bytes(50) + frame + frame
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.offsets.tolist(), [0, 100, 250, 350])
+        self.assertEqual(self.get_spans(result), [(200, 50, SpanReason.NO_SYNC)])
+
+    def test_truncated_frame(self):
+        frame = make_frame(100, bytes(91))
+        data = frame + frame + frame[:60]
+        result = AdtsResync.scan(data)
+        self.assertEqual(result.offsets.tolist(), [0, 100])
+        self.assertEqual(self.get_spans(result), [(200, 60, SpanReason.TRUNCATED)])
@@ -0,0 +1,61 @@
+import random
+import unittest
+from adts_lens.adts_resync import SpanReason
+from adts_lens.adts_stream_parser import AdtsStreamParser
+from tests.synthetic import make_header, make_stream
+
+class AdtsStreamParserTests(unittest.TestCase):
+
+    def feed_chunks(self, parser: AdtsStreamParser, data: bytes, seed: int = 0) -> [int]:
+        rng = random.Random(seed)
+        offsets = []
+        position = 0
+        while position < len(data):
+            size = rng.randrange(1, 500)
+            offsets += [header.offset for header in parser.feed(data[position : position + size])]
+            position += size
+        return offsets
+
+    def test_chunks(self):
+        data = make_stream(30, frame_size=200)
+        parser = AdtsStreamParser()
+        offsets = self.feed_chunks(parser, data)
+        self.assertEqual(offsets, list(range(0, 6000, 200)))
+        self.assertEqual(parser.discontinuity_count, 0)
+        self.assertLess(len(parser.buffer), 200)
+
+    def test_single_bytes(self):
+        data = make_stream(5, frame_size=100)
+        parser = AdtsStreamParser()
+        offsets = []
+        for index in range(len(data)):
+            offsets += [header.offset for header in parser.feed(data[index : index + 1])]
+        self.assertEqual(offsets, [0, 100, 200, 300, 400])
+
+    def test_stats(self):
+        # 1024 samples at 44.1 kHz
+        data = make_stream(100, frame_size=300)
+        parser = AdtsStreamParser()
+        parser.feed(data)
+        self.assertEqual(parser.frame_count, 100)
+        self.assertAlmostEqual(parser.get_frame_rate(), 44100 / 1024)
+        self.assertAlmostEqual(parser.get_bitrate(), 300 * 8 * 44100 / 1024)
+
+    def test_discontinuity(self):
+        frame = make_header(100) + bytes(93)
+        data = frame + frame + bytes(50) + frame + frame + frame
+        parser = AdtsStreamParser()
+        offsets = self.feed_chunks(parser, data)
+        self.assertEqual(offsets, [0, 100, 250, 350, 450])
+        self.assertEqual(parser.discontinuity_count, 1)
+        span = parser.corrupt_spans[0]
+        self.assertEqual((span.offset, span.size, span.reason), (200, 50, SpanReason.NO_SYNC))
+
+    def test_crc_mismatch(self):
+        data = bytearray(make_stream(5, frame_size=100, protection_absent=False))
+        data[215] ^= 0x01
+        parser = AdtsStreamParser()
+        offsets = self.feed_chunks(parser, data)
+        self.assertEqual(offsets, [0, 100, 200, 300, 400])
+        self.assertEqual(parser.crc_error_count, 1)
+        self.assertEqual(parser.discontinuity_count, 0)
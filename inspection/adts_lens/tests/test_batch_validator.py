@@ -0,0 +1,69 @@
+import csv
+import json
+import os
+import unittest
+from adts_lens.batch_validator import BatchValidator
+from tests.helpers import FileTestCase
+from tests.synthetic import make_header, make_stream
+
+class BatchValidatorTests(FileTestCase):
+
+    def test_get_filenames(self):
+        self.write_file('a.aac', make_stream(10))
+        self.write_file('b.ADTS', make_stream(10))
+        self.write_file('c.mp3', b'')
+        filenames = BatchValidator.get_filenames(self.folder.name)
+        self.assertEqual([os.path.basename(filename) for filename in filenames], ['a.aac', 'b.ADTS'])
+
+    def test_validate_file(self):
+        filename = self.write_file('a.aac', make_stream(100))
+        result = BatchValidator.validate_file(filename)
+        self.assertIsNone(result['error'])
+        self.assertEqual(result['frame_count'], 100)
+        self.assertEqual(result['incomplete_frames'], 0)
+        self.assertEqual(result['layer_mismatches'], 0)
+        self.assertEqual(result['multiple_blocks'], 0)
+        self.assertEqual(result['corrupt_spans'], 0)
+        self.assertFalse(os.path.exists(self.get_filename('a_log')))
+
+    def test_validate_file_corrupt(self):
+        stream = make_stream(50)
+        multiple = make_header(372, aac_frame_count=2) + bytes(365)
+        filename = self.write_file('a.aac', stream[:3720] + b'\x00\x01\x02' + stream[3720:] + multiple)
+        result = BatchValidator.validate_file(filename)
+        self.assertEqual(result['frame_count'], 51)
+        self.assertEqual(result['incomplete_frames'], 1)
+        self.assertEqual(result['multiple_blocks'], 1)
+        self.assertEqual(result['corrupt_spans'], 1)
+        self.assertEqual(result['corrupt_size'], 3)
+
+    def test_validate_file_error(self):
+        filename = self.write_file('a.aac', b'')
+        result = BatchValidator.validate_file(filename)
+        self.assertTrue(result['error'].startswith('ValueError'))
+
+    def test_validate_file_headers(self):
+        filename = self.write_file('a.aac', make_stream(10))
+        BatchValidator.validate_file(filename, write_headers=True)
+        self.assertTrue(os.path.exists(self.get_filename('a_log')))
+
+    def test_run_jsonl(self):
+        self.write_file('a.aac', make_stream(10))
+        self.write_file('b.aac', b'')
+        report_filename = self.get_filename('report.jsonl')
+        self.assertEqual(BatchValidator.run(self.folder.name, report_filename, workers=2), 1)
+        with open(report_filename) as report_file:
+            results = [json.loads(line) for line in report_file]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['frame_count'], 10)
+
+    def test_run_csv(self):
+        self.write_file('a.aac', make_stream(10))
+        report_filename = self.get_filename('report.csv')
+        BatchValidator.run(self.folder.name, report_filename, workers=1)
+        with open(report_filename, newline='') as report_file:
+            rows = list(csv.DictReader(report_file))
+        self.assertEqual(rows[0]['frame_count'], '10')
+
+if __name__ == '__main__':
+    unittest.main()
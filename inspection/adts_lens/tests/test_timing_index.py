@@ -0,0 +1,86 @@
+import numpy as np
+import os
+from adts_lens.timing_index import TimingIndex
+from tests.helpers import FileTestCase
+from tests.synthetic import make_header, make_stream
+
+class TimingIndexTests(FileTestCase):
+
+    def make_index(self, frame_sizes: [int], aac_frame_count: int = 1) -> TimingIndex:
+        # 44.1 kHz
+        offsets = np.cumsum([0] + frame_sizes[:-1]).astype(np.uint64)
+        words = np.array([int.from_bytes(make_header(size, aac_frame_count=aac_frame_count), 'big') for size in frame_sizes], dtype=np.uint64)
+        return TimingIndex(offsets, words)
+
+    # Timing
+
+    def test_duration(self):
+        index = self.make_index([300] * 100)
+        self.assertAlmostEqual(index.duration(), 100 * 1024 / 44100)
+
+    def test_duration_multiple_blocks(self):
+        index = self.make_index([300] * 100, aac_frame_count=2)
+        self.assertAlmostEqual(index.duration(), 100 * 2048 / 44100)
+
+    def test_frame_at(self):
+        index = self.make_index([300] * 100)
+        self.assertEqual(index.frame_at(0), 0)
+        self.assertEqual(index.frame_at(1023 / 44100), 0)
+        self.assertEqual(index.frame_at(1024 / 44100), 1)
+        self.assertEqual(index.frame_at(1.0), 43)
+        self.assertEqual(index.frame_at(index.duration()), -1)
+        self.assertEqual(index.frame_at(-1), -1)
+
+    # Bitrate
+
+    def test_average_bitrate(self):
+        index = self.make_index([300] * 100)
+        self.assertAlmostEqual(index.get_average_bitrate(), 300 * 8 * 44100 / 1024)
+
+    def test_bitrate_timeline(self):
+        # window of 2 frames, one large frame in the middle
+        index = self.make_index([100, 100, 500, 100, 100])
+        times, bitrates = index.bitrate_timeline(2048 / 44100)
+        frame_bitrate = 8 * 44100 / 1024
+        self.assertEqual(len(times), 4)
+        self.assertAlmostEqual(times[1], 1024 / 44100)
+        np.testing.assert_allclose(bitrates, np.array([100, 300, 300, 100]) * frame_bitrate)
+        self.assertAlmostEqual(index.get_peak_bitrate(2048 / 44100), 300 * frame_bitrate)
+
+    def test_bitrate_timeline_window_longer_than_file(self):
+        index = self.make_index([100, 300])
+        _, bitrates = index.bitrate_timeline(10)
+        np.testing.assert_allclose(bitrates, [200 * 8 * 44100 / 1024])
+
+    # Sidecar
+
+    def test_sidecar(self):
+        filename = self.write_file('audio.aac', make_stream(50, frame_size=200))
+
+        index = TimingIndex.from_file(filename)
+        self.assertTrue(os.path.exists(TimingIndex.get_index_filename(filename)))
+
+        loaded = TimingIndex.load(filename)
+        self.assertEqual(loaded.offsets.tolist(), index.offsets.tolist())
+        self.assertAlmostEqual(loaded.duration(), 50 * 1024 / 44100)
+
+    def test_sidecar_invalid_after_change(self):
+        filename = self.write_file('audio.aac', make_stream(50, frame_size=200))
+        TimingIndex.from_file(filename)
+
+        with open(filename, 'ab') as file:
+            file.write(make_stream(10, frame_size=200))
+        self.assertIsNone(TimingIndex.load(filename))
+        self.assertEqual(len(TimingIndex.from_file(filename)), 60)
+
+    def test_sidecar_invalid_after_rewrite(self):
+        # same size and mtime, different content
+        filename = self.write_file('audio.aac', make_stream(50, frame_size=200))
+        TimingIndex.from_file(filename)
+        stat = os.stat(filename)
+
+        with open(filename, 'r+b') as file:
+            file.seek(100)
+            file.write(b'\xff')
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertIsNone(TimingIndex.load(filename))
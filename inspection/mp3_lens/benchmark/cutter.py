@@ -0,0 +1,43 @@
+from mp3_lens.__main__ import Mp3Surgeon
+import os
+import random
+import sys
+import tempfile
+import time
+from benchmark.synthetic import make_stream
+
+# Time per cut of a 30 second clip at random positions.
+#
+# python3 -m benchmark.cutter [FILEPATH]
+
+CUT_COUNT = 100
+CLIP_DURATION = 30
+
+def compare(filepath: str):
+    print('File:', filepath, 'size:', os.path.getsize(filepath))
+    surgeon = Mp3Surgeon(filepath)
+    duration = surgeon.get_header_table().get_duration()
+    clip_filename = os.path.join(tempfile.mkdtemp(), 'clip.mp3')
+
+    rng = random.Random(0)
+    for write_music_crc in [False, True]:
+        start = time.perf_counter()
+        for _ in range(CUT_COUNT):
+            start_s = rng.uniform(0, duration - CLIP_DURATION)
+            surgeon.cut(clip_filename, start_s, start_s + CLIP_DURATION, write_music_crc)
+        print('music crc: {0:1d} {1:8.4f} s per cut'.format(write_music_crc, (time.perf_counter() - start) / CUT_COUNT))
+
+def main():
+    if len(sys.argv) > 1:
+        compare(sys.argv[1])
+        return
+
+    # about one hour of 128 kbps audio
+    folder = tempfile.mkdtemp()
+    filepath = os.path.join(folder, 'cut.mp3')
+    with open(filepath, 'wb') as file:
+        file.write(make_stream(140000))
+    compare(filepath)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+from mp3_lens.__main__ import Mp3Surgeon
+from mp3_lens.frame_exporter import ExportMode
+import os
+import shutil
+import sys
+import tempfile
+import time
+from benchmark.synthetic import make_stream
+
+# Compares the frame export modes of Mp3Surgeon.write_data.
+#
+# python3 -m benchmark.frame_export [FILEPATH]
+
+def compare(filepath: str):
+    print('File:', filepath, 'size:', os.path.getsize(filepath))
+    surgeon = Mp3Surgeon(filepath, use_index=False)
+    print('Frames:', len(surgeon.frame_offsets))
+
+    for export_mode in ExportMode:
+        folder = tempfile.mkdtemp()
+        start = time.perf_counter()
+        surgeon.write_data(folder, 'benchmark', export_mode=export_mode)
+        duration = time.perf_counter() - start
+        print('{0:6s} {1:8.3f} s'.format(export_mode.value, duration))
+        shutil.rmtree(folder)
+
+def main():
+    if len(sys.argv) > 1:
+        compare(sys.argv[1])
+        return
+
+    # about 10 minutes of 128 kbps audio
+    folder = tempfile.mkdtemp()
+    filepath = os.path.join(folder, 'export.mp3')
+    with open(filepath, 'wb') as file:
+        file.write(make_stream(23000, junk_every=0))
+    compare(filepath)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+from mp3_lens.__main__ import Mp3Surgeon
+from mp3_lens.frame_index import FrameIndex
+import os
+import sys
+import tempfile
+import time
+from benchmark.synthetic import make_stream
+
+# Compares a first inspection, which scans the file and writes the frame
+# index, with a second inspection of the unchanged file.
+#
+# python3 -m benchmark.frame_index [FILEPATH]
+
+def measure(filepath: str) -> (float, int):
+    start = time.perf_counter()
+    surgeon = Mp3Surgeon(filepath)
+    return time.perf_counter() - start, len(surgeon.frame_offsets)
+
+def main():
+    if len(sys.argv) > 1:
+        filepath = sys.argv[1]
+    else:
+        filepath = os.path.join(tempfile.mkdtemp(), 'synthetic.mp3')
+        with open(filepath, 'wb') as file:
+            file.write(make_stream(200000))
+
+    index_filename = FrameIndex.get_index_filename(filepath)
+    if os.path.exists(index_filename):
+        os.remove(index_filename)
+
+    print('File:', filepath, 'size:', os.path.getsize(filepath))
+
+    scan_time, scan_frames = measure(filepath)
+    print('first run:   {0:8.3f} s, {1} frames'.format(scan_time, scan_frames))
+
+    index_time, index_frames = measure(filepath)
+    print('second run:  {0:8.3f} s, {1} frames'.format(index_time, index_frames))
+
+    print('index size:  {0} bytes'.format(os.path.getsize(index_filename)))
+
+if __name__ == '__main__':
+    main()
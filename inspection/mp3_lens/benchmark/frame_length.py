@@ -0,0 +1,23 @@
+from mp3_lens.frame_scanner import FrameScanner
+import time
+from benchmark.synthetic import make_multi_format_stream
+
+# Scanner throughput on a synthetic stream of all versions, layers, bitrates
+# and sample rates.
+#
+# python3 -m benchmark.frame_length
+
+def main():
+    data, offsets = make_multi_format_stream(100)
+    print('Size:', len(data), 'frames:', len(offsets))
+
+    start = time.perf_counter()
+    result = FrameScanner.find_frame_offsets(data, 0)
+    duration = time.perf_counter() - start
+
+    print('matches:     {0}'.format(result == offsets))
+    print('time:        {0:8.3f} s'.format(duration))
+    print('throughput:  {0:8.1f} MB/s, {1:.0f} frames/s'.format(len(data) / duration / 1e6, len(result) / duration))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+from mp3_lens.mp3_format import Mp3Format, MpegHeader
+from mp3_lens.frame_scanner import FrameScanner
+import sys
+import time
+from benchmark.synthetic import make_stream
+
+# Compares the table driven header decoding with the per field functions.
+#
+# python3 -m benchmark.header_decoding [FILEPATH]
+
+def get_mpeg_header_per_field(data: bytearray, offset: int = 0) -> MpegHeader:
+    header = MpegHeader()
+    header.version = Mp3Format.get_mpeg_version(data, offset)
+    header.layer = Mp3Format.get_layer_version(data, offset)
+    header.bitrate = Mp3Format.get_bitrate(data, offset)
+    header.sample_rate = Mp3Format.get_sample_rate(data, offset)
+    header.channel_mode = Mp3Format.get_channel_mode(data, offset)
+    header.padding = Mp3Format.get_padding(data, offset)
+    header.frame_size = int(144 * header.bitrate / (header.sample_rate + 8))
+    header.offset = offset
+    return header
+
+def measure(function, data: bytearray, offsets: [int]) -> float:
+    start = time.perf_counter()
+    for offset in offsets:
+        function(data, offset)
+    return time.perf_counter() - start
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = make_stream(100000, junk_every=0)
+
+    offsets = FrameScanner.find_frame_offsets(data, 0)
+    print('Headers:', len(offsets))
+
+    per_field_time = measure(get_mpeg_header_per_field, data, offsets)
+    print('per field:   {0:8.3f} s'.format(per_field_time))
+
+    table_time = measure(Mp3Format.get_mpeg_header, data, offsets)
+    print('table:       {0:8.3f} s'.format(table_time))
+
+    print('speedup:     {0:8.1f} x'.format(per_field_time / table_time))
+    print('cached words:', len(Mp3Format.HEADER_CACHE))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+from mp3_lens.frame_scanner import FrameScanner
+from mp3_lens.header_table import HeaderTable
+from mp3_lens.mp3_format import Mp3Format
+import sys
+import time
+import tracemalloc
+from benchmark.synthetic import make_stream
+
+# Compares one MpegHeader object per frame with the columnar header table.
+#
+# python3 -m benchmark.header_table [FILEPATH]
+
+def measure(build) -> (float, int):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    duration = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return duration, size
+
+def compare(data: bytes):
+    offsets = FrameScanner.find_frame_offsets(data, 0)
+    print('Frames:', len(offsets))
+
+    object_time, object_size = measure(lambda: [Mp3Format.get_mpeg_header(data, offset) for offset in offsets])
+    print('objects: {0:8.3f} s, {1:8.1f} MB'.format(object_time, object_size / 1e6))
+
+    table_time, table_size = measure(lambda: HeaderTable.build(data, offsets))
+    print('table:   {0:8.3f} s, {1:8.1f} MB'.format(table_time, table_size / 1e6))
+
+    table = HeaderTable.build(data, offsets)
+    start = time.perf_counter()
+    table.get_bitrate_histogram()
+    table.get_mismatches()
+    table.get_duration()
+    print('stats:   {0:8.3f} s'.format(time.perf_counter() - start))
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            compare(file.read())
+        return
+
+    # about one hour of 128 kbps audio
+    compare(make_stream(140000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+from mp3_lens.__main__ import Mp3Surgeon
+import os
+import sys
+import tempfile
+import time
+from benchmark.synthetic import make_stream
+
+# Scaling of the parallel frame scanner with the number of worker processes.
+# Results are compared against the serial scan.
+#
+# python3 -m benchmark.parallel_scanner [FILEPATH]
+
+WORKERS = [1, 2, 4, 8]
+
+def measure(filepath: str, workers: int) -> (float, [int]):
+    start = time.perf_counter()
+    surgeon = Mp3Surgeon(filepath, use_index=False, use_mmap=True, workers=workers)
+    duration = time.perf_counter() - start
+    offsets = surgeon.frame_offsets
+    surgeon.close()
+    return duration, offsets
+
+def compare(filepath: str):
+    print('File:', filepath, 'size:', os.path.getsize(filepath), 'cpus:', os.cpu_count())
+
+    serial_time, serial_offsets = measure(filepath, 1)
+    for workers in WORKERS:
+        duration, offsets = measure(filepath, workers)
+        print('workers: {0:2d} {1:8.3f} s, {2} frames, speedup {3:5.2f} x, identical: {4}'.format(workers, duration, len(offsets), serial_time / duration, offsets == serial_offsets))
+
+def main():
+    if len(sys.argv) > 1:
+        compare(sys.argv[1])
+        return
+
+    folder = tempfile.mkdtemp()
+    filepath = os.path.join(folder, 'parallel.mp3')
+    with open(filepath, 'wb') as file:
+        file.write(make_stream(200000))
+    compare(filepath)
+
+if __name__ == '__main__':
+    main()
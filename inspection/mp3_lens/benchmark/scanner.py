@@ -0,0 +1,45 @@
+from mp3_lens.__main__ import Mp3Surgeon
+import os
+import sys
+import tempfile
+import time
+from benchmark.synthetic import make_stream
+
+# Compares the vectorized frame scanner with the byte by byte loop.
+#
+# python3 -m benchmark.scanner [FILEPATH]
+
+def measure(filepath: str, fast_scan: bool) -> (float, int):
+    start = time.perf_counter()
+    surgeon = Mp3Surgeon(filepath, fast_scan=fast_scan, use_index=False)
+    return time.perf_counter() - start, len(surgeon.frame_offsets)
+
+def compare(filepath: str):
+    print('File:', filepath, 'size:', os.path.getsize(filepath))
+
+    loop_time, loop_frames = measure(filepath, fast_scan=False)
+    print('byte loop:   {0:8.3f} s, {1} frames'.format(loop_time, loop_frames))
+
+    fast_time, fast_frames = measure(filepath, fast_scan=True)
+    print('vectorized:  {0:8.3f} s, {1} frames'.format(fast_time, fast_frames))
+
+    print('speedup:     {0:8.1f} x'.format(loop_time / fast_time))
+
+def main():
+    if len(sys.argv) > 1:
+        compare(sys.argv[1])
+        return
+
+    folder = tempfile.mkdtemp()
+    scenarios = [('random_junk', make_stream(20000)),
+                 ('zero_gaps', make_stream(20000, junk_size=256 * 1024, random_junk=False))]
+
+    for name, data in scenarios:
+        filepath = os.path.join(folder, name + '.mp3')
+        with open(filepath, 'wb') as file:
+            file.write(data)
+        compare(filepath)
+        print()
+
+if __name__ == '__main__':
+    main()
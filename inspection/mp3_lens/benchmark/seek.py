@@ -0,0 +1,53 @@
+from mp3_lens.__main__ import Mp3Surgeon
+import os
+import random
+import sys
+import tempfile
+import time
+from benchmark.synthetic import make_stream
+
+# Time per seek with frame offsets (scan or index) and with the estimate used
+# when streaming, compared to opening the file.
+#
+# python3 -m benchmark.seek [FILEPATH]
+
+SEEK_COUNT = 1000
+
+def measure_seeks(surgeon: Mp3Surgeon, duration: float) -> float:
+    rng = random.Random(0)
+    times = [rng.uniform(0, duration) for _ in range(SEEK_COUNT)]
+    start = time.perf_counter()
+    for seconds in times:
+        surgeon.seek(seconds)
+    return (time.perf_counter() - start) / SEEK_COUNT
+
+def compare(filepath: str):
+    print('File:', filepath, 'size:', os.path.getsize(filepath))
+
+    start = time.perf_counter()
+    surgeon = Mp3Surgeon(filepath)
+    print('open:             {0:10.6f} s'.format(time.perf_counter() - start))
+
+    duration = surgeon.get_header_table().get_duration()
+    start = time.perf_counter()
+    surgeon.seek(0)
+    print('first seek:       {0:10.6f} s'.format(time.perf_counter() - start))
+    print('seek:             {0:10.6f} s'.format(measure_seeks(surgeon, duration)))
+
+    streaming_surgeon = Mp3Surgeon(filepath, streaming=True)
+    print('streaming seek:   {0:10.6f} s'.format(measure_seeks(streaming_surgeon, duration)))
+
+def main():
+    if len(sys.argv) > 1:
+        compare(sys.argv[1])
+        return
+
+    # about one hour of 128 kbps audio
+    folder = tempfile.mkdtemp()
+    filepath = os.path.join(folder, 'seek.mp3')
+    with open(filepath, 'wb') as file:
+        file.write(make_stream(140000))
+    compare(filepath)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+from mp3_lens.mp3_format import Mp3Format, MpegVersion, MpegLayer
+import random
+
+# V1 Layer III 128 kbps 44.1 kHz stereo
+HEADER = bytes.fromhex('FFFB9000')
+FRAME_SIZE = 417
+
+# empty Id V3 tag with 1 kB of padding, keeps the tag search short
+ID_V3_TAG = bytes.fromhex('49443304000000000800') + bytes(1024)
+
+def make_stream(frame_count: int, junk_every: int = 1000, junk_size: int = 4096, random_junk: bool = True, seed: int = 0) -> bytes:
+    # frames with random payload and a block of junk (random or zeros) every junk_every frames
+    rng = random.Random(seed)
+    payload_size = FRAME_SIZE - len(HEADER)
+
+    parts = [ID_V3_TAG]
+    for index in range(frame_count):
+        if junk_every and index % junk_every == 0:
+            parts.append(rng.randbytes(junk_size) if random_junk else bytes(junk_size))
+        parts.append(HEADER)
+        parts.append(rng.randbytes(payload_size))
+    return b''.join(parts)
+
+def make_multi_format_stream(frames_per_format: int, seed: int = 0) -> (bytes, [int]):
+    # frames of every version, layer, bitrate and sample rate with encoder like
+    # padding, returns data and frame offsets
+    rng = random.Random(seed)
+
+    parts = []
+    offsets = []
+    offset = 0
+    for version in [MpegVersion.V1, MpegVersion.V2, MpegVersion.V2_5]:
+        for layer in [MpegLayer.L1, MpegLayer.L2, MpegLayer.L3]:
+            version_index = Mp3Format.VERSIONS.index(version)
+            layer_index = Mp3Format.LAYERS.index(layer)
+            for bitrate in Mp3Format.BITRATES[version_index][layer_index][1:-1]:
+                for sample_rate in Mp3Format.SAMPLE_RATES[version_index][:-1]:
+                    rest = 0
+                    for _ in range(frames_per_format):
+                        # pad whenever the fractional part of the frame size adds up to a slot
+                        if layer == MpegLayer.L1:
+                            rest += 12 * bitrate * 1000 % sample_rate
+                        else:
+                            rest += Mp3Format.get_samples_per_frame(version, layer) // 8 * bitrate * 1000 % sample_rate
+                        padding = rest >= sample_rate
+                        if padding:
+                            rest -= sample_rate
+
+                        header = Mp3Format.build_header(version, layer, bitrate * 1000, sample_rate, padding)
+                        frame_size = Mp3Format.get_frame_size(header + bytes(4), 0)
+                        offsets.append(offset)
+                        parts.append(header)
+                        parts.append(rng.randbytes(frame_size - len(header)))
+                        offset += frame_size
+
+    return b''.join(parts), offsets
@@ -1,20 +1,69 @@
 from mp3_lens.mp3_format import Mp3Format
-from mp3_lens.idv3_format import IdV3TagFormat, TagRange
+from mp3_lens.frame_scanner import FrameScanner
+from mp3_lens.parallel_scanner import ParallelScanner
+from mp3_lens.frame_reader import FrameReader
+from mp3_lens.frame_index import FrameIndex
+from mp3_lens.header_table import HeaderTable
+from mp3_lens.vbr_format import VbrFormat, XingHeader, VbriHeader
+from mp3_lens.mp3_cutter import Mp3Cutter, CutRange
+from mp3_lens.frame_exporter import ExportMode, BatchWriter, TarFrameWriter, BlobFrameWriter, ThreadedFileWriter
+from mp3_lens.idv3_format import IdV3TagFormat, TagRange, TagType
+import mmap
+import numpy as np
 import os
 import sys
 
 class Mp3Surgeon:
 
-    def __init__(self, filename: str):
+    SEEK_WINDOW_SIZE: int = 1 << 14 # bytes searched for a frame after a seek estimate
+
+    def __init__(self, filename: str, fast_scan: bool = True, streaming: bool = False, use_index: bool = True, use_mmap: bool = False, workers: int = 1):
+        self.filename = filename
         self.frame_offsets: [int] = []
+        self.frame_words = None # header words of the frame index
         self.data = None
+        self.mmap = None
+        self.fast_scan = fast_scan
+        self.workers = workers
+        self.streaming = streaming
+        self.use_index = use_index
+        self.header_table = None
+        self.start_times = None
+
+        # frames are read on demand, only look at the beginning of the file
+        if streaming:
+            with open(filename, 'rb') as file:
+                reader = FrameReader(file)
+                first = next(iter(reader), None)
+                if first is None:
+                    raise ValueError('No frames found')
+                self.first_header, first_frame = first
+                self.first_frame = bytes(first_frame)
+                self.tag_range = reader.tag_range
+                self.tag_ranges = [self.tag_range] if self.tag_range.size > 0 else []
+            return
         
-        # read file
-        with open(filename, 'rb') as file:
-            self.data = file.read()
-
-            # find id v3 tag size
-            self.tag_range = IdV3TagFormat.get_id_v3_tag_range(self.data)
+        # reuse frame index of earlier scan
+        index = FrameIndex.load(filename) if use_index else None
+
+        # read file or map it, mapped data is paged in by the os on access. With
+        # an index the file is always mapped, only pages used later are read.
+        if use_mmap or index:
+            self.data = self.__map_file(filename, sequential=not index)
+        else:
+            with open(filename, 'rb') as file:
+                self.data = file.read()
+
+        # all tags at beginning and end
+        self.tag_ranges = IdV3TagFormat.get_tag_ranges(self.data)
+
+        if index:
+            self.tag_range = index.tag_range
+            self.frame_offsets = index.offsets
+            self.frame_words = index.words
+        else:
+            # find id v3 tag size, reported as position and size -1 if there is none
+            self.tag_range = IdV3TagFormat.get_id_v3_tag_range(self.data) or TagRange(-1, -1)
             
             frame_offset = 0
             if self.tag_range.size > 0:
@@ -22,19 +71,91 @@ class Mp3Surgeon:
 
             # find frame offsets
             self.__find_frame_offsets(self.data, frame_offset)
+
+            if use_index:
+                self.__write_index()
         
+        if len(self.frame_offsets) == 0:
+            raise ValueError('No frames found')
+
         # set first header as source of truth
         self.first_header = Mp3Format.get_mpeg_header(self.data, self.frame_offsets[0])
+        self.first_frame = bytes(self.data[self.first_header.offset : self.first_header.offset + self.first_header.frame_size])
+
+    def get_header_table(self) -> HeaderTable:
+        # built once on first use
+        if self.header_table is None:
+            self.header_table = HeaderTable.build(self.data, self.frame_offsets, self.frame_words)
+        return self.header_table
+
+    def get_vbr_header(self):
+        # Xing / Info or VBRI header of first frame, None if there is none
+        header = VbrFormat.get_xing_header(self.first_frame)
+        if header:
+            return header
+        return VbrFormat.get_vbri_header(self.first_frame)
+
+    def seek(self, seconds: float) -> int:
+        # Offset of the frame playing at seconds, counted from the first audio
+        # frame. Exact with the frame offsets, estimated from the Xing or VBRI
+        # table of contents or the bitrate when streaming. Seconds behind the
+        # last frame return the end of the audio data.
+        if self.streaming:
+            return self.__seek_estimate(seconds)
+
+        header_table = self.get_header_table()
+        first_index = self.__get_first_audio_frame_index()
+        if self.start_times is None:
+            self.start_times = header_table.get_start_times(first_index)
+
+        index = int(np.searchsorted(self.start_times, max(seconds, 0), 'right')) - 1
+        if index >= len(self.start_times) - 1:
+            last = header_table.rows[-1]
+            return int(last['offset']) + int(last['frame_size'])
+        return int(header_table.rows['offset'][first_index + index])
+
+    def slice(self, start_s: float, end_s: float) -> bytes:
+        # frames playing from start_s until end_s
+        start = self.seek(start_s)
+        end = self.seek(end_s)
+        if end <= start:
+            return b''
+        return self.__read_range(start, end - start)
+
+    def cut(self, filename: str, start_s: float, end_s: float, write_music_crc: bool = False) -> CutRange:
+        # writes samples from start_s until end_s into a new file, encoder delay of source is respected
+        sample_rate = self.first_header.sample_rate
+        delay = self.__get_encoder_delay()
+        return self.__cut(filename, round(start_s * sample_rate) + delay, round(end_s * sample_rate) + delay, write_music_crc)
+
+    def cut_frames(self, filename: str, start_frame: int, end_frame: int, write_music_crc: bool = False) -> CutRange:
+        # writes samples of audio frames start_frame until end_frame (exclusive) into a new file
+        samples = Mp3Format.get_samples_per_frame(self.first_header.version, self.first_header.layer)
+        return self.__cut(filename, start_frame * samples, end_frame * samples, write_music_crc)
+
+    def close(self):
+        # release mapped file, frame views must not be used afterwards. While
+        # views are still alive the mapping is closed when they are freed.
+        if self.mmap:
+            try:
+                self.data.release()
+                self.mmap.close()
+            except BufferError:
+                pass
+            self.mmap = None
+            self.data = None
 
     def print_headers(self, log_filename: str = ''):
-        headers = self.__get_headers()
-        
         log_file = None
         if log_filename:
             log_file = open(log_filename, 'w')
 
         index = 0
-        for header in headers:
+        info_strings = []
+        for header, frame in self.__iter_frames():
+            if index == 0:
+                info_strings = self.__get_info_strings(frame)
+
             header.print_me(self.first_header, index)
             index += 1
             
@@ -43,7 +164,15 @@ class Mp3Surgeon:
                 log_file.write(header.format_string(self.first_header, index))
 
         print()
-        print("Frames total:", len(headers))
+        print("Frames total:", index)
+
+        # stats over all frames
+        if not self.streaming:
+            stats_str = self.__get_stats_string()
+            if log_file:
+                log_file.write(stats_str)
+
+            print(stats_str)
 
         # Id V3 tag
 
@@ -53,22 +182,23 @@ class Mp3Surgeon:
     
         print(id_v3_str)
 
-        first_frame_offset = headers[0].offset
-        if Mp3Format.is_info_frame(self.data, first_frame_offset):
-            info_str = '\n\nHas Info frame. LAME tag {0}.'.format(Mp3Format.get_lame_tag(self.data, first_frame_offset))
+        # tags at the end of the file
+        for tag_range in self.tag_ranges:
+            if tag_range.tag_type == TagType.ID_V3:
+                continue
+            tag_str = '\nFound {0} Tag at position: {1} with size: {2}'.format(tag_range.tag_type.value, str(tag_range.offset), str(tag_range.size))
             if log_file:
-                log_file.write(info_str)
-    
-            print(info_str)
+                log_file.write(tag_str)
 
-        if Mp3Format.is_xing_frame(self.data, first_frame_offset):
-            info_str = '\n\nHas Xing frame. LAME tag {0}.'.format(Mp3Format.get_lame_tag(self.data, first_frame_offset))
+            print(tag_str)
+
+        for info_str in info_strings:
             if log_file:
                 log_file.write(info_str)
     
             print(info_str)
 
-    def write_data(self, path: str, base_filename: str, as_block: bool = False, write_tags: bool = False):
+    def write_data(self, path: str, base_filename: str, as_block: bool = False, write_tags: bool = False, export_mode: ExportMode = ExportMode.FILES):
         frames_path = '{0}/frames/'.format(path)
         try:
             os.mkdir(frames_path)
@@ -78,56 +208,171 @@ class Mp3Surgeon:
         if write_tags :
             self.__write_tags(frames_path, base_filename)
 
-        self.__write_frames(frames_path, base_filename, as_block)
+        if as_block:
+            export_mode = ExportMode.BLOCK
+        self.__write_frames(frames_path, base_filename, export_mode)
 
-    def __write_frames(self, path: str, base_filename: str, as_block: bool = False):
-        headers = self.__get_headers()
+    def __write_frames(self, path: str, base_filename: str, export_mode: ExportMode = ExportMode.FILES):
         leading_zeros = 5
 
-        # skip Info or Xing frame
-        index_of_first_audio_frame = self.__get_first_audio_frame_index(self.data, headers)
-
         # write a single block containing all frames
-        if as_block:
-            first_offset = headers[index_of_first_audio_frame].offset
+        if export_mode == ExportMode.BLOCK:
             filename = '{0}{1}_block.mp3'.format(path, base_filename)
-            with open(filename, 'wb') as file:
-                file.write(self.data[first_offset: len(self.data)])
+            if not self.streaming:
+                index = self.__get_first_audio_frame_index()
+                if index < len(self.frame_offsets):
+                    first_offset = int(self.frame_offsets[index])
+                    with open(filename, 'wb') as file:
+                        file.write(memoryview(self.data)[first_offset:])
+                return
+
+            writer = BatchWriter(filename)
+            for frame in self.__iter_audio_frames():
+                writer.write(frame)
+            writer.close()
+            return
+
+        # write all frames into one archive
+        if export_mode == ExportMode.TAR:
+            writer = TarFrameWriter('{0}{1}_frames.tar'.format(path, base_filename))
+            for index, frame in enumerate(self.__iter_audio_frames()):
+                file_number = str(index).zfill(leading_zeros)
+                writer.add('{0}_{1}.mp3'.format(base_filename, file_number), frame)
+            writer.close()
+            return
+
+        # write all frames into one file with offset index
+        if export_mode == ExportMode.BLOB:
+            writer = BlobFrameWriter('{0}{1}_blob.mp3'.format(path, base_filename))
+            for frame in self.__iter_audio_frames():
+                writer.add(frame)
+            writer.close()
             return
 
         # write each frame in single file
-        index = 0
-        prior_header = headers[index_of_first_audio_frame]
-        for header in headers[index_of_first_audio_frame + 1:]:
-            file_number = str(index).zfill(leading_zeros)
-            filename = '{0}{1}_{2}.mp3'.format(path, base_filename, file_number)
-            
-            # with open('files/sizes', 'a') as file:
-            #     size = header.offset - prior_header.offset
-            #     file.write(str(index) + ': ' + str(size) + '\n')
-            
-            with open(filename, 'wb') as file:
-                file.write(self.data[prior_header.offset: header.offset])
-            index += 1
-            prior_header = header
+        writer = ThreadedFileWriter()
+        try:
+            for index, frame in enumerate(self.__iter_audio_frames()):
+                file_number = str(index).zfill(leading_zeros)
+                writer.add('{0}{1}_{2}.mp3'.format(path, base_filename, file_number), frame)
+        finally:
+            writer.close()
+
+    def __iter_audio_frames(self):
+        # yields data of all frames except Info, Xing or VBRI frame
+        if self.streaming:
+            is_first_frame = True
+            for _, frame in self.__iter_frames():
+                if is_first_frame:
+                    is_first_frame = False
+                    if Mp3Format.is_info_frame(frame) or Mp3Format.is_xing_frame(frame) or VbrFormat.is_vbri_frame(frame):
+                        continue
+                # reader buffer is reused, writers keep frames until flushed
+                yield bytes(frame)
+            return
+
+        # frame reaches until next frame, last frame until end of file
+        offsets = self.frame_offsets[self.__get_first_audio_frame_index():]
+        if len(offsets) == 0:
+            return
+
+        view = memoryview(self.data) # slices without copy
+        for start, end in zip(offsets, offsets[1:]):
+            yield view[int(start):int(end)]
+        yield view[int(offsets[-1]):]
 
-        # write last header
-        if index > 0:
-            file_number = str(index).zfill(leading_zeros)
-            filename = '{0}{1}_{2}.mp3'.format(path, base_filename, file_number)
-            last_header = headers[-1]
-            with open(filename, 'wb') as file:
-                file.write(self.data[last_header.offset: len(self.data)])
-            
     def __write_tags(self, path: str, base_filename: str):
         if self.tag_range.size > 0:
             filename = '{0}_{1}_tag.mp3'.format(path, base_filename)
             with open(filename, 'wb') as file:
-                file.write(self.data[self.tag_range.offset : self.tag_range.offset + self.tag_range.size])
+                file.write(self.__read_range(self.tag_range.offset, self.tag_range.size))
+
+    def __map_file(self, filename: str, sequential: bool = True) -> memoryview:
+        with open(filename, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b'' # empty files can not be mapped
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if sequential and hasattr(self.mmap, 'madvise'):
+            self.mmap.madvise(mmap.MADV_SEQUENTIAL)
+        return memoryview(self.mmap)
+
+    def __cut(self, filename: str, start_sample: int, end_sample: int, write_music_crc: bool) -> CutRange:
+        if self.streaming:
+            raise ValueError('Cutting needs frame offsets, open file without streaming')
+
+        header_table = self.get_header_table()
+        first_index = self.__get_first_audio_frame_index()
+        cut_range = Mp3Cutter.get_cut_range(self.data, header_table, first_index, start_sample, end_sample)
+
+        xing_header = VbrFormat.get_xing_header(self.first_frame)
+        lame_extension = xing_header.lame_extension if xing_header else b''
+        Mp3Cutter.write(filename, self.data, header_table, first_index, cut_range, lame_extension, write_music_crc)
+        return cut_range
+
+    def __get_encoder_delay(self) -> int:
+        xing_header = VbrFormat.get_xing_header(self.first_frame)
+        if xing_header and xing_header.encoder_delay > 0:
+            return xing_header.encoder_delay
+        return 0
+
+    def __seek_estimate(self, seconds: float) -> int:
+        first_offset = self.first_header.offset
+        samples = Mp3Format.get_samples_per_frame(self.first_header.version, self.first_header.layer)
+        file_size = os.path.getsize(self.filename)
+        vbr_header = self.get_vbr_header()
+        seconds = max(seconds, 0)
+
+        if isinstance(vbr_header, XingHeader) and vbr_header.frame_count > 0:
+            # toc positions are relative to the Xing frame
+            duration = vbr_header.frame_count * samples / self.first_header.sample_rate
+            if seconds >= duration:
+                return file_size
+            byte_count = vbr_header.byte_count if vbr_header.byte_count > 0 else file_size - first_offset
+            position = first_offset + VbrFormat.get_xing_position(vbr_header, seconds / duration, byte_count)
+        elif isinstance(vbr_header, VbriHeader) and vbr_header.toc:
+            frame = seconds * self.first_header.sample_rate / samples
+            if frame >= vbr_header.frame_count:
+                return file_size
+            position = first_offset + self.first_header.frame_size + VbrFormat.get_vbri_position(vbr_header, frame)
+        else:
+            # constant bitrate
+            audio_offset = first_offset + (self.first_header.frame_size if vbr_header else 0)
+            position = audio_offset + int(seconds * self.first_header.bitrate / 8)
+
+        return self.__find_frame_in_file(position)
+
+    def __find_frame_in_file(self, position: int) -> int:
+        # next frame at or behind position that is followed by another frame
+        with open(self.filename, 'rb') as file:
+            file.seek(position)
+            window = file.read(Mp3Surgeon.SEEK_WINDOW_SIZE)
+
+        for candidate in FrameScanner.find_sync_candidates(window).tolist():
+            if FrameScanner.is_confirmed(window, candidate):
+                return position + candidate
+        return os.path.getsize(self.filename)
+
+    def __read_range(self, offset: int, size: int) -> bytes:
+        if self.data is not None:
+            return self.data[offset : offset + size]
+
+        with open(self.filename, 'rb') as file:
+            file.seek(offset)
+            return file.read(size)
 
     # frames
 
     def __find_frame_offsets(self, data: bytearray, initial_offset: int = 0):
+        if self.fast_scan and self.workers > 1:
+            self.frame_offsets = ParallelScanner.find_frame_offsets(self.filename, initial_offset, self.workers).tolist()
+            return
+
+        if self.fast_scan:
+            self.frame_offsets = FrameScanner.find_frame_offsets(data, initial_offset)
+            return
+
+        # byte by byte scan
         offset = initial_offset
         frame_size = 0
         
@@ -145,6 +390,14 @@ class Mp3Surgeon:
 
             offset += frame_size
 
+    def __write_index(self):
+        index = FrameIndex.build(self.data, self.frame_offsets, self.tag_range)
+        self.frame_words = index.words
+        try:
+            index.write(self.filename)
+        except OSError as error:
+            print('Could not write frame index:', error)
+
     def __get_next_frame_index(self, data: bytearray, offset: int) -> int:
         while offset < len(data):
             if Mp3Format.is_sync_header(data, offset):
@@ -152,21 +405,55 @@ class Mp3Surgeon:
             offset += 1
         return -1
 
-    def __get_first_audio_frame_index(self, data: bytearray, headers: []) -> int:
-        first_header = headers[0]
-        if Mp3Format.is_info_frame(data, first_header.offset) or Mp3Format.is_xing_frame(data, first_header.offset):
+    def __get_first_audio_frame_index(self) -> int:
+        # skip Info, Xing or VBRI frame
+        if len(self.frame_offsets) == 0:
+            return 0
+        first_offset = int(self.frame_offsets[0])
+        if Mp3Format.is_info_frame(self.data, first_offset) or Mp3Format.is_xing_frame(self.data, first_offset) or VbrFormat.is_vbri_frame(self.data, first_offset):
             return 1
         return 0
 
-    # headers
-    
-    def __get_headers(self):
-        headers = []
-        for offset in self.frame_offsets:
-            header = Mp3Format.get_mpeg_header(self.data, offset)
-            if header:
-                headers.append(header)
-        return headers
+    def __iter_frames(self):
+        # yields header and frame data
+        if self.streaming:
+            with open(self.filename, 'rb') as file:
+                yield from FrameReader(file)
+            return
+
+        view = memoryview(self.data)
+        header_table = self.get_header_table()
+        for index in range(len(header_table)):
+            header = header_table.get_header(index)
+            yield header, view[header.offset : header.offset + header.frame_size]
+
+    def __get_stats_string(self) -> str:
+        header_table = self.get_header_table()
+        bitrates = ', '.join('{0}: {1}'.format(bitrate, count) for bitrate, count in header_table.get_bitrate_histogram().items())
+
+        stats_str = '\nDuration: {0:.3f} s'.format(header_table.get_duration())
+        stats_str += '\nAverage bitrate: {0:.0f}'.format(header_table.get_average_bitrate())
+        stats_str += '\nBitrates: {0}'.format(bitrates)
+        stats_str += '\nHeader mismatches: {0}'.format(len(header_table.get_mismatches()))
+        return stats_str
+
+    def __get_info_strings(self, frame: bytearray) -> [str]:
+        info_strings = []
+        if Mp3Format.is_info_frame(frame):
+            info_strings.append('\n\nHas Info frame. LAME tag {0}.'.format(Mp3Format.get_lame_tag(frame)))
+
+        if Mp3Format.is_xing_frame(frame):
+            info_strings.append('\n\nHas Xing frame. LAME tag {0}.'.format(Mp3Format.get_lame_tag(frame)))
+
+        xing_header = VbrFormat.get_xing_header(frame)
+        if xing_header:
+            info_strings.append('\nFrames: {0}, bytes: {1}, encoder delay: {2}, encoder padding: {3}'.format(xing_header.frame_count, xing_header.byte_count, xing_header.encoder_delay, xing_header.encoder_padding))
+
+        vbri_header = VbrFormat.get_vbri_header(frame)
+        if vbri_header:
+            info_strings.append('\n\nHas VBRI frame. Frames: {0}, bytes: {1}, delay: {2}'.format(vbri_header.frame_count, vbri_header.byte_count, vbri_header.delay))
+
+        return info_strings
 
 # Main
 
@@ -175,13 +462,15 @@ def main():
     # PATH = './files'
 
     if len(sys.argv) < 4:
-        print('Please parse folder containing the file, filename and if separate frames should be written to files.\n python3 -m mp3_lens FOLDER FILENAME WRITE_FRAMES\n e.g. python3 -m mp3_lens ./files music 1')
+        print('Please parse folder containing the file, filename, if separate frames should be written (0, 1 or export mode files, block, tar, blob) and optionally if the file should be streamed and if it should be memory mapped.\n python3 -m mp3_lens FOLDER FILENAME WRITE_FRAMES [STREAMING] [USE_MMAP]\n e.g. python3 -m mp3_lens ./files music 1')
         sys.exit()
 
     args = sys.argv
     folder = args[1]
     filename = args[2]
-    write_frames = int(args[3])
+    write_frames = args[3]
+    streaming = len(args) > 4 and int(args[4]) == 1
+    use_mmap = len(args) > 5 and int(args[5]) == 1
 
     # discard extension -> mp3 will be set
     filename = os.path.splitext(filename)[0]
@@ -189,11 +478,13 @@ def main():
     filepath = '{0}/{1}.mp3'.format(folder, filename)
     log_filename = '{0}/{1}_log'.format(folder, filename)
 
-    surgeon = Mp3Surgeon(filepath)
+    surgeon = Mp3Surgeon(filepath, streaming=streaming, use_mmap=use_mmap)
     surgeon.print_headers(log_filename)
 
-    if write_frames == 1:
-        surgeon.write_data(folder, filename, as_block=False)
+    if write_frames != '0':
+        export_mode = ExportMode.FILES if write_frames == '1' else ExportMode(write_frames)
+        surgeon.write_data(folder, filename, export_mode=export_mode)
+    surgeon.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import glob
+import json
+import os
+import sys
+from mp3_lens.__main__ import Mp3Surgeon
+from mp3_lens.header_table import HeaderTable
+from mp3_lens.mp3_format import Mp3Format
+
+class BatchInspector:
+    # Inspects all files of a folder or glob pattern in a process pool and
+    # writes one report line per file as soon as its result arrives. Workers
+    # only return small result dicts, frame data never leaves the worker.
+
+    EXTENSION: str = '.mp3'
+    CHUNK_SIZE: int = 4 # files per task, amortizes pickling for small files
+    FIELDS = ['filename', 'size', 'frame_count', 'duration', 'header_mismatches', 'id_v3_offset', 'id_v3_size', 'has_xing', 'has_info', 'error']
+
+    @staticmethod
+    def get_filenames(path: str) -> [str]:
+        if os.path.isdir(path):
+            filenames = []
+            for folder, _, files in os.walk(path):
+                for filename in files:
+                    if filename.lower().endswith(BatchInspector.EXTENSION):
+                        filenames.append(os.path.join(folder, filename))
+            return sorted(filenames)
+        return sorted(glob.glob(path, recursive=True))
+
+    @staticmethod
+    def inspect_file(filename: str) -> dict:
+        result = dict.fromkeys(BatchInspector.FIELDS)
+        result['filename'] = filename
+        try:
+            result['size'] = os.path.getsize(filename)
+            surgeon = Mp3Surgeon(filename, use_index=False, use_mmap=True)
+            try:
+                result.update(BatchInspector.get_stats(surgeon.data, surgeon.frame_offsets))
+                result['id_v3_offset'] = surgeon.tag_range.offset
+                result['id_v3_size'] = surgeon.tag_range.size
+            finally:
+                surgeon.close()
+        except Exception as error:
+            result['error'] = '{0}: {1}'.format(type(error).__name__, error)
+        return result
+
+    @staticmethod
+    def get_stats(data: bytearray, frame_offsets: [int]) -> dict:
+        header_table = HeaderTable.build(data, frame_offsets)
+        first = int(frame_offsets[0])
+        return {
+            'frame_count': len(header_table),
+            'duration': round(header_table.get_duration(), 3),
+            'header_mismatches': len(header_table.get_mismatches()),
+            'has_xing': Mp3Format.is_xing_frame(data, first),
+            'has_info': Mp3Format.is_info_frame(data, first)
+        }
+
+    @staticmethod
+    def run(path: str, report_filename: str, workers: int = os.cpu_count()) -> int:
+        # returns number of files with errors
+        filenames = BatchInspector.get_filenames(path)
+        error_count = 0
+
+        with open(report_filename, 'w', newline='') as report_file:
+            write = BatchInspector.__get_writer(report_file, report_filename)
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(BatchInspector.inspect_file, filenames, chunksize=BatchInspector.CHUNK_SIZE)
+                for index, result in enumerate(results):
+                    write(result)
+                    report_file.flush()
+                    if result['error']:
+                        error_count += 1
+                    print('{0}/{1} {2}'.format(index + 1, len(filenames), result['filename']))
+
+        return error_count
+
+    @staticmethod
+    def __get_writer(report_file, report_filename: str):
+        # csv for .csv reports, json lines otherwise
+        if report_filename.lower().endswith('.csv'):
+            writer = csv.DictWriter(report_file, fieldnames=BatchInspector.FIELDS)
+            writer.writeheader()
+            return writer.writerow
+
+        def write_json(result: dict):
+            report_file.write(json.dumps(result) + '\n')
+        return write_json
+
+# Main
+
+def main():
+    if len(sys.argv) < 3:
+        print('Please parse folder or glob pattern of files, report file (.csv or .jsonl) and optionally number of workers.\n python3 -m mp3_lens.batch_inspector PATH REPORT [WORKERS]\n e.g. python3 -m mp3_lens.batch_inspector ./files report.jsonl 4')
+        sys.exit()
+
+    args = sys.argv
+    path = args[1]
+    report_filename = args[2]
+    workers = int(args[3]) if len(args) > 3 else os.cpu_count()
+
+    error_count = BatchInspector.run(path, report_filename, workers)
+    print()
+    print('Files with errors:', error_count)
+
+if __name__ == '__main__':
+    main()
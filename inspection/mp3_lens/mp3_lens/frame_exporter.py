@@ -0,0 +1,186 @@
+from enum import Enum
+import numpy as np
+import os
+import queue
+import tarfile
+import threading
+import time
+
+class ExportMode(Enum):
+    FILES = 'files' # one file per frame
+    BLOCK = 'block' # all frames in one mp3 file
+    TAR = 'tar' # one tar member per frame
+    BLOB = 'blob' # all frames in one mp3 file plus offset index
+
+class BatchWriter:
+    # Collects buffers and writes them with a single os.writev call once
+    # enough bytes or buffers are pending. Buffers are kept by reference, they
+    # must stay valid until the next flush.
+
+    BATCH_SIZE: int = 1 << 20
+    MAX_BUFFERS: int = 1024 # IOV_MAX on linux
+
+    def __init__(self, filename: str):
+        self.file = open(filename, 'wb')
+        self.buffers = []
+        self.size = 0
+        self.offset = 0 # bytes written, including pending buffers
+
+    def write(self, buffer):
+        self.buffers.append(buffer)
+        self.size += len(buffer)
+        self.offset += len(buffer)
+        if self.size >= BatchWriter.BATCH_SIZE or len(self.buffers) >= BatchWriter.MAX_BUFFERS:
+            self.flush()
+
+    def flush(self):
+        if not self.buffers:
+            return
+
+        if hasattr(os, 'writev'):
+            buffers = self.buffers
+            while buffers:
+                written = os.writev(self.file.fileno(), buffers)
+                buffers = BatchWriter.__drop_written(buffers, written)
+        else:
+            for buffer in self.buffers:
+                self.file.write(buffer)
+
+        self.buffers = []
+        self.size = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    @staticmethod
+    def __drop_written(buffers: list, written: int) -> list:
+        # writev may write less than requested
+        index = 0
+        while index < len(buffers) and written >= len(buffers[index]):
+            written -= len(buffers[index])
+            index += 1
+        buffers = buffers[index:]
+        if buffers and written:
+            buffers[0] = memoryview(buffers[0])[written:]
+        return buffers
+
+class TarFrameWriter:
+    # Writes frames as members of an uncompressed ustar archive. Header, frame
+    # and padding are written in batches. Member headers only differ in name,
+    # size and checksum, they are patched into a header built once by tarfile.
+
+    BLOCK_SIZE: int = tarfile.BLOCKSIZE
+    RECORD_SIZE: int = tarfile.RECORDSIZE
+
+    # ustar header fields
+    NAME_SIZE: int = 100
+    SIZE_FIELD = slice(124, 136)
+    CHECKSUM_FIELD = slice(148, 156)
+
+    def __init__(self, filename: str):
+        self.writer = BatchWriter(filename)
+        self.mtime = int(time.time())
+
+        info = tarfile.TarInfo()
+        info.mtime = self.mtime
+        self.template = info.tobuf(format=tarfile.USTAR_FORMAT)
+
+    def add(self, name: str, frame):
+        self.writer.write(self.__get_header(name, len(frame)))
+        self.writer.write(frame)
+
+        remainder = len(frame) % TarFrameWriter.BLOCK_SIZE
+        if remainder:
+            self.writer.write(bytes(TarFrameWriter.BLOCK_SIZE - remainder))
+
+    def __get_header(self, name: str, size: int) -> bytes:
+        encoded_name = name.encode('utf-8')
+        if len(encoded_name) > TarFrameWriter.NAME_SIZE:
+            # long names need a prefix field split, leave it to tarfile
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mtime = self.mtime
+            return info.tobuf(format=tarfile.USTAR_FORMAT)
+
+        header = bytearray(self.template)
+        header[0:len(encoded_name)] = encoded_name
+        header[TarFrameWriter.SIZE_FIELD] = b'%011o\0' % size
+
+        # checksum is calculated with checksum field set to spaces
+        header[TarFrameWriter.CHECKSUM_FIELD] = b' ' * 8
+        header[TarFrameWriter.CHECKSUM_FIELD] = b'%06o\0 ' % sum(header)
+        return bytes(header)
+
+    def close(self):
+        # two empty blocks mark the end, archive is padded to full records
+        size = self.writer.offset + 2 * TarFrameWriter.BLOCK_SIZE
+        size += -size % TarFrameWriter.RECORD_SIZE
+        self.writer.write(bytes(size - self.writer.offset))
+        self.writer.close()
+
+class BlobFrameWriter:
+    # Writes all frames back to back into one file and their offsets into a
+    # sidecar file (FILENAME.offsets). The sidecar holds frame count + 1
+    # little endian 64 bit offsets, the last one is the size of the blob, so
+    # frame i is blob[offsets[i]:offsets[i + 1]].
+
+    EXTENSION: str = '.offsets'
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.writer = BatchWriter(filename)
+        self.offsets = [0]
+
+    def add(self, frame):
+        self.writer.write(frame)
+        self.offsets.append(self.writer.offset)
+
+    def close(self):
+        self.writer.close()
+        with open(self.filename + BlobFrameWriter.EXTENSION, 'wb') as file:
+            file.write(np.asarray(self.offsets, dtype='<u8').tobytes())
+
+    @staticmethod
+    def load_offsets(filename: str) -> np.ndarray:
+        return np.fromfile(filename + BlobFrameWriter.EXTENSION, dtype='<u8')
+
+class ThreadedFileWriter:
+    # Writes one file per frame in a background thread, so creating the files
+    # overlaps with producing the frames. Frames must stay valid until written.
+
+    QUEUE_SIZE: int = 4096
+
+    def __init__(self):
+        self.queue = queue.Queue(ThreadedFileWriter.QUEUE_SIZE)
+        self.error = None
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+    def add(self, filename: str, frame):
+        if self.error:
+            raise self.error
+        self.queue.put((filename, frame))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error:
+            raise self.error
+
+    def __run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error:
+                continue
+
+            # first error is raised in the producer, the queue is drained
+            # further so add and close never block
+            filename, frame = item
+            try:
+                with open(filename, 'wb') as file:
+                    file.write(frame)
+            except Exception as error:
+                self.error = error
@@ -0,0 +1,113 @@
+import hashlib
+import numpy as np
+import os
+import struct
+from typing import Optional
+from mp3_lens.idv3_format import TagRange
+from mp3_lens.mp3_format import Mp3Format
+
+class FrameIndex:
+    # Sidecar file with frame offsets and header words of a scanned file.
+    #
+    # 8 byte magic structure: MP3LIDX1
+    # 64 bit size of source file
+    # 64 bit mtime of source file [ns]
+    # 128 bit hash of size, first and last block of source file
+    # 64 bit frame count
+    # 64 bit id v3 tag offset
+    # 64 bit id v3 tag size
+    # frame count * 64 bit frame offsets
+    # frame count * 32 bit header words
+    #
+    # All values are little endian. The index is invalid as soon as size or
+    # mtime of the source file differ, any write to the file (also one in the
+    # middle keeping the size) sets a new mtime. The hash of the outer blocks
+    # is only checked behind that, it catches copies with restored mtime.
+
+    MAGIC_STRUCTURE: bytes = b'MP3LIDX1'
+    HEADER = struct.Struct('<8sQQ16sQqq')
+    HASH_BLOCK_SIZE: int = 1 << 16
+    EXTENSION: str = '.idx'
+
+    def __init__(self, offsets: np.ndarray, words: np.ndarray, tag_range: TagRange):
+        self.offsets = offsets
+        self.words = words
+        self.tag_range = tag_range
+
+    @staticmethod
+    def get_index_filename(filename: str) -> str:
+        return filename + FrameIndex.EXTENSION
+
+    @staticmethod
+    def build(data: bytearray, offsets: [int], tag_range: TagRange) -> 'FrameIndex':
+        offsets = np.asarray(offsets, dtype=np.uint64)
+        return FrameIndex(offsets, FrameIndex.get_header_words(data, offsets), tag_range)
+
+    @staticmethod
+    def get_header_words(data: bytearray, offsets: np.ndarray) -> np.ndarray:
+        # gather the 4 header bytes of all frames at once
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        positions = offsets.astype(np.int64)
+
+        words = np.zeros(len(positions), dtype=np.uint32)
+        for index in range(Mp3Format.HEADER_SIZE):
+            words = (words << 8) | buffer[positions + index]
+        return words
+
+    def write(self, filename: str):
+        stat = os.stat(filename)
+        size, mtime = stat.st_size, stat.st_mtime_ns
+        content_hash = FrameIndex.get_content_hash(filename, size)
+        header = FrameIndex.HEADER.pack(FrameIndex.MAGIC_STRUCTURE, size, mtime, content_hash, len(self.offsets), self.tag_range.offset, self.tag_range.size)
+
+        # write to temporary file first, a crash never leaves a broken index behind
+        index_filename = FrameIndex.get_index_filename(filename)
+        temp_filename = index_filename + '.tmp'
+        with open(temp_filename, 'wb') as file:
+            file.write(header)
+            file.write(self.offsets.astype('<u8').tobytes())
+            file.write(self.words.astype('<u4').tobytes())
+        os.replace(temp_filename, index_filename)
+
+    @staticmethod
+    def load(filename: str) -> Optional['FrameIndex']:
+        index_filename = FrameIndex.get_index_filename(filename)
+        try:
+            with open(index_filename, 'rb') as file:
+                header = file.read(FrameIndex.HEADER.size)
+        except OSError:
+            return None
+
+        if len(header) < FrameIndex.HEADER.size:
+            return None
+
+        magic, size, mtime, content_hash, count, tag_offset, tag_size = FrameIndex.HEADER.unpack(header)
+        if magic != FrameIndex.MAGIC_STRUCTURE:
+            return None
+        stat = os.stat(filename)
+        if size != stat.st_size or mtime != stat.st_mtime_ns:
+            return None
+        if content_hash != FrameIndex.get_content_hash(filename, size):
+            return None
+
+        expected_size = FrameIndex.HEADER.size + count * 12
+        if os.path.getsize(index_filename) != expected_size:
+            return None
+        if count == 0:
+            return FrameIndex(np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint32), TagRange(tag_offset, tag_size))
+
+        # map instead of read, pages are loaded when frames are accessed
+        offsets = np.memmap(index_filename, dtype='<u8', mode='r', offset=FrameIndex.HEADER.size, shape=(count,))
+        words = np.memmap(index_filename, dtype='<u4', mode='r', offset=FrameIndex.HEADER.size + count * 8, shape=(count,))
+        return FrameIndex(offsets, words, TagRange(tag_offset, tag_size))
+
+    @staticmethod
+    def get_content_hash(filename: str, size: int) -> bytes:
+        content_hash = hashlib.blake2b(digest_size=16)
+        content_hash.update(size.to_bytes(8, 'little'))
+        with open(filename, 'rb') as file:
+            content_hash.update(file.read(FrameIndex.HASH_BLOCK_SIZE))
+            if size > FrameIndex.HASH_BLOCK_SIZE:
+                file.seek(max(FrameIndex.HASH_BLOCK_SIZE, size - FrameIndex.HASH_BLOCK_SIZE))
+                content_hash.update(file.read(FrameIndex.HASH_BLOCK_SIZE))
+        return content_hash.digest()
@@ -0,0 +1,123 @@
+from mp3_lens.mp3_format import Mp3Format
+from mp3_lens.idv3_format import IdV3TagFormat, TagRange
+
+class FrameReader:
+    # Reads frames from a file object in fixed size chunks and yields
+    # (header, frame) pairs. The frame is a memoryview into the reader's buffer
+    # and is only valid until the next frame is requested.
+    #
+    # The buffer has a fixed capacity of one chunk plus the largest frame. When
+    # the parse position reaches the end of the buffered data, the unparsed
+    # tail is carried to the front and the next chunk is read behind it, so
+    # frames crossing a chunk edge stay contiguous and memory does not grow
+    # with the file size.
+
+    DEFAULT_CHUNK_SIZE: int = 1 << 16
+    MAX_FRAME_SIZE: int = 1 << 13
+
+    def __init__(self, file, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = bytearray(chunk_size + FrameReader.MAX_FRAME_SIZE)
+        self.view = memoryview(self.buffer)
+        self.start = 0 # parse position in buffer
+        self.end = 0 # end of valid data in buffer
+        self.buffer_offset = 0 # file offset of buffer[0]
+        self.is_eof = False
+        self.is_synced = False
+        self.tag_range = TagRange(-1, -1)
+
+    def __iter__(self):
+        self.__skip_tag()
+
+        while True:
+            offset = self.__next_frame_index()
+            if offset < 0:
+                return
+
+            header = Mp3Format.get_mpeg_header(self.view[:self.end], offset)
+            header.offset = self.buffer_offset + offset
+            self.start = offset + header.frame_size
+
+            yield header, self.view[offset:self.start]
+
+    # buffer
+
+    def __fill(self, size: int) -> bool:
+        # make sure size bytes are available behind the parse position
+        while self.end - self.start < size:
+            if self.is_eof:
+                return False
+
+            # carry tail to the front
+            if self.start > 0:
+                tail = self.end - self.start
+                self.buffer[0:tail] = self.buffer[self.start:self.end]
+                self.buffer_offset += self.start
+                self.start = 0
+                self.end = tail
+
+            read_size = min(self.chunk_size, len(self.buffer) - self.end)
+            read = self.file.readinto(self.view[self.end:self.end + read_size])
+            if not read:
+                self.is_eof = True
+            else:
+                self.end += read
+        return True
+
+    def __skip_tag(self):
+        if not self.__fill(IdV3TagFormat.HEADER_SIZE):
+            return
+        if not IdV3TagFormat.is_id_v3_tag(self.view, self.start):
+            return
+
+        tag_range = IdV3TagFormat.get_id_v3_tag_range(self.view[self.start:self.start + IdV3TagFormat.HEADER_SIZE])
+        self.tag_range = TagRange(self.buffer_offset + self.start, tag_range.size)
+
+        # drop buffered part of tag and skip the rest in file
+        skip = tag_range.size
+        buffered = min(skip, self.end - self.start)
+        self.start += buffered
+        skip -= buffered
+        if skip > 0:
+            self.buffer_offset += skip
+            if self.file.seekable():
+                self.file.seek(skip, 1)
+                return
+            while skip > 0:
+                read = self.file.read(min(skip, self.chunk_size))
+                if not read:
+                    self.is_eof = True
+                    return
+                skip -= len(read)
+
+    # frames
+
+    def __next_frame_index(self) -> int:
+        while self.__fill(Mp3Format.HEADER_SIZE):
+            if not Mp3Format.is_sync_header(self.view, self.start):
+                self.is_synced = False
+                index = self.buffer.find(b'\xff', self.start + 1, self.end)
+                self.start = index if index >= 0 else self.end
+                continue
+
+            # free format frames are measured against the next header
+            if Mp3Format.is_free_format(self.view, self.start):
+                self.__fill(Mp3Format.MAX_FREE_FORMAT_FRAME_SIZE + Mp3Format.HEADER_SIZE)
+
+            frame_size = Mp3Format.get_frame_size(self.view[:self.end], self.start)
+            has_frame = 0 < frame_size <= FrameReader.MAX_FRAME_SIZE and self.__fill(frame_size)
+
+            # frames found after sync loss have to be followed by another header
+            if has_frame and not self.is_synced:
+                if self.__fill(frame_size + Mp3Format.HEADER_SIZE):
+                    has_frame = Mp3Format.is_sync_header(self.view, self.start + frame_size)
+
+            if not has_frame:
+                self.is_synced = False
+                self.start += 1
+                continue
+
+            self.is_synced = True
+            return self.start
+        return -1
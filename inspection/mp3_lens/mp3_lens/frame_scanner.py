@@ -0,0 +1,95 @@
+import numpy as np
+from typing import Optional
+from mp3_lens.mp3_format import Mp3Format
+
+class FrameScanner:
+    # Finds all sync word candidates (0xFFE) in one vectorized pass over the
+    # buffer and then follows the frame length chain. Only where the chain
+    # breaks the next candidate is looked up, and it is accepted only if its
+    # frame size points to another sync header.
+
+    BLOCK_SIZE: int = 1 << 24 # bytes per vectorized pass, bounds temporary memory
+
+    @staticmethod
+    def find_sync_candidates(data: bytearray, offset: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        buffer = np.frombuffer(data, dtype=np.uint8)
+
+        # a candidate needs a complete header behind it
+        end = len(buffer) - Mp3Format.HEADER_SIZE + 1
+        if stop is not None:
+            end = min(end, stop)
+
+        blocks = []
+        start = offset
+        while start < end:
+            stop = min(start + FrameScanner.BLOCK_SIZE, end)
+            first = buffer[start:stop]
+            second = buffer[start + 1:stop + 1]
+            hits = np.flatnonzero((first == 0xFF) & ((second & 0xE0) == 0xE0))
+            blocks.append(hits + start)
+            start = stop
+
+        if not blocks:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(blocks)
+
+    @staticmethod
+    def find_frame_offsets(data: bytearray, offset: int = 0) -> [int]:
+        return FrameScanner.scan_range(data, offset, len(data))[0]
+
+    @staticmethod
+    def scan_range(data: bytearray, start: int, stop: int, is_synced: bool = False, stop_at: Optional[set] = None) -> ([int], int, bool):
+        # Follows the chain from start and collects frames beginning before stop.
+        # Returns the frame offsets and the state to continue with: the next
+        # offset (at or behind stop) and if it was reached through the chain.
+        # With stop_at the scan ends early in front of the first frame in it.
+        candidates = FrameScanner.find_sync_candidates(data, start, stop)
+        data_size = len(data)
+
+        offsets = []
+        offset = start
+        while offset < stop and offset + Mp3Format.HEADER_SIZE <= data_size:
+            # resync on next candidate if chain is broken
+            if not is_synced or not Mp3Format.is_sync_header(data, offset):
+                offset = FrameScanner.__resync(data, candidates, offset)
+                if offset < 0:
+                    return offsets, max(stop, start), False
+                is_synced = False
+
+            frame_size = Mp3Format.get_frame_size(data, offset)
+
+            if frame_size > 0:
+                if stop_at and offset in stop_at:
+                    return offsets, offset, is_synced
+                offsets.append(offset)
+                offset += frame_size
+                is_synced = True
+            else:
+                offset += 1
+                is_synced = False
+
+        return offsets, max(offset, stop), is_synced
+
+    @staticmethod
+    def is_confirmed(data: bytearray, offset: int) -> bool:
+        # frame is followed by another sync header or by the end of data
+        frame_size = Mp3Format.get_frame_size(data, offset)
+        if frame_size <= 0:
+            return False
+
+        next_offset = offset + frame_size
+        if next_offset > len(data):
+            return False
+        if next_offset + Mp3Format.HEADER_SIZE > len(data):
+            return True
+        return Mp3Format.is_sync_header(data, next_offset)
+
+    @staticmethod
+    def __resync(data: bytearray, candidates: np.ndarray, offset: int) -> int:
+        index = int(np.searchsorted(candidates, offset))
+        while index < len(candidates):
+            candidate = int(candidates[index])
+            if FrameScanner.is_confirmed(data, candidate):
+                return candidate
+            index += 1
+        return -1
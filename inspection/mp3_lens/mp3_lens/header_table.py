@@ -0,0 +1,114 @@
+import numpy as np
+from mp3_lens.frame_index import FrameIndex
+from mp3_lens.mp3_format import Mp3Format, MpegHeader
+
+class HeaderTable:
+    # Decoded headers of all frames as columns of one structured array. Each
+    # distinct header word is decoded once, rows are filled by index. Single
+    # MpegHeader objects are only created on request.
+
+    DTYPE = np.dtype([
+        ('offset', '<u8'),
+        ('word', '<u4'),
+        ('frame_size', '<u4'),
+        ('bitrate', '<i4'),
+        ('sample_rate', '<i4'),
+        ('samples', '<u2'), # samples per frame
+        ('version', 'u1'), # index in Mp3Format.VERSIONS
+        ('layer', 'u1'), # index in Mp3Format.LAYERS
+        ('channel_mode', 'u1'), # index in Mp3Format.CHANNEL_MODES
+        ('padding', '?')
+    ])
+
+    def __init__(self, rows: np.ndarray):
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def build(data: bytearray, offsets: [int], words: np.ndarray = None) -> 'HeaderTable':
+        # words: header words of the frames if known (frame index), else read from data
+        offsets = np.asarray(offsets, dtype=np.uint64)
+        if words is None:
+            words = FrameIndex.get_header_words(data, offsets)
+
+        rows = np.zeros(len(offsets), dtype=HeaderTable.DTYPE)
+        rows['offset'] = offsets
+        rows['word'] = words
+
+        # decode distinct words, then spread fields to rows
+        unique_words, inverse = np.unique(words, return_inverse=True)
+        decoded = np.zeros(len(unique_words), dtype=HeaderTable.DTYPE)
+        for index, word in enumerate(unique_words.tolist()):
+            version, layer, bitrate, sample_rate, channel_mode, frame_size, padding = Mp3Format.decode_header_word(word)
+            decoded['frame_size'][index] = frame_size
+            decoded['bitrate'][index] = bitrate
+            decoded['sample_rate'][index] = sample_rate
+            decoded['samples'][index] = Mp3Format.get_samples_per_frame(version, layer)
+            decoded['version'][index] = Mp3Format.VERSIONS.index(version)
+            decoded['layer'][index] = Mp3Format.LAYERS.index(layer)
+            decoded['channel_mode'][index] = Mp3Format.CHANNEL_MODES.index(channel_mode)
+            decoded['padding'][index] = padding
+
+        for field in ['frame_size', 'bitrate', 'sample_rate', 'samples', 'version', 'layer', 'channel_mode', 'padding']:
+            rows[field] = decoded[field][inverse]
+
+        # free format frames have no size in the header
+        free_format = np.flatnonzero((rows['bitrate'] == 0) & (rows['sample_rate'] > 0))
+        for index in free_format.tolist():
+            rows['frame_size'][index] = Mp3Format.get_free_format_frame_size(data, int(offsets[index]))
+
+        return HeaderTable(rows)
+
+    def get_header(self, index: int) -> MpegHeader:
+        row = self.rows[index]
+
+        header = MpegHeader()
+        header.version = Mp3Format.VERSIONS[row['version']]
+        header.layer = Mp3Format.LAYERS[row['layer']]
+        header.bitrate = int(row['bitrate'])
+        header.sample_rate = int(row['sample_rate'])
+        header.channel_mode = Mp3Format.CHANNEL_MODES[row['channel_mode']]
+        header.frame_size = int(row['frame_size'])
+        header.padding = bool(row['padding'])
+        header.offset = int(row['offset'])
+        return header
+
+    # stats
+
+    def get_duration(self) -> float:
+        # seconds
+        valid = self.rows['sample_rate'] > 0
+        return float(np.sum(self.rows['samples'][valid] / self.rows['sample_rate'][valid]))
+
+    def get_start_times(self, first_index: int = 0) -> np.ndarray:
+        # start time of each frame from first_index on, in seconds relative to
+        # that frame, followed by the end time of the last frame
+        rows = self.rows[first_index:]
+        durations = np.zeros(len(rows) + 1)
+        valid = rows['sample_rate'] > 0
+        durations[1:][valid] = rows['samples'][valid] / rows['sample_rate'][valid]
+        return np.cumsum(durations)
+
+    def get_mismatches(self, compare_index: int = 0) -> np.ndarray:
+        # indices of frames with version, layer or sample rate different from compare frame
+        if len(self.rows) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        compare = self.rows[compare_index]
+        mismatch = self.rows['version'] != compare['version']
+        mismatch |= self.rows['layer'] != compare['layer']
+        mismatch |= self.rows['sample_rate'] != compare['sample_rate']
+        return np.flatnonzero(mismatch)
+
+    def get_bitrate_histogram(self) -> {int: int}:
+        bitrates, counts = np.unique(self.rows['bitrate'], return_counts=True)
+        return dict(zip(bitrates.tolist(), counts.tolist()))
+
+    def get_average_bitrate(self) -> float:
+        # bits per second over all frames
+        duration = self.get_duration()
+        if duration <= 0:
+            return 0.0
+        return float(np.sum(self.rows['frame_size'], dtype=np.uint64)) * 8 / duration
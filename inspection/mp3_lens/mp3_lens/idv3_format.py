@@ -1,89 +1,261 @@
+from enum import Enum
+from typing import Optional
+
+class TagType(Enum):
+    ID_V3 = 'Id V3'
+    ID_V3_APPENDED = 'Id V3 appended'
+    ID_V1 = 'Id V1'
+    APE_V2 = 'APE V2'
+
 class TagRange:
 
-    def __init__(self, offset: int, size: int):
+    def __init__(self, offset: int, size: int, tag_type: TagType = TagType.ID_V3):
         self.offset = offset
         self.size = size
+        self.tag_type = tag_type
 
 class IdV3TagFormat:
 
     HEADER_SIZE = 10
     FOOTER_SIZE = 10
+    FOOTER_FLAG = 0x10
+
+    ID_V3_MAGIC = b'ID3'
+    ID_V3_FOOTER_MAGIC = b'3DI'
+    SEARCH_SIZE = 1 << 16 # leading tag is searched in the first bytes only
+
+    ID_V1_MAGIC = b'TAG'
+    ID_V1_SIZE = 128
+
+    APE_MAGIC = b'APETAGEX'
+    APE_FOOTER_SIZE = 32
+    APE_HEADER_FLAG = 0x80000000
 
     @staticmethod
-    def get_id_v3_tag_range(data: bytearray) -> TagRange:
-        data_size = len(data)
+    def get_id_v3_tag_range(data: bytearray) -> Optional[TagRange]:
+        # leading id v3 tag, None if there is none
+        offset = IdV3TagFormat.find_id_v3_tag(data, 0, IdV3TagFormat.SEARCH_SIZE)
+        if offset < 0:
+            return None
 
-        offset = 0
-        while not IdV3TagFormat.is_id_v3_tag(data, offset):
-            offset += 1
+        return TagRange(offset, IdV3TagFormat.get_id_v3_tag_size(data, offset))
+
+    @staticmethod
+    def get_tag_ranges(data: bytearray) -> [TagRange]:
+        # leading id v3 tag and tags at the end of the data: id v1 at the very
+        # end, before it APE v2 and appended id v3 tags in any order
+        tag_ranges = []
+
+        offset = IdV3TagFormat.find_id_v3_tag(data, 0, IdV3TagFormat.SEARCH_SIZE)
+        if offset >= 0:
+            tag_ranges.append(TagRange(offset, IdV3TagFormat.get_id_v3_tag_size(data, offset)))
+
+        end = len(data)
+        trailing_ranges = []
+        if IdV3TagFormat.is_id_v1_tag(data, end - IdV3TagFormat.ID_V1_SIZE):
+            end -= IdV3TagFormat.ID_V1_SIZE
+            trailing_ranges.append(TagRange(end, IdV3TagFormat.ID_V1_SIZE, TagType.ID_V1))
+
+        while True:
+            tag_range = IdV3TagFormat.get_ape_tag_range(data, end)
+            if not tag_range:
+                tag_range = IdV3TagFormat.get_appended_id_v3_tag_range(data, end)
+            if not tag_range or (tag_ranges and tag_range.offset < tag_ranges[0].offset + tag_ranges[0].size):
+                break
+            end = tag_range.offset
+            trailing_ranges.append(tag_range)
+
+        return tag_ranges + trailing_ranges[::-1]
+
+    @staticmethod
+    def find_id_v3_tag(data: bytearray, start: int = 0, stop: Optional[int] = None) -> int:
+        # find magic with bytes.find and validate the candidates
+        stop = len(data) if stop is None else min(stop, len(data))
+        window = data[start:stop]
+        if not hasattr(window, 'find'):
+            window = bytes(window)
 
-            if offset >= data_size - 1:
-                print('No tag', offset)
-                return TagRange(-1, -1)
+        index = window.find(IdV3TagFormat.ID_V3_MAGIC)
+        while index >= 0:
+            if IdV3TagFormat.is_id_v3_tag(data, start + index):
+                return start + index
+            index = window.find(IdV3TagFormat.ID_V3_MAGIC, index + 1)
+        return -1
+
+    @staticmethod
+    def get_id_v3_tag_size(data: bytearray, offset: int = 0) -> int:
+        b_size = data[offset + 6 : offset + 10]
 
-        b_size = data[offset + 7 : offset + 10]
-        
         tag_size = IdV3TagFormat.unsyncsave(b_size) + IdV3TagFormat.HEADER_SIZE
 
         if IdV3TagFormat.has_footer(data, offset):
             tag_size += IdV3TagFormat.FOOTER_SIZE
 
-        return TagRange(offset, tag_size)
+        return tag_size
 
     @staticmethod
-    def has_footer(data: bytearray, offset: int = 0) -> bool:
-        mask = bytes.fromhex('10')
+    def get_appended_id_v3_tag_range(data: bytearray, end: int) -> Optional[TagRange]:
+        # appended tags end with a footer: 3DI, same layout as the header
+        offset = end - IdV3TagFormat.FOOTER_SIZE
+        if offset < 0 or data[offset : offset + 3] != IdV3TagFormat.ID_V3_FOOTER_MAGIC:
+            return None
+        if not IdV3TagFormat.is_id_v3_tag(data, offset, IdV3TagFormat.ID_V3_FOOTER_MAGIC):
+            return None
 
-        if data[offset + 5] != mask[0]:
-            return False
+        size = IdV3TagFormat.unsyncsave(data[offset + 6 : offset + 10]) + IdV3TagFormat.HEADER_SIZE + IdV3TagFormat.FOOTER_SIZE
+        if size > end:
+            return None
+        return TagRange(end - size, size, TagType.ID_V3_APPENDED)
 
-        return True
+    @staticmethod
+    def get_ape_tag_range(data: bytearray, end: int) -> Optional[TagRange]:
+        # 32 byte footer: APETAGEX, version, size (items + footer), item count, flags, reserved
+        offset = end - IdV3TagFormat.APE_FOOTER_SIZE
+        if offset < 0 or data[offset : offset + 8] != IdV3TagFormat.APE_MAGIC:
+            return None
+
+        size = int.from_bytes(data[offset + 12 : offset + 16], 'little')
+        flags = int.from_bytes(data[offset + 20 : offset + 24], 'little')
+        if flags & IdV3TagFormat.APE_HEADER_FLAG:
+            size += IdV3TagFormat.APE_FOOTER_SIZE
+        if size < IdV3TagFormat.APE_FOOTER_SIZE or size > end:
+            return None
+        return TagRange(end - size, size, TagType.APE_V2)
 
     @staticmethod
-    def is_id_v3_tag(data: bytearray, offset: int = 0) -> bool:
+    def has_footer(data: bytearray, offset: int = 0) -> bool:
+        return data[offset + 5] & IdV3TagFormat.FOOTER_FLAG == IdV3TagFormat.FOOTER_FLAG
+
+    @staticmethod
+    def is_id_v3_tag(data: bytearray, offset: int = 0, magic: bytes = ID_V3_MAGIC) -> bool:
         # 49 44 33 yy yy xx zz zz zz zz
         # yy < FF
         # xx -> flags
         # zz < 80
-        
-        mask = bytes.fromhex('494433')
+        if offset < 0 or len(data) < offset + IdV3TagFormat.HEADER_SIZE:
+            return False
+
+        if data[offset : offset + 3] != magic:
+            return False
 
-        index = offset
-        for bitmask in mask:
-            if data[index] != bitmask:
-                return False
-            index += 1
-            
         # yy < FF
-        yy = bytes.fromhex('FFFF')
-        for bitmask in yy:
-            if data[index] >= bitmask:
-                return False
-            index += 1
+        if data[offset + 3] == 0xFF or data[offset + 4] == 0xFF:
+            return False
 
         # don't care about flags
-        index += 1
 
         # zz < 80
-        zz = bytes.fromhex('80808080')
-        for bitmask in zz:
-            if data[index] >= bitmask:
+        for index in range(offset + 6, offset + 10):
+            if data[index] >= 0x80:
                 return False
-            index += 1
 
         return True
 
     @staticmethod
-    def unsyncsave(b_size: bytes) -> int:
-        mask = bytes.fromhex('7F000000')
-        i_mask = int.from_bytes(mask, 'big')
+    def is_id_v1_tag(data: bytearray, offset: int) -> bool:
+        return offset >= 0 and data[offset : offset + 3] == IdV3TagFormat.ID_V1_MAGIC
 
+    @staticmethod
+    def unsyncsave(b_size: bytes) -> int:
+        # 7 bits per byte, most significant byte first
         out = 0
-        i_size = int.from_bytes(b_size, 'big')
-        
-        while i_mask:
-            out >>= 1
-            out |= i_size & i_mask
-            i_mask >>= 8
-            
-        return out
\ No newline at end of file
+        for byte in b_size:
+            out = (out << 7) | (byte & 0x7F)
+        return out
+
+class IdV3Tag:
+    # Lazy frame level parser of an id v3 tag (versions 2.2, 2.3 and 2.4).
+    # Frame headers are only walked when a frame is requested, frame content
+    # is only decoded for the requested frames.
+    #
+    # 2.2: 3 byte id, 3 byte size
+    # 2.3: 4 byte id, 4 byte size, 2 byte flags
+    # 2.4: 4 byte id, 4 byte syncsafe size, 2 byte flags
+
+    EXTENDED_HEADER_FLAG = 0x40
+    UNSYNCHRONISATION_FLAG = 0x80
+    FRAME_UNSYNCHRONISATION_FLAG = 0x02 # 2.4 format flags
+    TEXT_ENCODINGS = ['latin-1', 'utf-16', 'utf-16-be', 'utf-8']
+
+    def __init__(self, data: bytearray, offset: int = 0):
+        self.offset = offset
+        self.major_version = data[offset + 3]
+        self.flags = data[offset + 5]
+        self.size = IdV3TagFormat.unsyncsave(data[offset + 6 : offset + 10])
+
+        body = data[offset + IdV3TagFormat.HEADER_SIZE : offset + IdV3TagFormat.HEADER_SIZE + self.size]
+        if self.flags & IdV3Tag.UNSYNCHRONISATION_FLAG and self.major_version < 4:
+            body = IdV3Tag.remove_unsynchronisation(body)
+        self.body = body
+        self.frames = None # frame id -> [(offset in body, size, flags)]
+
+    def get_frame_ids(self) -> [str]:
+        return list(self.__get_frames().keys())
+
+    def get_frame(self, frame_id: str, index: int = 0) -> Optional[bytes]:
+        frames = self.__get_frames().get(frame_id)
+        if not frames or index >= len(frames):
+            return None
+
+        offset, size, flags = frames[index]
+        content = bytes(self.body[offset : offset + size])
+        if self.major_version == 4 and flags & IdV3Tag.FRAME_UNSYNCHRONISATION_FLAG:
+            content = IdV3Tag.remove_unsynchronisation(content)
+        return content
+
+    def get_text(self, frame_id: str) -> Optional[str]:
+        # text frames: encoding byte followed by text
+        content = self.get_frame(frame_id)
+        if not content:
+            return None
+
+        encoding = IdV3Tag.TEXT_ENCODINGS[content[0]] if content[0] < len(IdV3Tag.TEXT_ENCODINGS) else 'latin-1'
+        return content[1:].decode(encoding, errors='replace').rstrip('\0')
+
+    @staticmethod
+    def remove_unsynchronisation(data: bytes) -> bytes:
+        return bytes(data).replace(b'\xff\x00', b'\xff')
+
+    def __get_frames(self) -> dict:
+        if self.frames is not None:
+            return self.frames
+
+        self.frames = {}
+        if self.major_version == 2:
+            id_size, size_size, header_size = 3, 3, 6
+        else:
+            id_size, size_size, header_size = 4, 4, 10
+
+        offset = 0
+        if self.flags & IdV3Tag.EXTENDED_HEADER_FLAG and self.major_version > 2:
+            offset = self.__get_extended_header_size()
+
+        body_size = len(self.body)
+        while offset + header_size <= body_size:
+            # padding
+            if self.body[offset] == 0:
+                break
+
+            frame_id = bytes(self.body[offset : offset + id_size]).decode('latin-1')
+            b_size = self.body[offset + id_size : offset + id_size + size_size]
+            if self.major_version == 4:
+                size = IdV3TagFormat.unsyncsave(b_size)
+            else:
+                size = int.from_bytes(b_size, 'big')
+            flags = int.from_bytes(self.body[offset + 8 : offset + 10], 'big') if header_size == 10 else 0
+
+            content_offset = offset + header_size
+            if size <= 0 or content_offset + size > body_size:
+                break
+
+            self.frames.setdefault(frame_id, []).append((content_offset, size, flags))
+            offset = content_offset + size
+
+        return self.frames
+
+    def __get_extended_header_size(self) -> int:
+        # 2.3 size excludes the size field itself, 2.4 size is syncsafe and includes it
+        b_size = self.body[0:4]
+        if self.major_version == 4:
+            return IdV3TagFormat.unsyncsave(b_size)
+        return int.from_bytes(b_size, 'big') + 4
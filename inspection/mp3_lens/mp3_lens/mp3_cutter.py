@@ -0,0 +1,181 @@
+import numpy as np
+from mp3_lens.header_table import HeaderTable
+from mp3_lens.mp3_format import Mp3Format, MpegLayer
+from mp3_lens.vbr_format import VbrFormat
+
+class CutRange:
+    # audio frame indices (without tag frame) and samples to drop
+
+    def __init__(self, first_frame: int, start_frame: int, end_frame: int, delay: int, padding: int):
+        self.first_frame = first_frame # first frame written, bit reservoir and overlap included
+        self.start_frame = start_frame # frame containing the first sample of the clip
+        self.end_frame = end_frame # first frame not written
+        self.delay = delay # samples dropped at the start by the decoder
+        self.padding = padding # samples dropped at the end by the decoder
+
+class Mp3Cutter:
+    # Cuts frames without decoding. Samples are counted on the decoded frame
+    # timeline, frame i holds samples [i * samples per frame, (i + 1) * samples per frame).
+    #
+    # A Layer III frame may start its main data up to 511 bytes in front of the
+    # frame (main_data_begin, bit reservoir) and its output overlaps with the
+    # frame before. The clip therefore starts one frame early plus as many
+    # frames as needed to hold the reservoir. The decoder drops these samples
+    # again, they are written as encoder delay into a new Info / Xing frame
+    # with LAME extension in front of the clip.
+
+    DECODER_DELAY: int = 529 # samples, added by every decoder
+    MAX_DELAY: int = 0xFFF # 12 bit fields in LAME extension
+    XING_FLAGS: int = 0x0F # frames, bytes, toc, quality
+    XING_SIZE: int = 120 # magic, flags, frames, bytes, toc, quality
+    DEFAULT_ENCODER: bytes = b'LAME3.100'
+
+    # LAME extension fields
+    DELAY_FIELD = slice(21, 24)
+    MUSIC_LENGTH_FIELD = slice(28, 32)
+    MUSIC_CRC_FIELD = slice(32, 34)
+    TAG_CRC_OFFSET = 34
+
+    CRC_TABLE = []
+
+    @staticmethod
+    def get_cut_range(data: bytearray, header_table: HeaderTable, first_index: int, start_sample: int, end_sample: int) -> CutRange:
+        # first_index: row of first audio frame in header table
+        rows = header_table.rows
+        samples = int(rows['samples'][first_index])
+        frame_count = len(rows) - first_index
+        total_samples = frame_count * samples
+
+        start_sample = min(max(start_sample, 0), total_samples)
+        end_sample = min(max(end_sample, start_sample), total_samples)
+
+        # decoder outputs samples DECODER_DELAY samples late, the clip needs the frames behind
+        start_frame = start_sample // samples
+        end_frame = min(frame_count, -(-(end_sample + Mp3Cutter.DECODER_DELAY) // samples))
+
+        # overlap with frame before and its bit reservoir
+        first_frame = max(start_frame - 1, 0)
+        if rows['layer'][first_index] == Mp3Format.LAYERS.index(MpegLayer.L3):
+            first_frame = Mp3Cutter.__get_reservoir_start(data, rows, first_index, first_frame)
+
+        # delay has to fit into 12 bits, dropping reservoir frames may cause glitches
+        delay = start_sample - first_frame * samples
+        while delay > Mp3Cutter.MAX_DELAY:
+            first_frame += 1
+            delay -= samples
+
+        padding = (end_frame - first_frame) * samples - delay - (end_sample - start_sample)
+        return CutRange(first_frame, start_frame, end_frame, delay, padding)
+
+    @staticmethod
+    def write(filename: str, data: bytearray, header_table: HeaderTable, first_index: int, cut_range: CutRange, lame_extension: bytes = b'', write_music_crc: bool = False):
+        rows = header_table.rows[first_index + cut_range.first_frame : first_index + cut_range.end_frame]
+        if len(rows) == 0:
+            raise ValueError('Empty cut range')
+
+        start = int(rows['offset'][0])
+        end = int(rows['offset'][-1]) + int(rows['frame_size'][-1])
+        audio = memoryview(data)[start:end]
+
+        # frame offsets relative to start of clip for table of contents
+        frame_offsets = rows['offset'].astype(np.int64) - start
+        is_vbr = len(np.unique(rows['bitrate'])) > 1
+        music_crc = Mp3Cutter.crc16(audio) if write_music_crc else 0
+
+        tag_frame = Mp3Cutter.build_tag_frame(bytes(data[start : start + Mp3Format.HEADER_SIZE]), frame_offsets, len(audio), cut_range.delay, cut_range.padding, is_vbr, lame_extension, music_crc)
+        with open(filename, 'wb') as file:
+            file.write(tag_frame)
+            file.write(audio)
+
+    @staticmethod
+    def build_tag_frame(header: bytes, frame_offsets: np.ndarray, audio_size: int, delay: int, padding: int, is_vbr: bool, lame_extension: bytes = b'', music_crc: int = 0) -> bytes:
+        # Info (cbr) or Xing (vbr) frame with version, sample rate and channel
+        # mode of header and the smallest bitrate that holds the tag
+        xing_offset = Mp3Format.get_xing_offset(header)
+        lame_offset = xing_offset + Mp3Cutter.XING_SIZE
+        frame = bytearray(Mp3Cutter.__get_tag_frame_header(header, lame_offset + VbrFormat.LAME_EXTENSION_SIZE))
+        byte_count = len(frame) + audio_size
+
+        # Xing fields
+        tag = bytearray(Mp3Format.XING_MAGIC if is_vbr else Mp3Format.INFO_MAGIC)
+        tag += Mp3Cutter.XING_FLAGS.to_bytes(4, 'big')
+        tag += len(frame_offsets).to_bytes(4, 'big')
+        tag += byte_count.to_bytes(4, 'big')
+        tag += Mp3Cutter.get_toc(frame_offsets + len(frame), byte_count)
+        tag += bytes(4)
+        frame[xing_offset:lame_offset] = tag
+
+        # LAME extension, taken from source if there is one
+        extension = bytearray(lame_extension[:VbrFormat.LAME_EXTENSION_SIZE])
+        if not extension.startswith(VbrFormat.LAME_MAGIC):
+            extension = bytearray(Mp3Cutter.DEFAULT_ENCODER)
+        extension += bytes(VbrFormat.LAME_EXTENSION_SIZE - len(extension))
+        extension[Mp3Cutter.DELAY_FIELD] = ((delay << 12) | padding).to_bytes(3, 'big')
+        extension[Mp3Cutter.MUSIC_LENGTH_FIELD] = byte_count.to_bytes(4, 'big')
+        extension[Mp3Cutter.MUSIC_CRC_FIELD] = music_crc.to_bytes(2, 'big')
+        frame[lame_offset:lame_offset + VbrFormat.LAME_EXTENSION_SIZE] = extension
+
+        # crc of tag frame up to the crc field
+        tag_crc_offset = lame_offset + Mp3Cutter.TAG_CRC_OFFSET
+        frame[tag_crc_offset:tag_crc_offset + 2] = Mp3Cutter.crc16(frame[:tag_crc_offset]).to_bytes(2, 'big')
+        return bytes(frame)
+
+    @staticmethod
+    def get_toc(frame_offsets: np.ndarray, byte_count: int) -> bytes:
+        # byte position of frame at each percent of the frames in 1/256 of byte count
+        indices = (np.arange(100) * len(frame_offsets)) // 100
+        positions = frame_offsets[np.minimum(indices, len(frame_offsets) - 1)] * 256 // byte_count
+        return np.minimum(positions, 255).astype(np.uint8).tobytes()
+
+    @staticmethod
+    def crc16(data: bytearray, crc: int = 0) -> int:
+        # CRC-16 (poly 0x8005, reflected, init 0) as used by the LAME extension
+        if not Mp3Cutter.CRC_TABLE:
+            Mp3Cutter.CRC_TABLE = Mp3Cutter.__build_crc_table()
+
+        table = Mp3Cutter.CRC_TABLE
+        for byte in bytes(data):
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+        return crc
+
+    @staticmethod
+    def __build_crc_table() -> [int]:
+        table = []
+        for index in range(256):
+            crc = index
+            for _ in range(8):
+                crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+            table.append(crc)
+        return table
+
+    @staticmethod
+    def __get_reservoir_start(data: bytearray, rows: np.ndarray, first_index: int, frame: int) -> int:
+        # walk back until the frames in front hold main_data_begin bytes of main data
+        main_data_begin = Mp3Format.get_main_data_begin(data, int(rows['offset'][first_index + frame]))
+        available = 0
+        while available < main_data_begin and frame > 0:
+            frame -= 1
+            offset = int(rows['offset'][first_index + frame])
+            available += Mp3Cutter.__get_main_data_size(data, offset, int(rows['frame_size'][first_index + frame]))
+        return frame
+
+    @staticmethod
+    def __get_main_data_size(data: bytearray, offset: int, frame_size: int) -> int:
+        overhead = Mp3Format.HEADER_SIZE + Mp3Format.get_side_info_size(data, offset)
+        if Mp3Format.has_crc(data, offset):
+            overhead += Mp3Format.CRC_SIZE
+        return frame_size - overhead
+
+    @staticmethod
+    def __get_tag_frame_header(header: bytes, min_size: int) -> bytes:
+        # same header without crc and padding, smallest bitrate with frame size >= min_size
+        word = int.from_bytes(header, 'big')
+        word &= ~(Mp3Format.BITRATE_MASK | Mp3Format.PADDING_MASK)
+        word |= Mp3Format.PROTECTION_MASK
+
+        for bitrate_index in range(1, 15):
+            frame_header = (word | (bitrate_index << 12)).to_bytes(Mp3Format.HEADER_SIZE, 'big')
+            frame_size = Mp3Format.get_frame_size(frame_header)
+            if frame_size >= min_size:
+                return frame_header + bytes(frame_size - Mp3Format.HEADER_SIZE)
+        raise ValueError('Tag does not fit into a frame')
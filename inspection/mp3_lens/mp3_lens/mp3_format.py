@@ -26,6 +26,7 @@ class MpegHeader:
     bitrate: int = 0
     sample_rate: int = 0
     channel_mode: ChannelMode = ChannelMode.STEREO
+    padding: bool = False
     offset: int = 0 # offset in file
 
     def print_me(self, compare, index: Optional[int] = None):
@@ -64,6 +65,9 @@ class MpegHeader:
 
 class Mp3Format:
 
+    HEADER_SIZE: int = 4
+    CRC_SIZE: int = 2
+
     @staticmethod
     def get_mpeg_version(data: bytearray, offset: int = 0) -> MpegVersion:
         byte = data[offset + 1]
@@ -147,69 +151,213 @@ class Mp3Format:
         
         return -1
 
+    @staticmethod
+    def get_channel_mode(data: bytearray, offset: int = 0) -> ChannelMode:
+        byte = data[offset + 3]
+        return Mp3Format.CHANNEL_MODES[byte >> 6]
+
+    @staticmethod
+    def get_padding(data: bytearray, offset: int = 0) -> bool:
+        byte = data[offset + 2]
+        return (byte & 0x02) == 0x02
+
+    @staticmethod
+    def get_samples_per_frame(version: MpegVersion, layer: MpegLayer) -> int:
+        if layer == MpegLayer.L1:
+            return 384
+        if layer == MpegLayer.L2:
+            return 1152
+        if layer == MpegLayer.L3:
+            return 1152 if version == MpegVersion.V1 else 576
+        return 0
+
     @staticmethod
     def get_frame_size(data: bytearray, offset: int = 0) -> int:
-        bitrate = Mp3Format.get_bitrate(data, offset)
-        sample_rate = Mp3Format.get_sample_rate(data, offset)
-        
-        return int(144 * bitrate / (sample_rate + 8))
+        word = int.from_bytes(data[offset : offset + Mp3Format.HEADER_SIZE], 'big')
+        fields = Mp3Format.decode_header_word(word)
+        if Mp3Format.__is_free_format(fields):
+            return Mp3Format.get_free_format_frame_size(data, offset)
+        return fields[Mp3Format.FIELD_FRAME_SIZE]
 
     @staticmethod
-    def is_sync_header(data: bytearray, offset: int = 0) -> bool:
-        mask = bytes.fromhex('FFE0')
+    def is_free_format(data: bytearray, offset: int = 0) -> bool:
+        word = int.from_bytes(data[offset : offset + Mp3Format.HEADER_SIZE], 'big')
+        return Mp3Format.__is_free_format(Mp3Format.decode_header_word(word))
+
+    @staticmethod
+    def get_free_format_frame_size(data: bytearray, offset: int = 0) -> int:
+        # Free format frames have no bitrate in the header. The frame size is the
+        # distance to the next header with same version, layer and sample rate.
+        word = int.from_bytes(data[offset : offset + Mp3Format.HEADER_SIZE], 'big')
+        key = word & Mp3Format.FREE_FORMAT_MASK
+
+        start = offset + Mp3Format.HEADER_SIZE
+        window = bytes(data[start : offset + Mp3Format.MAX_FREE_FORMAT_FRAME_SIZE + Mp3Format.HEADER_SIZE])
 
-        index = offset
-        for bitmask in mask:
-            value = data[index] & bitmask
-            index += 1
-            if value != bitmask:
-                return False
+        index = window.find(b'\xff')
+        while 0 <= index <= len(window) - Mp3Format.HEADER_SIZE:
+            next_word = int.from_bytes(window[index : index + Mp3Format.HEADER_SIZE], 'big')
+            if next_word & Mp3Format.FREE_FORMAT_MASK == key:
+                return start + index - offset
+            index = window.find(b'\xff', index + 1)
 
-        return True
+        return 0
 
     @staticmethod
-    def is_xing_frame(data: bytearray, offset: int = 0) -> bool:
-        mask = bytes.fromhex('58696E67')
+    def is_sync_header(data: bytearray, offset: int = 0) -> bool:
+        # 11 bit sync word: FFE
+        return data[offset] == 0xFF and (data[offset + 1] & 0xE0) == 0xE0
 
-        index = offset + 36
-        for bitmask in mask:
-            value = data[index] & bitmask
-            index += 1
-            if value != bitmask:
-                return False
+    @staticmethod
+    def get_side_info_size(data: bytearray, offset: int = 0) -> int:
+        # Layer III side info behind header (and crc)
+        is_mono = Mp3Format.get_channel_mode(data, offset) == ChannelMode.MONO
+        if Mp3Format.get_mpeg_version(data, offset) == MpegVersion.V1:
+            return 17 if is_mono else 32
+        return 9 if is_mono else 17
 
-        return True
+    @staticmethod
+    def has_crc(data: bytearray, offset: int = 0) -> bool:
+        # protection bit 0 -> 16 bit crc behind header
+        return data[offset + 1] & 0x01 == 0
 
     @staticmethod
-    def is_info_frame(data: bytearray, offset: int = 0) -> bool:
-        mask = bytes.fromhex('496E666F')
+    def get_main_data_begin(data: bytearray, offset: int = 0) -> int:
+        # Layer III: bytes of this frame's main data in front of the frame (bit reservoir),
+        # first 9 (V1) or 8 (V2, V2.5) bits of side info
+        index = offset + Mp3Format.HEADER_SIZE + (Mp3Format.CRC_SIZE if Mp3Format.has_crc(data, offset) else 0)
+        if Mp3Format.get_mpeg_version(data, offset) == MpegVersion.V1:
+            return (data[index] << 1) | (data[index + 1] >> 7)
+        return data[index]
 
-        index = offset + 36
-        for bitmask in mask:
-            value = data[index] & bitmask
-            index += 1
-            if value != bitmask:
-                return False
+    @staticmethod
+    def get_xing_offset(data: bytearray, offset: int = 0) -> int:
+        # Xing and Info tag start behind header and side info
+        return offset + Mp3Format.HEADER_SIZE + Mp3Format.get_side_info_size(data, offset)
 
-        return True
+    @staticmethod
+    def is_xing_frame(data: bytearray, offset: int = 0) -> bool:
+        index = Mp3Format.get_xing_offset(data, offset)
+        return data[index : index + 4] == Mp3Format.XING_MAGIC
 
     @staticmethod
-    def get_lame_tag(data: bytearray, offset: int = 0) -> None:
-        lame_tag = ""
-        for i in range(39, 177):
-            lame_tag += str(data[offset + i])
+    def is_info_frame(data: bytearray, offset: int = 0) -> bool:
+        index = Mp3Format.get_xing_offset(data, offset)
+        return data[index : index + 4] == Mp3Format.INFO_MAGIC
+
+    @staticmethod
+    def get_lame_tag(data: bytearray, offset: int = 0) -> str:
+        # encoder string of LAME extension behind the Xing / Info fields, empty if there is none
+        index = Mp3Format.get_xing_offset(data, offset) + 4
+        flags = int.from_bytes(data[index : index + 4], 'big')
+        index += 4
+        for flag, size in Mp3Format.XING_FIELD_SIZES:
+            if flags & flag:
+                index += size
+
+        encoder = bytes(data[index : index + 9])
+        if not encoder.startswith(b'LAME'):
+            return ''
+        return encoder.decode('latin-1').rstrip('\0 ')
 
     @staticmethod
     def get_mpeg_header(data: bytearray, offset: int = 0) -> MpegHeader:
+        word = int.from_bytes(data[offset : offset + Mp3Format.HEADER_SIZE], 'big')
+        version, layer, bitrate, sample_rate, channel_mode, frame_size, padding = Mp3Format.decode_header_word(word)
+
+        if frame_size == 0 and bitrate == 0 and sample_rate > 0:
+            frame_size = Mp3Format.get_free_format_frame_size(data, offset)
+
         header = MpegHeader()
-        header.version = Mp3Format.get_mpeg_version(data, offset)
-        header.layer = Mp3Format.get_layer_version(data, offset)
-        header.bitrate = Mp3Format.get_bitrate(data, offset)
-        header.sample_rate = Mp3Format.get_sample_rate(data, offset)
-        header.frame_size = Mp3Format.get_frame_size(data, offset)
+        header.version = version
+        header.layer = layer
+        header.bitrate = bitrate
+        header.sample_rate = sample_rate
+        header.channel_mode = channel_mode
+        header.frame_size = frame_size
+        header.padding = padding
         header.offset = offset
         return header
 
+    # Table driven decoding
+    #
+    # AAAAAAAA AAABBCCD EEEEFFGH IIJJKLMM
+    #
+    # A sync, B version, C layer, D protection, E bitrate index, F sample rate index,
+    # G padding, H private, I channel mode, J mode extension, K copyright, L original, M emphasis
+    #
+    # Decoded fields only depend on B, C, E, F, G and I. They are decoded once per
+    # distinct word (without G) and cached for the padded and unpadded case.
+
+    @staticmethod
+    def decode_header_word(word: int) -> tuple:
+        # returns (version, layer, bitrate, sample rate, channel mode, frame size, padding)
+        key = word & Mp3Format.HEADER_KEY_MASK
+        fields = Mp3Format.HEADER_CACHE.get(key)
+        if fields is None:
+            fields = Mp3Format.__decode_fields(key)
+            Mp3Format.HEADER_CACHE[key] = fields
+
+        if word & Mp3Format.PADDING_MASK:
+            return fields[1]
+        return fields[0]
+
+    @staticmethod
+    def __decode_fields(key: int) -> (tuple, tuple):
+        version_index = (key >> 19) & 0x03
+        layer_index = (key >> 17) & 0x03
+        bitrate_index = (key >> 12) & 0x0F
+        sample_rate_index = (key >> 10) & 0x03
+
+        version = Mp3Format.VERSIONS[version_index]
+        layer = Mp3Format.LAYERS[layer_index]
+        channel_mode = Mp3Format.CHANNEL_MODES[(key >> 6) & 0x03]
+
+        bitrates = Mp3Format.BITRATES[version_index][layer_index]
+        bitrate = bitrates[bitrate_index] * 1000 if bitrates else -1
+
+        sample_rates = Mp3Format.SAMPLE_RATES[version_index]
+        sample_rate = sample_rates[sample_rate_index] if sample_rates else -1
+
+        # Layer I:        frame size = (12 * bitrate / sample rate + padding) * 4
+        # Layer II / III: frame size = samples / 8 * bitrate / sample rate + padding
+        frame_size = 0
+        slot_size = 0
+        if bitrate > 0 and sample_rate > 0:
+            if layer == MpegLayer.L1:
+                frame_size = 12 * bitrate // sample_rate * 4
+                slot_size = 4
+            else:
+                samples = Mp3Format.get_samples_per_frame(version, layer)
+                frame_size = samples // 8 * bitrate // sample_rate
+                slot_size = 1
+
+        unpadded = (version, layer, bitrate, sample_rate, channel_mode, frame_size, False)
+        padded = (version, layer, bitrate, sample_rate, channel_mode, frame_size + slot_size, True)
+        return unpadded, padded
+
+    @staticmethod
+    def __is_free_format(fields: tuple) -> bool:
+        return fields[Mp3Format.FIELD_BITRATE] == 0 and fields[Mp3Format.FIELD_SAMPLE_RATE] > 0
+
+    @staticmethod
+    def build_header(version: MpegVersion, layer: MpegLayer, bitrate: int, sample_rate: int, padding: bool = False, channel_mode: ChannelMode = ChannelMode.STEREO) -> bytes:
+        # header without crc, raises ValueError for combinations not in the tables
+        version_index = Mp3Format.VERSIONS.index(version)
+        layer_index = Mp3Format.LAYERS.index(layer)
+        bitrate_index = Mp3Format.BITRATES[version_index][layer_index].index(bitrate // 1000)
+        sample_rate_index = Mp3Format.SAMPLE_RATES[version_index].index(sample_rate)
+        channel_mode_index = Mp3Format.CHANNEL_MODES.index(channel_mode)
+
+        word = 0xFFE10000
+        word |= version_index << 19
+        word |= layer_index << 17
+        word |= bitrate_index << 12
+        word |= sample_rate_index << 10
+        word |= int(padding) << 9
+        word |= channel_mode_index << 6
+        return word.to_bytes(Mp3Format.HEADER_SIZE, 'big')
+
     # Sample rates
 
     SAMPLE_RATE_V1 = [44100, 48000, 32000, -1]
@@ -222,4 +370,37 @@ class Mp3Format:
     BITRATE_V1_L2 = [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384, -1]
     BITRATE_V1_L3 = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, -1]
     BITRATE_V2_L1 = [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256, -1]
-    BITRATE_V2_L2_3 = [0,  8,  16,  24,  32,  40,  48,  56,  64,  80,  96,  112,  128,  144,  160,  -1]
\ No newline at end of file
+    BITRATE_V2_L2_3 = [0,  8,  16,  24,  32,  40,  48,  56,  64,  80,  96,  112,  128,  144,  160,  -1]
+
+    # Lookup tables, indexed by the raw header bits
+
+    VERSIONS = [MpegVersion.V2_5, MpegVersion.INVALID, MpegVersion.V2, MpegVersion.V1]
+    LAYERS = [MpegLayer.INVALID, MpegLayer.L3, MpegLayer.L2, MpegLayer.L1]
+    CHANNEL_MODES = [ChannelMode.STEREO, ChannelMode.JOINT_STEREO, ChannelMode.DUAL_CHANNEL, ChannelMode.MONO]
+    SAMPLE_RATES = [SAMPLE_RATE_V2_5, None, SAMPLE_RATE_V2, SAMPLE_RATE_V1]
+    BITRATES = [[None, BITRATE_V2_L2_3, BITRATE_V2_L2_3, BITRATE_V2_L1],
+                [None, None, None, None],
+                [None, BITRATE_V2_L2_3, BITRATE_V2_L2_3, BITRATE_V2_L1],
+                [None, BITRATE_V1_L3, BITRATE_V1_L2, BITRATE_V1_L1]]
+
+    # Header word cache
+
+    HEADER_KEY_MASK = 0x001EFCC0
+    PADDING_MASK = 0x00000200
+    BITRATE_MASK = 0x0000F000
+    PROTECTION_MASK = 0x00010000
+    FIELD_BITRATE = 2
+    FIELD_SAMPLE_RATE = 3
+    FIELD_FRAME_SIZE = 5
+
+    # Xing / Info tag
+
+    XING_MAGIC = b'Xing'
+    INFO_MAGIC = b'Info'
+    XING_FIELD_SIZES = [(0x01, 4), (0x02, 4), (0x04, 100), (0x08, 4)] # frames, bytes, toc, quality
+
+    # Free format
+
+    FREE_FORMAT_MASK = 0xFFFFFC00
+    MAX_FREE_FORMAT_FRAME_SIZE = 4096
+    HEADER_CACHE = {}
\ No newline at end of file
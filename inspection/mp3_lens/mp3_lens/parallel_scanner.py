@@ -0,0 +1,98 @@
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import numpy as np
+import os
+from mp3_lens.frame_scanner import FrameScanner
+
+class SortedOffsets:
+    # membership test on a sorted offset array without building a set
+
+    def __init__(self, offsets: np.ndarray):
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, offset: int) -> bool:
+        index = int(np.searchsorted(self.offsets, offset))
+        return index < len(self.offsets) and self.offsets[index] == offset
+
+    def index(self, offset: int) -> int:
+        return int(np.searchsorted(self.offsets, offset))
+
+class ParallelScanner:
+    # Splits a file into byte ranges and scans each range in a worker process
+    # on its own mapping of the file. A worker starts unsynced at the beginning
+    # of its range, so its first frames may differ from the serial scan. At each
+    # seam the serial chain is continued from where the previous range left
+    # until it hits a frame the worker found as well. From there both scans are
+    # identical and the worker's frames are taken over.
+
+    RANGES_PER_WORKER: int = 4
+    MIN_RANGE_SIZE: int = 1 << 20
+
+    @staticmethod
+    def find_frame_offsets(filename: str, offset: int = 0, workers: int = os.cpu_count()) -> np.ndarray:
+        size = os.path.getsize(filename)
+        ranges = ParallelScanner.get_ranges(offset, size, workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            starts = [start for start, _ in ranges]
+            stops = [stop for _, stop in ranges]
+            results = list(executor.map(ParallelScanner.scan_file_range, [filename] * len(ranges), starts, stops))
+
+        with open(filename, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return ParallelScanner.reconcile(data, ranges, results)
+        finally:
+            data.close()
+
+    @staticmethod
+    def get_ranges(offset: int, size: int, workers: int) -> [(int, int)]:
+        range_count = max(1, workers * ParallelScanner.RANGES_PER_WORKER)
+        range_size = max(ParallelScanner.MIN_RANGE_SIZE, -(-(size - offset) // range_count))
+
+        ranges = []
+        start = offset
+        while start < size:
+            stop = min(start + range_size, size)
+            ranges.append((start, stop))
+            start = stop
+        return ranges
+
+    @staticmethod
+    def scan_file_range(filename: str, start: int, stop: int) -> (np.ndarray, int, bool):
+        # worker, maps the file itself so no data is sent between processes
+        with open(filename, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            offsets, next_offset, is_synced = FrameScanner.scan_range(data, start, stop)
+        finally:
+            data.close()
+        return np.asarray(offsets, dtype=np.int64), next_offset, is_synced
+
+    @staticmethod
+    def reconcile(data: bytearray, ranges: [(int, int)], results: [(np.ndarray, int, bool)]) -> np.ndarray:
+        parts = []
+        next_offset, is_synced = ranges[0][0], False
+
+        for (start, stop), (offsets, range_next_offset, range_is_synced) in zip(ranges, results):
+            # chain jumps over the whole range
+            if next_offset >= stop:
+                continue
+
+            # continue serial chain until it meets the worker's chain
+            worker_offsets = SortedOffsets(offsets)
+            seam_offsets, seam_next_offset, seam_is_synced = FrameScanner.scan_range(data, next_offset, stop, is_synced, worker_offsets)
+            parts.append(np.asarray(seam_offsets, dtype=np.int64))
+
+            if seam_next_offset < stop and seam_next_offset in worker_offsets:
+                parts.append(offsets[worker_offsets.index(seam_next_offset):])
+                next_offset, is_synced = range_next_offset, range_is_synced
+            else:
+                next_offset, is_synced = seam_next_offset, seam_is_synced
+
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
@@ -0,0 +1,144 @@
+from typing import Optional
+from mp3_lens.mp3_format import Mp3Format
+
+class XingHeader:
+    # Xing (vbr) or Info (cbr) tag in the first frame, optionally followed by
+    # the LAME extension
+    is_info: bool = False
+    frame_count: int = -1 # audio frames, without the tag frame
+    byte_count: int = -1 # bytes of audio, including the tag frame
+    toc: Optional[bytes] = None # 100 entries, byte position of percent in 1/256 of byte count
+    quality: int = -1
+    encoder: str = ''
+    encoder_delay: int = -1 # samples
+    encoder_padding: int = -1 # samples
+    lame_extension: bytes = b'' # raw 36 bytes
+
+class VbriHeader:
+    # Fraunhofer tag in the first frame
+    version: int = 0
+    delay: int = 0
+    quality: int = 0
+    byte_count: int = 0
+    frame_count: int = 0
+    frames_per_entry: int = 0
+    toc: [int] = [] # bytes per entry, already scaled
+
+class VbrFormat:
+
+    VBRI_MAGIC = b'VBRI'
+    LAME_MAGIC = b'LAME'
+
+    # Xing flags
+    FRAMES_FLAG = 0x01
+    BYTES_FLAG = 0x02
+    TOC_FLAG = 0x04
+    QUALITY_FLAG = 0x08
+
+    TOC_SIZE = 100
+    ENCODER_SIZE = 9
+    DELAY_OFFSET = 21 # encoder delay and padding in LAME extension
+    LAME_EXTENSION_SIZE = 36
+
+    VBRI_OFFSET = 36 # header + 32 bytes
+
+    @staticmethod
+    def get_xing_header(data: bytearray, offset: int = 0) -> Optional[XingHeader]:
+        index = Mp3Format.get_xing_offset(data, offset)
+        magic = bytes(data[index : index + 4])
+        if magic != Mp3Format.XING_MAGIC and magic != Mp3Format.INFO_MAGIC:
+            return None
+
+        header = XingHeader()
+        header.is_info = magic == Mp3Format.INFO_MAGIC
+        flags = VbrFormat.__read_int(data, index + 4, 4)
+        index += 8
+
+        if flags & VbrFormat.FRAMES_FLAG:
+            header.frame_count = VbrFormat.__read_int(data, index, 4)
+            index += 4
+        if flags & VbrFormat.BYTES_FLAG:
+            header.byte_count = VbrFormat.__read_int(data, index, 4)
+            index += 4
+        if flags & VbrFormat.TOC_FLAG:
+            header.toc = bytes(data[index : index + VbrFormat.TOC_SIZE])
+            index += VbrFormat.TOC_SIZE
+        if flags & VbrFormat.QUALITY_FLAG:
+            header.quality = VbrFormat.__read_int(data, index, 4)
+            index += 4
+
+        # LAME extension: 9 byte encoder string, ..., 12 bit delay, 12 bit padding, ...
+        if len(data) >= index + VbrFormat.DELAY_OFFSET + 3:
+            encoder = bytes(data[index : index + VbrFormat.ENCODER_SIZE])
+            if encoder.startswith(VbrFormat.LAME_MAGIC):
+                header.encoder = encoder.decode('latin-1').rstrip('\0 ')
+                header.lame_extension = bytes(data[index : index + VbrFormat.LAME_EXTENSION_SIZE])
+                delay_padding = VbrFormat.__read_int(data, index + VbrFormat.DELAY_OFFSET, 3)
+                header.encoder_delay = delay_padding >> 12
+                header.encoder_padding = delay_padding & 0xFFF
+
+        return header
+
+    @staticmethod
+    def is_vbri_frame(data: bytearray, offset: int = 0) -> bool:
+        index = offset + VbrFormat.VBRI_OFFSET
+        return data[index : index + 4] == VbrFormat.VBRI_MAGIC
+
+    @staticmethod
+    def get_vbri_header(data: bytearray, offset: int = 0) -> Optional[VbriHeader]:
+        # VBRI, version, delay, quality, bytes, frames, entry count, scale, entry size, frames per entry, entries
+        if not VbrFormat.is_vbri_frame(data, offset):
+            return None
+
+        index = offset + VbrFormat.VBRI_OFFSET
+
+        header = VbriHeader()
+        header.version = VbrFormat.__read_int(data, index + 4, 2)
+        header.delay = VbrFormat.__read_int(data, index + 6, 2)
+        header.quality = VbrFormat.__read_int(data, index + 8, 2)
+        header.byte_count = VbrFormat.__read_int(data, index + 10, 4)
+        header.frame_count = VbrFormat.__read_int(data, index + 14, 4)
+        entry_count = VbrFormat.__read_int(data, index + 18, 2)
+        scale = VbrFormat.__read_int(data, index + 20, 2)
+        entry_size = VbrFormat.__read_int(data, index + 22, 2)
+        header.frames_per_entry = VbrFormat.__read_int(data, index + 24, 2)
+
+        index += 26
+        if entry_size < 1 or len(data) < index + entry_count * entry_size:
+            return header
+
+        toc = []
+        for entry in range(entry_count):
+            toc.append(VbrFormat.__read_int(data, index + entry * entry_size, entry_size) * scale)
+        header.toc = toc
+        return header
+
+    @staticmethod
+    def get_xing_position(header: XingHeader, fraction: float, byte_count: int) -> int:
+        # linear interpolation between toc entries, fraction of duration in [0, 1]
+        percent = min(max(fraction * 100, 0), 99.999)
+        if not header.toc:
+            return int(fraction * byte_count)
+
+        index = int(percent)
+        lower = header.toc[index]
+        upper = header.toc[index + 1] if index < 99 else 256
+        position = lower + (upper - lower) * (percent - index)
+        return int(position / 256 * byte_count)
+
+    @staticmethod
+    def get_vbri_position(header: VbriHeader, frame: float) -> int:
+        # bytes in front of frame number
+        if not header.toc or header.frames_per_entry <= 0:
+            return 0
+
+        entry = int(frame // header.frames_per_entry)
+        if entry >= len(header.toc):
+            return sum(header.toc)
+
+        fraction = frame / header.frames_per_entry - entry
+        return int(sum(header.toc[:entry]) + fraction * header.toc[entry])
+
+    @staticmethod
+    def __read_int(data: bytearray, offset: int, size: int) -> int:
+        return int.from_bytes(data[offset : offset + size], 'big')
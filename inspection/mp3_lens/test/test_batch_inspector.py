@@ -0,0 +1,77 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import mp3_lens
+from mp3_lens.batch_inspector import BatchInspector
+
+# V1 Layer III 128 kbps 44.1 kHz -> 417 bytes, 1152 samples
+HEADER = bytes.fromhex('FFFB9000')
+FRAME = HEADER + bytes(413)
+# V1 Layer III 128 kbps 48 kHz -> 384 bytes
+OTHER_FRAME = bytes.fromhex('FFFB9400') + bytes(380)
+XING_FRAME = HEADER + bytes(32) + b'Xing' + bytes(377)
+ID_V3_TAG = bytes.fromhex('49443304000000000010') + bytes(16)
+
+class BatchInspectorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.write('a.mp3', ID_V3_TAG + FRAME * 10)
+        self.write('b.mp3', XING_FRAME + FRAME * 2 + OTHER_FRAME + FRAME)
+        self.write('c.mp3', b'')
+        self.write('notes.txt', b'no audio')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write(self, filename: str, data: bytes):
+        with open(os.path.join(self.folder.name, filename), 'wb') as file:
+            file.write(data)
+
+    def test_get_filenames(self):
+        filenames = BatchInspector.get_filenames(self.folder.name)
+        self.assertEqual([os.path.basename(filename) for filename in filenames], ['a.mp3', 'b.mp3', 'c.mp3'])
+
+        filenames = BatchInspector.get_filenames(os.path.join(self.folder.name, '[ab].mp3'))
+        self.assertEqual(len(filenames), 2)
+
+    def test_inspect_file(self):
+        result = BatchInspector.inspect_file(os.path.join(self.folder.name, 'a.mp3'))
+        self.assertEqual(result['frame_count'], 10)
+        self.assertAlmostEqual(result['duration'], 10 * 1152 / 44100, places=3)
+        self.assertEqual(result['header_mismatches'], 0)
+        self.assertEqual((result['id_v3_offset'], result['id_v3_size']), (0, 26))
+        self.assertFalse(result['has_xing'])
+        self.assertIsNone(result['error'])
+
+        result = BatchInspector.inspect_file(os.path.join(self.folder.name, 'b.mp3'))
+        self.assertEqual(result['frame_count'], 5)
+        self.assertEqual(result['header_mismatches'], 1)
+        self.assertTrue(result['has_xing'])
+
+    def test_inspect_broken_file(self):
+        result = BatchInspector.inspect_file(os.path.join(self.folder.name, 'c.mp3'))
+        self.assertIsNotNone(result['error'])
+
+    def test_run_jsonl(self):
+        report_filename = os.path.join(self.folder.name, 'report.jsonl')
+        error_count = BatchInspector.run(self.folder.name, report_filename, workers=2)
+        self.assertEqual(error_count, 1)
+
+        with open(report_filename) as file:
+            results = [json.loads(line) for line in file]
+        self.assertEqual([result['frame_count'] for result in results], [10, 5, None])
+
+    def test_run_csv(self):
+        report_filename = os.path.join(self.folder.name, 'report.csv')
+        BatchInspector.run(self.folder.name, report_filename, workers=2)
+
+        with open(report_filename, newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['frame_count'], '10')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tarfile
+import tempfile
+import unittest
+import mp3_lens
+from mp3_lens.__main__ import Mp3Surgeon
+from mp3_lens.frame_exporter import ExportMode, BatchWriter, TarFrameWriter, BlobFrameWriter, ThreadedFileWriter
+
+# V1 Layer III 128 kbps 44.1 kHz -> 417 bytes, payload makes frames distinguishable
+HEADER = bytes.fromhex('FFFB9000')
+FRAMES = [HEADER + bytes([index]) * 413 for index in range(5)]
+XING_FRAME = HEADER + bytes(32) + b'Xing' + bytes(377)
+
+class FrameExporterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = self.folder.name
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_batch_writer(self):
+        filename = os.path.join(self.path, 'batch')
+        batch_size = BatchWriter.BATCH_SIZE
+        BatchWriter.BATCH_SIZE = 1000
+        try:
+            writer = BatchWriter(filename)
+            for frame in FRAMES:
+                writer.write(memoryview(frame)[:300])
+            writer.close()
+        finally:
+            BatchWriter.BATCH_SIZE = batch_size
+
+        with open(filename, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(frame[:300] for frame in FRAMES))
+
+    def test_tar_frame_writer(self):
+        filename = os.path.join(self.path, 'frames.tar')
+        writer = TarFrameWriter(filename)
+        for index, frame in enumerate(FRAMES):
+            writer.add('frame_{0}.mp3'.format(index), memoryview(frame))
+        writer.close()
+
+        self.assertEqual(os.path.getsize(filename) % TarFrameWriter.RECORD_SIZE, 0)
+        with tarfile.open(filename) as tar:
+            self.assertEqual(tar.getnames(), ['frame_{0}.mp3'.format(index) for index in range(5)])
+            self.assertEqual(tar.extractfile('frame_3.mp3').read(), FRAMES[3])
+
+    def test_blob_frame_writer(self):
+        filename = os.path.join(self.path, 'frames.mp3')
+        writer = BlobFrameWriter(filename)
+        for frame in FRAMES:
+            writer.add(memoryview(frame))
+        writer.close()
+
+        offsets = BlobFrameWriter.load_offsets(filename)
+        self.assertEqual(list(offsets), [index * 417 for index in range(6)])
+        with open(filename, 'rb') as file:
+            self.assertEqual(file.read(), b''.join(FRAMES))
+
+    def test_threaded_file_writer(self):
+        writer = ThreadedFileWriter()
+        for index, frame in enumerate(FRAMES):
+            writer.add(os.path.join(self.path, str(index)), frame)
+        writer.close()
+
+        with open(os.path.join(self.path, '4'), 'rb') as file:
+            self.assertEqual(file.read(), FRAMES[4])
+
+    def test_threaded_file_writer_error(self):
+        writer = ThreadedFileWriter()
+        writer.add(os.path.join(self.path, 'missing', 'frame'), FRAMES[0])
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_threaded_file_writer_bad_frame(self):
+        # more items than the queue holds behind the failing one
+        writer = ThreadedFileWriter()
+        with self.assertRaises(TypeError):
+            writer.add(os.path.join(self.path, 'bad'), 123)
+            for index in range(ThreadedFileWriter.QUEUE_SIZE + 10):
+                writer.add(os.path.join(self.path, str(index % 5)), FRAMES[0])
+            writer.close()
+
+    def test_export_modes(self):
+        filename = os.path.join(self.path, 'audio.mp3')
+        with open(filename, 'wb') as file:
+            file.write(XING_FRAME + b''.join(FRAMES))
+
+        for streaming in [False, True]:
+            surgeon = Mp3Surgeon(filename, use_index=False, streaming=streaming)
+            for export_mode in ExportMode:
+                surgeon.write_data(self.path, 'audio', export_mode=export_mode)
+
+            frames_path = os.path.join(self.path, 'frames')
+            with open(os.path.join(frames_path, 'audio_00002.mp3'), 'rb') as file:
+                self.assertEqual(file.read(), FRAMES[2])
+            with open(os.path.join(frames_path, 'audio_block.mp3'), 'rb') as file:
+                self.assertEqual(file.read(), b''.join(FRAMES))
+            with tarfile.open(os.path.join(frames_path, 'audio_frames.tar')) as tar:
+                self.assertEqual(tar.extractfile('audio_00002.mp3').read(), FRAMES[2])
+            self.assertEqual(len(BlobFrameWriter.load_offsets(os.path.join(frames_path, 'audio_blob.mp3'))), 6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import mp3_lens
+from mp3_lens.__main__ import Mp3Surgeon
+from mp3_lens.frame_index import FrameIndex
+from mp3_lens.frame_scanner import FrameScanner
+from mp3_lens.idv3_format import TagRange
+
+# V1 Layer III 128 kbps 44.1 kHz -> 417 bytes
+HEADER = bytes.fromhex('FFFB9000')
+FRAME = HEADER + bytes(413)
+
+class FrameIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, 'audio.mp3')
+        self.data = FRAME * 3
+        with open(self.filename, 'wb') as file:
+            file.write(self.data)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_index(self):
+        offsets = FrameScanner.find_frame_offsets(self.data, 0)
+        FrameIndex.build(self.data, offsets, TagRange(-1, -1)).write(self.filename)
+
+    def test_header_words(self):
+        index = FrameIndex.build(self.data, [0, 417], TagRange(-1, -1))
+        self.assertEqual(list(index.words), [0xFFFB9000, 0xFFFB9000])
+
+    def test_load(self):
+        self.write_index()
+        index = FrameIndex.load(self.filename)
+        self.assertEqual(list(index.offsets), [0, 417, 834])
+        self.assertEqual(index.tag_range.size, -1)
+
+    def test_load_without_index(self):
+        self.assertIsNone(FrameIndex.load(self.filename))
+
+    def test_load_changed_file(self):
+        self.write_index()
+        with open(self.filename, 'ab') as file:
+            file.write(FRAME)
+        self.assertIsNone(FrameIndex.load(self.filename))
+
+    def test_load_changed_mtime(self):
+        self.write_index()
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        self.assertIsNone(FrameIndex.load(self.filename))
+
+    def test_load_changed_middle(self):
+        # same size, hashed first and last block unchanged, only mtime differs
+        self.data = FRAME * 400
+        with open(self.filename, 'wb') as file:
+            file.write(self.data)
+        self.write_index()
+        stat = os.stat(self.filename)
+        with open(self.filename, 'r+b') as file:
+            file.seek(200 * 417)
+            file.write(bytes(4))
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertIsNone(FrameIndex.load(self.filename))
+
+    def test_surgeon_with_index(self):
+        # second run maps the file instead of reading it
+        Mp3Surgeon(self.filename).close()
+        surgeon = Mp3Surgeon(self.filename)
+        self.assertIsNotNone(surgeon.mmap)
+        self.assertEqual(list(surgeon.frame_offsets), [0, 417, 834])
+        surgeon.close()
+
+    def test_surgeon_header_table_from_index(self):
+        # header words come from the index, frame bytes are not read
+        Mp3Surgeon(self.filename).close()
+        surgeon = Mp3Surgeon(self.filename)
+        data = surgeon.data
+        surgeon.data = bytes(len(data))
+        table = surgeon.get_header_table()
+        surgeon.data = data
+        surgeon.close()
+        self.assertEqual(list(table.rows['word']), [0xFFFB9000] * 3)
+        self.assertEqual(list(table.rows['frame_size']), [417] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import io
+import unittest
+import mp3_lens
+from mp3_lens.frame_reader import FrameReader
+
+# V1 Layer III 128 kbps 44.1 kHz -> 417 bytes
+HEADER = bytes.fromhex('FFFB9000')
+FRAME = HEADER + bytes(413)
+
+# Id V3 tag with 20 bytes of content
+TAG = bytes.fromhex('49443304000000000014') + bytes(20)
+
+class FrameReaderTests(unittest.TestCase):
+
+    def test_frames(self):
+        reader = FrameReader(io.BytesIO(FRAME * 3))
+        offsets = [header.offset for header, _ in reader]
+        self.assertEqual(offsets, [0, 417, 834])
+
+    def test_frames_across_chunks(self):
+        reader = FrameReader(io.BytesIO(FRAME * 10), chunk_size=100)
+        offsets = [header.offset for header, _ in reader]
+        self.assertEqual(offsets, [index * 417 for index in range(10)])
+
+    def test_frame_data(self):
+        reader = FrameReader(io.BytesIO(FRAME * 2), chunk_size=100)
+        frames = [bytes(frame) for _, frame in reader]
+        self.assertEqual(frames, [FRAME, FRAME])
+
+    def test_skip_tag(self):
+        reader = FrameReader(io.BytesIO(TAG + FRAME * 2), chunk_size=16)
+        offsets = [header.offset for header, _ in reader]
+        self.assertEqual(offsets, [30, 447])
+        self.assertEqual(reader.tag_range.offset, 0)
+        self.assertEqual(reader.tag_range.size, 30)
+
+    def test_resync_after_junk(self):
+        reader = FrameReader(io.BytesIO(bytes(100) + FRAME * 2), chunk_size=64)
+        offsets = [header.offset for header, _ in reader]
+        self.assertEqual(offsets, [100, 517])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import mp3_lens
+from mp3_lens.frame_scanner import FrameScanner
+from mp3_lens.mp3_format import Mp3Format, MpegVersion, MpegLayer
+
+# V1 Layer III 128 kbps 44.1 kHz -> 417 bytes
+HEADER = bytes.fromhex('FFFB9000')
+FRAME = HEADER + bytes(413)
+
+class FrameScannerTests(unittest.TestCase):
+
+    # Candidates
+
+    def test_find_sync_candidates(self):
+        data = bytes.fromhex('00FFE0000000FFF10000')
+        result = FrameScanner.find_sync_candidates(data, 0)
+        self.assertEqual(list(result), [1, 6])
+
+    def test_find_sync_candidates_needs_complete_header(self):
+        data = bytes.fromhex('0000FFE000')
+        result = FrameScanner.find_sync_candidates(data, 0)
+        self.assertEqual(list(result), [])
+
+    # Frame offsets
+
+    def test_find_frame_offsets(self):
+        data = FRAME * 3
+        result = FrameScanner.find_frame_offsets(data, 0)
+        self.assertEqual(result, [0, 417, 834])
+
+    def test_find_frame_offsets_resync_after_junk(self):
+        data = bytes(100) + FRAME * 2
+        result = FrameScanner.find_frame_offsets(data, 0)
+        self.assertEqual(result, [100, 517])
+
+    def test_find_frame_offsets_skips_unconfirmed_sync(self):
+        # false sync in junk is not followed by another header
+        data = bytes.fromhex('00FFFB9000') + bytes(10) + FRAME * 2
+        result = FrameScanner.find_frame_offsets(data, 0)
+        self.assertEqual(result, [15, 432])
+
+    def test_find_frame_offsets_multi_format(self):
+        # every version, layer, bitrate and sample rate with and without padding
+        parts = []
+        offsets = []
+        offset = 0
+        for version_index, version in enumerate(Mp3Format.VERSIONS):
+            for layer_index, layer in enumerate(Mp3Format.LAYERS):
+                bitrates = Mp3Format.BITRATES[version_index][layer_index]
+                if not bitrates:
+                    continue
+                for bitrate in bitrates[1:-1]:
+                    for sample_rate in Mp3Format.SAMPLE_RATES[version_index][:-1]:
+                        for padding in [False, True]:
+                            header = Mp3Format.build_header(version, layer, bitrate * 1000, sample_rate, padding)
+                            frame_size = Mp3Format.get_frame_size(header, 0)
+                            parts.append(header + bytes(frame_size - len(header)))
+                            offsets.append(offset)
+                            offset += frame_size
+
+        data = b''.join(parts)
+        result = FrameScanner.find_frame_offsets(data, 0)
+        self.assertEqual(result, offsets)
+
+    def test_find_frame_offsets_free_format(self):
+        # last frame has no following header to be measured against
+        data = (bytes.fromhex('FFFB0000') + bytes(296)) * 3
+        result = FrameScanner.find_frame_offsets(data, 0)
+        self.assertEqual(result, [0, 300])
+
+if __name__ == '__main__':
+    unittest.main()
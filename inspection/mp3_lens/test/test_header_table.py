@@ -0,0 +1,50 @@
+import unittest
+import mp3_lens
+from mp3_lens.frame_scanner import FrameScanner
+from mp3_lens.header_table import HeaderTable
+from mp3_lens.mp3_format import Mp3Format, MpegVersion, MpegLayer, ChannelMode
+
+def make_frame(version: MpegVersion, layer: MpegLayer, bitrate: int, sample_rate: int, padding: bool = False) -> bytes:
+    header = Mp3Format.build_header(version, layer, bitrate, sample_rate, padding)
+    return header + bytes(Mp3Format.get_frame_size(header + bytes(4), 0) - 4)
+
+class HeaderTableTests(unittest.TestCase):
+
+    def setUp(self):
+        frames = [make_frame(MpegVersion.V1, MpegLayer.L3, 128000, 44100),
+                  make_frame(MpegVersion.V1, MpegLayer.L3, 128000, 44100, True),
+                  make_frame(MpegVersion.V1, MpegLayer.L3, 320000, 44100),
+                  make_frame(MpegVersion.V2, MpegLayer.L3, 64000, 22050),
+                  make_frame(MpegVersion.V1, MpegLayer.L2, 128000, 44100)]
+        self.data = b''.join(frames)
+        self.offsets = FrameScanner.find_frame_offsets(self.data, 0)
+        self.table = HeaderTable.build(self.data, self.offsets)
+
+    def test_build(self):
+        self.assertEqual(len(self.table), 5)
+        self.assertEqual(list(self.table.rows['frame_size']), [417, 418, 1044, 208, 417])
+        self.assertEqual(list(self.table.rows['offset']), self.offsets)
+
+    def test_get_header(self):
+        for index, offset in enumerate(self.offsets):
+            header = self.table.get_header(index)
+            expected = Mp3Format.get_mpeg_header(self.data, offset)
+            self.assertEqual(vars(header), vars(expected))
+
+        header = self.table.get_header(3)
+        self.assertEqual(header.version, MpegVersion.V2)
+        self.assertEqual(header.channel_mode, ChannelMode.STEREO)
+
+    def test_stats(self):
+        self.assertEqual(list(self.table.get_mismatches()), [3, 4])
+        self.assertEqual(self.table.get_bitrate_histogram(), {64000: 1, 128000: 3, 320000: 1})
+        self.assertAlmostEqual(self.table.get_duration(), 4 * 1152 / 44100 + 576 / 22050)
+
+    def test_empty(self):
+        table = HeaderTable.build(self.data, [])
+        self.assertEqual(len(table), 0)
+        self.assertEqual(len(table.get_mismatches()), 0)
+        self.assertEqual(table.get_duration(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
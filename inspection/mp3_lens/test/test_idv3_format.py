@@ -0,0 +1,81 @@
+import unittest
+import mp3_lens
+from mp3_lens.idv3_format import IdV3TagFormat, IdV3Tag, TagType
+
+FRAME = bytes.fromhex('FFFB9000') + bytes(413)
+
+def syncsafe(size: int) -> bytes:
+    return bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+
+def make_text_frame(frame_id: str, text: str, major_version: int) -> bytes:
+    content = b'\x03' + text.encode('utf-8')
+    size = syncsafe(len(content)) if major_version == 4 else len(content).to_bytes(4, 'big')
+    return frame_id.encode('latin-1') + size + bytes(2) + content
+
+def make_tag(frames: bytes, major_version: int = 4, padding: int = 16, flags: int = 0) -> bytes:
+    body = frames + bytes(padding)
+    return b'ID3' + bytes([major_version, 0, flags]) + syncsafe(len(body)) + body
+
+def make_ape_tag(items_size: int = 20) -> bytes:
+    # footer only, size counts items and footer
+    footer = b'APETAGEX' + (2000).to_bytes(4, 'little') + (items_size + 32).to_bytes(4, 'little')
+    footer += (1).to_bytes(4, 'little') + bytes(4) + bytes(8)
+    return bytes(items_size) + footer
+
+ID_V1_TAG = b'TAG' + bytes(125)
+
+class IdV3TagFormatTests(unittest.TestCase):
+
+    def test_unsyncsave(self):
+        self.assertEqual(IdV3TagFormat.unsyncsave(bytes.fromhex('00000201')), 257)
+        self.assertEqual(IdV3TagFormat.unsyncsave(syncsafe(5000000)), 5000000)
+
+    def test_get_id_v3_tag_range(self):
+        tag = make_tag(make_text_frame('TIT2', 'title', 4))
+        tag_range = IdV3TagFormat.get_id_v3_tag_range(bytes(5) + tag + FRAME)
+        self.assertEqual((tag_range.offset, tag_range.size), (5, len(tag)))
+
+    def test_get_id_v3_tag_range_memoryview(self):
+        tag = make_tag(b'', padding=3000000)
+        tag_range = IdV3TagFormat.get_id_v3_tag_range(memoryview(tag + FRAME))
+        self.assertEqual((tag_range.offset, tag_range.size), (0, len(tag)))
+
+    def test_get_id_v3_tag_range_no_tag(self):
+        self.assertIsNone(IdV3TagFormat.get_id_v3_tag_range(FRAME * 3 + b'ID3'))
+
+    def test_get_tag_ranges(self):
+        tag = make_tag(b'')
+        ape_tag = make_ape_tag()
+        appended_tag = make_tag(b'', flags=IdV3TagFormat.FOOTER_FLAG)
+        appended_tag += b'3DI' + appended_tag[3:10]
+        data = tag + FRAME * 2 + appended_tag + ape_tag + ID_V1_TAG
+
+        tag_ranges = IdV3TagFormat.get_tag_ranges(data)
+        self.assertEqual([tag_range.tag_type for tag_range in tag_ranges], [TagType.ID_V3, TagType.ID_V3_APPENDED, TagType.APE_V2, TagType.ID_V1])
+        self.assertEqual([tag_range.size for tag_range in tag_ranges], [len(tag), len(appended_tag), len(ape_tag), 128])
+        self.assertEqual(tag_ranges[1].offset, len(tag) + 2 * len(FRAME))
+        self.assertEqual(tag_ranges[3].offset, len(data) - 128)
+
+    def test_get_tag_ranges_no_tags(self):
+        self.assertEqual(IdV3TagFormat.get_tag_ranges(FRAME * 2), [])
+
+class IdV3TagTests(unittest.TestCase):
+
+    def test_text_frames_v2_4(self):
+        frames = make_text_frame('TIT2', 'Title', 4) + make_text_frame('TPE1', 'Artist ä', 4)
+        tag = IdV3Tag(make_tag(frames, 4) + FRAME)
+        self.assertEqual(tag.get_frame_ids(), ['TIT2', 'TPE1'])
+        self.assertEqual(tag.get_text('TIT2'), 'Title')
+        self.assertEqual(tag.get_text('TPE1'), 'Artist ä')
+        self.assertIsNone(tag.get_text('TALB'))
+
+    def test_text_frames_v2_3(self):
+        frames = make_text_frame('TIT2', 'x' * 200, 3)
+        tag = IdV3Tag(make_tag(frames, 3))
+        self.assertEqual(tag.get_text('TIT2'), 'x' * 200)
+
+    def test_unsynchronisation(self):
+        self.assertEqual(IdV3Tag.remove_unsynchronisation(b'\xff\x00\xe0'), b'\xff\xe0')
+
+if __name__ == '__main__':
+    unittest.main()
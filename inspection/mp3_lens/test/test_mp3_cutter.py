@@ -0,0 +1,115 @@
+import numpy as np
+import os
+import tempfile
+import unittest
+import mp3_lens
+from mp3_lens.__main__ import Mp3Surgeon
+from mp3_lens.frame_scanner import FrameScanner
+from mp3_lens.header_table import HeaderTable
+from mp3_lens.mp3_cutter import Mp3Cutter
+from mp3_lens.mp3_format import Mp3Format
+from mp3_lens.vbr_format import VbrFormat
+
+# V1 Layer III 128 kbps 44.1 kHz -> 417 bytes, 1152 samples, 381 bytes main data
+HEADER = bytes.fromhex('FFFB9000')
+FRAME_SIZE = 417
+SAMPLES = 1152
+
+def make_frame(index: int, main_data_begin: int = 0) -> bytes:
+    side_info = bytes([main_data_begin >> 1, (main_data_begin & 1) << 7]) + bytes(30)
+    return HEADER + side_info + bytes([index % 256]) * (FRAME_SIZE - 36)
+
+def make_stream(frame_count: int, main_data_begin: int = 0) -> bytes:
+    return b''.join(make_frame(index, main_data_begin) for index in range(frame_count))
+
+class Mp3CutterTests(unittest.TestCase):
+
+    def get_cut_range(self, data: bytes, start_sample: int, end_sample: int):
+        table = HeaderTable.build(data, FrameScanner.find_frame_offsets(data, 0))
+        return Mp3Cutter.get_cut_range(data, table, 0, start_sample, end_sample)
+
+    def test_crc16(self):
+        self.assertEqual(Mp3Cutter.crc16(b'123456789'), 0xBB3D)
+
+    def test_get_main_data_begin(self):
+        self.assertEqual(Mp3Format.get_main_data_begin(make_frame(0, 511)), 511)
+        self.assertEqual(Mp3Format.get_main_data_begin(make_frame(0, 256)), 256)
+
+    def test_get_cut_range(self):
+        cut_range = self.get_cut_range(make_stream(100), 10 * SAMPLES + 100, 20 * SAMPLES)
+        self.assertEqual((cut_range.first_frame, cut_range.start_frame, cut_range.end_frame), (9, 10, 21))
+        self.assertEqual(cut_range.delay, SAMPLES + 100)
+        self.assertEqual(cut_range.padding, 12 * SAMPLES - cut_range.delay - (10 * SAMPLES - 100))
+
+    def test_get_cut_range_bit_reservoir(self):
+        # 500 bytes reservoir need two frames of 381 bytes main data
+        cut_range = self.get_cut_range(make_stream(100, 500), 10 * SAMPLES, 20 * SAMPLES)
+        self.assertEqual(cut_range.first_frame, 7)
+        self.assertEqual(cut_range.delay, 3 * SAMPLES)
+
+    def test_get_cut_range_start_of_file(self):
+        cut_range = self.get_cut_range(make_stream(100, 500), 0, SAMPLES)
+        self.assertEqual((cut_range.first_frame, cut_range.end_frame, cut_range.delay), (0, 2, 0))
+
+    def test_get_cut_range_end_of_file(self):
+        cut_range = self.get_cut_range(make_stream(100), 90 * SAMPLES, 200 * SAMPLES)
+        self.assertEqual(cut_range.end_frame, 100)
+        self.assertEqual(cut_range.padding, 0)
+
+    def test_build_tag_frame(self):
+        offsets = np.arange(10) * FRAME_SIZE
+        frame = Mp3Cutter.build_tag_frame(HEADER, offsets, 10 * FRAME_SIZE, 1000, 2000, False)
+        self.assertTrue(Mp3Format.is_info_frame(frame))
+        self.assertEqual(Mp3Format.get_frame_size(frame), len(frame))
+
+        header = VbrFormat.get_xing_header(frame)
+        self.assertEqual((header.frame_count, header.byte_count), (10, len(frame) + 10 * FRAME_SIZE))
+        self.assertEqual(header.toc[50], (len(frame) + 5 * FRAME_SIZE) * 256 // header.byte_count)
+        self.assertEqual((header.encoder_delay, header.encoder_padding), (1000, 2000))
+        self.assertEqual(header.encoder, 'LAME3.100')
+
+        # tag crc over everything in front of it
+        crc_offset = Mp3Format.get_xing_offset(frame) + Mp3Cutter.XING_SIZE + Mp3Cutter.TAG_CRC_OFFSET
+        self.assertEqual(int.from_bytes(frame[crc_offset:crc_offset + 2], 'big'), Mp3Cutter.crc16(frame[:crc_offset]))
+
+class CutTests(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, 'audio.mp3')
+        with open(self.filename, 'wb') as file:
+            file.write(make_stream(100, 100))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_cut(self):
+        surgeon = Mp3Surgeon(self.filename, use_index=False)
+        clip_filename = os.path.join(self.folder.name, 'clip.mp3')
+        cut_range = surgeon.cut(clip_filename, 10 * SAMPLES / 44100, 20 * SAMPLES / 44100, write_music_crc=True)
+
+        with open(clip_filename, 'rb') as file:
+            clip = file.read()
+
+        header = VbrFormat.get_xing_header(clip)
+        tag_size = Mp3Format.get_frame_size(clip)
+        self.assertEqual(header.frame_count, cut_range.end_frame - cut_range.first_frame)
+        self.assertEqual(header.byte_count, len(clip))
+        self.assertEqual(header.encoder_delay, cut_range.delay)
+        self.assertEqual(clip[tag_size:], make_stream(100, 100)[cut_range.first_frame * FRAME_SIZE : cut_range.end_frame * FRAME_SIZE])
+        self.assertEqual(int.from_bytes(header.lame_extension[32:34], 'big'), Mp3Cutter.crc16(clip[tag_size:]))
+
+        # clip is a valid file again, without tag frame in its frames
+        clip_surgeon = Mp3Surgeon(clip_filename, use_index=False)
+        self.assertEqual(clip_surgeon.cut(os.path.join(self.folder.name, 'clip2.mp3'), 0, 1).first_frame, 0)
+
+    def test_cut_frames(self):
+        surgeon = Mp3Surgeon(self.filename, use_index=False)
+        cut_range = surgeon.cut_frames(os.path.join(self.folder.name, 'clip.mp3'), 50, 60)
+        # frame before and one frame for 100 bytes reservoir
+        self.assertEqual((cut_range.first_frame, cut_range.start_frame, cut_range.end_frame), (48, 50, 61))
+        self.assertEqual(cut_range.delay, 2 * SAMPLES)
+        self.assertEqual(cut_range.padding, SAMPLES)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import mp3_lens
-from mp3_lens.mp3_format import Mp3Format, MpegVersion, MpegLayer
+from mp3_lens.mp3_format import Mp3Format, MpegVersion, MpegLayer, ChannelMode
 
 class Mp3FormatTests(unittest.TestCase):
 
@@ -89,5 +89,79 @@ class Mp3FormatTests(unittest.TestCase):
         result = Mp3Format.is_sync_header(data, 0)
         self.assertEqual(result, True)
 
+    # Header
+
+    def test_get_mpeg_header(self):
+        data = bytes.fromhex('FFFB90C4')
+        header = Mp3Format.get_mpeg_header(data, 0)
+        self.assertEqual(header.version, MpegVersion.V1)
+        self.assertEqual(header.layer, MpegLayer.L3)
+        self.assertEqual(header.bitrate, 128000)
+        self.assertEqual(header.sample_rate, 44100)
+        self.assertEqual(header.channel_mode, ChannelMode.MONO)
+        self.assertEqual(header.padding, False)
+
+    def test_get_mpeg_header_padding(self):
+        data = bytes.fromhex('FFFB9244')
+        header = Mp3Format.get_mpeg_header(data, 0)
+        self.assertEqual(header.padding, True)
+        self.assertEqual(header.channel_mode, ChannelMode.JOINT_STEREO)
+
+    def test_get_mpeg_header_memoryview(self):
+        data = memoryview(bytes.fromhex('00FFFB9064'))
+        header = Mp3Format.get_mpeg_header(data, 1)
+        self.assertEqual(header.frame_size, 417)
+        self.assertEqual(header.offset, 1)
+
+    def test_decode_header_word_matches_fields(self):
+        for hex_header in ['FFFB9064', 'FFF3A244', 'FFE340C4', 'FFFD1400', 'FFFFE800']:
+            data = bytes.fromhex(hex_header)
+            fields = Mp3Format.decode_header_word(int.from_bytes(data, 'big'))
+            self.assertEqual(fields[0], Mp3Format.get_mpeg_version(data, 0))
+            self.assertEqual(fields[1], Mp3Format.get_layer_version(data, 0))
+            self.assertEqual(fields[2], Mp3Format.get_bitrate(data, 0))
+            self.assertEqual(fields[3], Mp3Format.get_sample_rate(data, 0))
+            self.assertEqual(fields[4], Mp3Format.get_channel_mode(data, 0))
+            self.assertEqual(fields[6], Mp3Format.get_padding(data, 0))
+
+    # Frame size
+
+    def test_get_frame_size_v1_l3(self):
+        data = Mp3Format.build_header(MpegVersion.V1, MpegLayer.L3, 128000, 44100)
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 417)
+
+    def test_get_frame_size_v1_l3_padding(self):
+        data = Mp3Format.build_header(MpegVersion.V1, MpegLayer.L3, 128000, 44100, padding=True)
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 418)
+
+    def test_get_frame_size_v1_l1_padding(self):
+        data = Mp3Format.build_header(MpegVersion.V1, MpegLayer.L1, 384000, 48000, padding=True)
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 388)
+
+    def test_get_frame_size_v1_l2(self):
+        data = Mp3Format.build_header(MpegVersion.V1, MpegLayer.L2, 192000, 48000)
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 576)
+
+    def test_get_frame_size_v2_l3(self):
+        data = Mp3Format.build_header(MpegVersion.V2, MpegLayer.L3, 64000, 22050)
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 208)
+
+    def test_get_frame_size_v2_5_l3(self):
+        data = Mp3Format.build_header(MpegVersion.V2_5, MpegLayer.L3, 8000, 8000)
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 72)
+
+    def test_get_frame_size_invalid_bitrate(self):
+        data = bytes.fromhex('FFFBF000')
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 0)
+
+    def test_get_frame_size_free_format(self):
+        header = bytes.fromhex('FFFB0000')
+        data = (header + bytes(296)) * 2
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 300)
+
+    def test_get_frame_size_free_format_without_next_header(self):
+        data = bytes.fromhex('FFFB0000') + bytes(296)
+        self.assertEqual(Mp3Format.get_frame_size(data, 0), 0)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
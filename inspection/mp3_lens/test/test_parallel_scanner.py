@@ -0,0 +1,58 @@
+import os
+import random
+import tempfile
+import unittest
+import mp3_lens
+from mp3_lens.frame_scanner import FrameScanner
+from mp3_lens.mp3_format import Mp3Format, MpegVersion, MpegLayer
+from mp3_lens.parallel_scanner import ParallelScanner
+
+def make_stream(frame_count: int) -> bytes:
+    # padded and unpadded frames with random payload and random junk in between
+    rng = random.Random(1)
+    parts = []
+    for index in range(frame_count):
+        if index % 7 == 0:
+            parts.append(rng.randbytes(rng.randrange(1, 600)))
+        header = Mp3Format.build_header(MpegVersion.V1, MpegLayer.L3, 128000, 44100, padding=index % 3 == 0)
+        parts.append(header + rng.randbytes(Mp3Format.get_frame_size(header, 0) - 4))
+    return b''.join(parts)
+
+class ParallelScannerTests(unittest.TestCase):
+
+    def test_get_ranges(self):
+        ranges = ParallelScanner.get_ranges(10, 3 * ParallelScanner.MIN_RANGE_SIZE, 1)
+        self.assertEqual(ranges[0][0], 10)
+        self.assertEqual(ranges[-1][1], 3 * ParallelScanner.MIN_RANGE_SIZE)
+        for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(stop, start)
+
+    def test_reconcile_matches_serial_scan(self):
+        data = make_stream(300)
+        expected = FrameScanner.find_frame_offsets(data, 0)
+
+        # ranges smaller and larger than frames, seams inside frames and junk
+        for range_size in [100, 417, 1000, 5003]:
+            ranges = [(start, min(start + range_size, len(data))) for start in range(0, len(data), range_size)]
+            results = [FrameScanner.scan_range(data, start, stop) for start, stop in ranges]
+            result = ParallelScanner.reconcile(data, ranges, results)
+            self.assertEqual(list(result), expected)
+
+    def test_find_frame_offsets(self):
+        data = make_stream(3000)
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, 'audio.mp3')
+            with open(filename, 'wb') as file:
+                file.write(data)
+
+            min_range_size = ParallelScanner.MIN_RANGE_SIZE
+            ParallelScanner.MIN_RANGE_SIZE = 4096
+            try:
+                result = ParallelScanner.find_frame_offsets(filename, 0, workers=2)
+            finally:
+                ParallelScanner.MIN_RANGE_SIZE = min_range_size
+
+        self.assertEqual(list(result), FrameScanner.find_frame_offsets(data, 0))
+
+if __name__ == '__main__':
+    unittest.main()
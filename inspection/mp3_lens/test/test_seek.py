@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import mp3_lens
+from mp3_lens.__main__ import Mp3Surgeon
+
+# V1 Layer III 128 kbps 44.1 kHz -> 417 bytes, 1152 samples
+HEADER = bytes.fromhex('FFFB9000')
+FRAME_SIZE = 417
+FRAME_DURATION = 1152 / 44100
+FRAME_COUNT = 200
+
+def make_xing_frame(magic: bytes) -> bytes:
+    toc = bytes(int(percent * 256 / 100) for percent in range(100))
+    tag = magic + (0x07).to_bytes(4, 'big') + FRAME_COUNT.to_bytes(4, 'big') + ((FRAME_COUNT + 1) * FRAME_SIZE).to_bytes(4, 'big') + toc
+    frame = HEADER + bytes(32) + tag
+    return frame + bytes(FRAME_SIZE - len(frame))
+
+class SeekTests(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, 'audio.mp3')
+        frames = [HEADER + bytes([index % 256]) * (FRAME_SIZE - 4) for index in range(FRAME_COUNT)]
+        with open(self.filename, 'wb') as file:
+            file.write(make_xing_frame(b'Xing') + b''.join(frames))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_seek(self):
+        surgeon = Mp3Surgeon(self.filename, use_index=False)
+        self.assertEqual(surgeon.seek(0), FRAME_SIZE)
+        self.assertEqual(surgeon.seek(10.5 * FRAME_DURATION), 11 * FRAME_SIZE)
+        self.assertEqual(surgeon.seek(FRAME_COUNT * FRAME_DURATION + 1), (FRAME_COUNT + 1) * FRAME_SIZE)
+
+    def test_no_frames(self):
+        with open(self.filename, 'wb') as file:
+            file.write(bytes(1000))
+        for streaming in [False, True]:
+            with self.assertRaisesRegex(ValueError, 'No frames found'):
+                Mp3Surgeon(self.filename, use_index=False, streaming=streaming)
+
+    def test_empty_file(self):
+        # empty files can not be mapped, mapping falls back to no data
+        with open(self.filename, 'wb') as file:
+            pass
+        for use_mmap in [False, True]:
+            with self.assertRaisesRegex(ValueError, 'No frames found'):
+                Mp3Surgeon(self.filename, use_index=False, use_mmap=use_mmap)
+
+    def test_seek_streaming(self):
+        surgeon = Mp3Surgeon(self.filename, streaming=True)
+        for frame in [0, 17, 100, 150]:
+            offset = surgeon.seek((frame + 0.5) * FRAME_DURATION)
+            self.assertEqual(offset % FRAME_SIZE, 0)
+            self.assertLessEqual(abs(offset // FRAME_SIZE - (frame + 1)), 1)
+
+    def test_slice(self):
+        surgeon = Mp3Surgeon(self.filename, use_index=False)
+        data = surgeon.slice(2 * FRAME_DURATION, 5 * FRAME_DURATION)
+        self.assertEqual(len(data), 3 * FRAME_SIZE)
+        self.assertEqual(data[4], 2)
+        self.assertEqual(len(surgeon.slice(5, 1)), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import mp3_lens
+from mp3_lens.mp3_format import Mp3Format, MpegVersion, MpegLayer, ChannelMode
+from mp3_lens.vbr_format import VbrFormat
+
+def make_xing_frame(magic: bytes = b'Xing', channel_mode: ChannelMode = ChannelMode.STEREO, toc: bytes = bytes(range(0, 200, 2))) -> bytes:
+    header = Mp3Format.build_header(MpegVersion.V1, MpegLayer.L3, 128000, 44100, channel_mode=channel_mode)
+    side_info = bytes(17 if channel_mode == ChannelMode.MONO else 32)
+
+    tag = magic + (0x0F).to_bytes(4, 'big')
+    tag += (1000).to_bytes(4, 'big') + (417000).to_bytes(4, 'big') + toc + (57).to_bytes(4, 'big')
+
+    # LAME extension, delay 576 and padding 1000 samples
+    lame = b'LAME3.100' + bytes(12) + ((576 << 12) | 1000).to_bytes(3, 'big') + bytes(12)
+
+    frame = header + side_info + tag + lame
+    return frame + bytes(417 - len(frame))
+
+def make_vbri_frame() -> bytes:
+    header = Mp3Format.build_header(MpegVersion.V1, MpegLayer.L3, 128000, 44100)
+    vbri = b'VBRI' + (1).to_bytes(2, 'big') + (1105).to_bytes(2, 'big') + (75).to_bytes(2, 'big')
+    vbri += (41700).to_bytes(4, 'big') + (100).to_bytes(4, 'big')
+    # 4 entries, scale 2, 2 byte entries, 25 frames per entry
+    vbri += (4).to_bytes(2, 'big') + (2).to_bytes(2, 'big') + (2).to_bytes(2, 'big') + (25).to_bytes(2, 'big')
+    vbri += b''.join((size // 2).to_bytes(2, 'big') for size in [10000, 11000, 10000, 10700])
+
+    frame = header + bytes(32) + vbri
+    return frame + bytes(417 - len(frame))
+
+class VbrFormatTests(unittest.TestCase):
+
+    def test_get_xing_header(self):
+        header = VbrFormat.get_xing_header(make_xing_frame())
+        self.assertFalse(header.is_info)
+        self.assertEqual((header.frame_count, header.byte_count, header.quality), (1000, 417000, 57))
+        self.assertEqual(header.toc[50], 100)
+        self.assertEqual(header.encoder, 'LAME3.100')
+        self.assertEqual((header.encoder_delay, header.encoder_padding), (576, 1000))
+
+    def test_get_xing_header_mono(self):
+        frame = make_xing_frame(b'Info', ChannelMode.MONO)
+        self.assertTrue(Mp3Format.is_info_frame(frame))
+        self.assertFalse(Mp3Format.is_xing_frame(frame))
+        self.assertTrue(VbrFormat.get_xing_header(frame).is_info)
+
+    def test_get_xing_header_none(self):
+        self.assertIsNone(VbrFormat.get_xing_header(make_vbri_frame()))
+
+    def test_get_lame_tag(self):
+        self.assertEqual(Mp3Format.get_lame_tag(make_xing_frame()), 'LAME3.100')
+        self.assertEqual(Mp3Format.get_lame_tag(make_vbri_frame()), '')
+
+    def test_get_xing_position(self):
+        header = VbrFormat.get_xing_header(make_xing_frame())
+        self.assertEqual(VbrFormat.get_xing_position(header, 0.5, 256000), 100000)
+        self.assertEqual(VbrFormat.get_xing_position(header, 0.505, 256000), 101000)
+
+    def test_get_vbri_header(self):
+        header = VbrFormat.get_vbri_header(make_vbri_frame())
+        self.assertEqual((header.delay, header.byte_count, header.frame_count), (1105, 41700, 100))
+        self.assertEqual(header.toc, [10000, 11000, 10000, 10700])
+        self.assertEqual(VbrFormat.get_vbri_position(header, 30), 10000 + 11000 // 5)
+
+if __name__ == '__main__':
+    unittest.main()
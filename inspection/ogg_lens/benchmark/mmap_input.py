@@ -0,0 +1,53 @@
+from ogg_lens.__main__ import OggLens, Format
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from test.synthetic import make_stream
+
+# Peak memory and throughput of read and mmap input, each in a fresh process.
+#
+# python3 -m benchmark.mmap_input [FILEPATH]
+
+def get_status_value(name: str) -> int:
+    # VmHWM: peak resident memory in kB
+    # RssAnon: private resident memory in kB, mapped file pages are not counted
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(name + ':'):
+                return int(line.split()[1])
+    return -1
+
+def run(filepath: str, use_mmap: bool) -> (float, int, int):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        lens = OggLens(filepath, Format.OGG_BITSTREAM, use_mmap=use_mmap)
+        lens.print_summary()
+        lens.close()
+    duration = time.perf_counter() - start
+
+    return duration, get_status_value('VmHWM'), get_status_value('RssAnon')
+
+def main():
+    if len(sys.argv) > 1:
+        filepath = sys.argv[1]
+    else:
+        filepath = os.path.join(tempfile.mkdtemp(), 'synthetic.opus')
+        with open(filepath, 'wb') as file:
+            file.write(make_stream(20000))
+
+    size = os.path.getsize(filepath)
+    print('File:', filepath, 'size:', size)
+
+    for use_mmap in [False, True]:
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            duration, peak_rss, rss_anon = executor.submit(run, filepath, use_mmap).result()
+        name = 'mmap:' if use_mmap else 'read:'
+        print('{0:12} {1:8.3f} s, {2:8.1f} MB/s, peak rss {3} kB, anonymous rss {4} kB'.format(name, duration, size / duration / 1e6, peak_rss, rss_anon))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+from ogg_lens.ogg_format import OggFormat
+from ogg_lens.ogg_packets import OggPackets
+import sys
+import time
+from test.synthetic import make_stream
+
+# Packet reassembly on three hours of Opus (20 ms packets).
+#
+# python3 -m benchmark.packets [FILEPATH]
+
+PAGE_COUNT: int = 3 * 3600
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = make_stream(PAGE_COUNT)
+    print('Size:', len(data))
+
+    start = time.perf_counter()
+    headers = OggFormat.get_all_headers(data)
+    packet_count = 0
+    packet_bytes = 0
+    for packet in OggPackets.iter_packets(data, headers):
+        packet_count += 1
+        packet_bytes += len(packet)
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:10.0f} packets/s, {3} packets, {4} bytes'.format('packets:', duration, packet_count / duration, packet_count, packet_bytes))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+from ogg_lens.ogg_format import OggFormat
+import sys
+import time
+from test.synthetic import make_stream
+from test.table_crc import get_table_crc
+
+# Page checksum verification of one hour of Opus against a byte wise table
+# implementation (on the first pages only, it is slow).
+#
+# python3 -m benchmark.page_crc [FILEPATH]
+
+PAGE_COUNT: int = 3600
+TABLE_SIZE: int = 1 << 21 # bytes checked with the table
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = make_stream(PAGE_COUNT)
+    headers = OggFormat.get_all_headers(data)
+    print('Size:', len(data), 'pages:', len(headers))
+
+    start = time.perf_counter()
+    bad_pages = OggFormat.get_bad_crc_pages(data, headers)
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:8.1f} MB/s, bad pages: {3}'.format('verify:', duration, len(data) / duration / 1e6, len(bad_pages)))
+
+    start = time.perf_counter()
+    table_crc = get_table_crc(data[:TABLE_SIZE])
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:8.1f} MB/s, equal: {3}'.format('table:', duration, TABLE_SIZE / duration / 1e6, table_crc == OggFormat.crc32(data[:TABLE_SIZE])))
+
+if __name__ == '__main__':
+    main()
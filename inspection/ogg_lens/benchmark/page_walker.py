@@ -0,0 +1,41 @@
+from ogg_lens.ogg_format import OggFormat
+import sys
+import time
+from test.legacy import get_legacy_headers
+from test.synthetic import make_stream
+
+# Byte wise page walk against the struct based walker on three hours of
+# 64 kbps Opus (one second per page), with and without a damaged region.
+#
+# python3 -m benchmark.page_walker [FILEPATH]
+
+PAGE_COUNT: int = 3 * 3600
+
+def measure(name: str, function, data: bytearray) -> ([int], float):
+    start = time.perf_counter()
+    offsets = [header.offset for header in function(data)]
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:8.1f} MB/s, {3} pages'.format(name, duration, len(data) / duration / 1e6, len(offsets)))
+    return offsets, duration
+
+def compare(data: bytearray):
+    legacy_offsets, legacy_duration = measure('legacy:', get_legacy_headers, data)
+    walker_offsets, walker_duration = measure('walker:', OggFormat.get_all_headers, data)
+    print('Equal:', walker_offsets == legacy_offsets, 'speedup: {0:.1f}x'.format(legacy_duration / walker_duration))
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = make_stream(PAGE_COUNT)
+    print('Size:', len(data))
+    compare(data)
+
+    # sync loss: 1 MB of zeros in the middle
+    middle = len(data) // 2
+    print('Damaged:')
+    compare(data[:middle] + bytes(1 << 20) + data[middle:])
+
+if __name__ == '__main__':
+    main()
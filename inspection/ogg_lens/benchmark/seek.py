@@ -0,0 +1,68 @@
+from ogg_lens.granule_index import GranuleIndex, OggBisection
+from ogg_lens.ogg_format import OggFormat
+import os
+import random
+import sys
+import tempfile
+import time
+from test.synthetic import make_stream
+
+# Seeking in three hours of Opus: bisection over the file (only probed chunks
+# are read) against reading the file and building the granule index.
+#
+# python3 -m benchmark.seek [FILEPATH]
+
+PAGE_COUNT: int = 3 * 3600
+SEEK_COUNT: int = 100
+
+class CountingFile:
+    # file wrapper counting read bytes
+
+    def __init__(self, file):
+        self.file = file
+        self.read_size = 0
+
+    def seek(self, position: int):
+        self.file.seek(position)
+
+    def read(self, size: int) -> bytes:
+        data = self.file.read(size)
+        self.read_size += len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+def main():
+    if len(sys.argv) > 1:
+        filepath = sys.argv[1]
+    else:
+        filepath = os.path.join(tempfile.mkdtemp(), 'synthetic.opus')
+        with open(filepath, 'wb') as file:
+            file.write(make_stream(PAGE_COUNT))
+    print('File:', filepath, 'size:', os.path.getsize(filepath))
+
+    start = time.perf_counter()
+    with open(filepath, 'rb') as file:
+        data = file.read()
+    index = list(GranuleIndex.build(data, OggFormat.get_all_headers(data)).values())[0]
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, duration {2:.1f} s'.format('index:', duration, index.duration()))
+
+    rng = random.Random(0)
+    targets = [rng.uniform(0, index.duration()) for _ in range(SEEK_COUNT)]
+
+    start = time.perf_counter()
+    offsets = [index.seek(seconds) for seconds in targets]
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.1f} us per seek'.format('index seek:', duration / SEEK_COUNT * 1e6))
+
+    with open(filepath, 'rb') as file:
+        counting_file = CountingFile(file)
+        start = time.perf_counter()
+        bisection_offsets = [OggBisection.seek(counting_file, seconds) for seconds in targets]
+        duration = time.perf_counter() - start
+    print('{0:12} {1:8.1f} us per seek, {2:.0f} kB read per seek, equal: {3}'.format('bisection:', duration / SEEK_COUNT * 1e6, counting_file.read_size / SEEK_COUNT / 1000, bisection_offsets == offsets))
+
+if __name__ == '__main__':
+    main()
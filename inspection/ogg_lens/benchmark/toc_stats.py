@@ -0,0 +1,60 @@
+from ogg_lens.ogg_format import OggFormat
+from ogg_lens.ogg_packets import OggPackets
+from ogg_lens.opus_toc import PacketToc, TocStats
+import numpy as np
+import sys
+import time
+from test.synthetic import make_stream
+
+# Toc statistics with one PacketToc per packet against the lookup tables on
+# random toc bytes, and end to end on three hours of Opus (page walk
+# included): packet starts from the lacing values against rebuilt packets.
+#
+# python3 -m benchmark.toc_stats [FILEPATH]
+
+PACKET_COUNT: int = 5000000
+PAGE_COUNT: int = 3 * 3600
+
+def get_object_duration(toc_bytes: np.ndarray) -> float:
+    # frame count codes 0-2 only
+    duration = 0.0
+    for toc_byte in toc_bytes.tolist():
+        toc = PacketToc(toc_byte)
+        duration += toc.duration * (1 if toc.frame_count_code == 0 else 2)
+    return duration / 1000
+
+def main():
+    rng = np.random.default_rng(0)
+    toc_bytes = rng.integers(0, 256, PACKET_COUNT, dtype=np.uint8) & 0xFE # no code 3
+    second_bytes = np.zeros(PACKET_COUNT, dtype=np.uint8)
+
+    start = time.perf_counter()
+    stats = TocStats(toc_bytes, second_bytes)
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:10.0f} packets/s, {3:.1f} s audio'.format('tables:', duration, PACKET_COUNT / duration, stats.duration()))
+
+    count = PACKET_COUNT // 10
+    start = time.perf_counter()
+    object_duration = get_object_duration(toc_bytes[:count])
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:10.0f} packets/s, {3:.1f} s audio (first {4})'.format('objects:', duration, count / duration, object_duration, count))
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as file:
+            data = file.read()
+    else:
+        data = make_stream(PAGE_COUNT)
+    start = time.perf_counter()
+    headers = OggFormat.get_all_headers(data)
+    stats = TocStats.from_pages(data, headers)
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:10.0f} packets/s, {3:.1f} s audio'.format('file:', duration, stats.packet_count / duration, stats.duration()))
+
+    start = time.perf_counter()
+    headers = OggFormat.get_all_headers(data)
+    packet_count = sum(1 for _ in OggPackets.iter_packets(data, headers))
+    duration = time.perf_counter() - start
+    print('{0:12} {1:8.3f} s, {2:10.0f} packets/s'.format('packets:', duration, packet_count / duration))
+
+if __name__ == '__main__':
+    main()
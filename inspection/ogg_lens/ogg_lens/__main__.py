@@ -1,5 +1,9 @@
+from ogg_lens.granule_index import GranuleIndex
 from ogg_lens.ogg_format import OggFormat, PageHeader
+from ogg_lens.ogg_packets import OggPackets
 from ogg_lens.opus_format import OpusFormat, PacketHeader
+from ogg_lens.opus_toc import TocStats
+import mmap
 import os
 from enum import Enum
 import sys
@@ -12,26 +16,53 @@ class Format(Enum):
 
 class OggLens:
 
-    def __init__(self, filename: str, format: Format):
+    def __init__(self, filename: str, format: Format, use_mmap: bool = False, verify_crc: bool = False):
         self.format = format
+        self.verify_crc = verify_crc
+        self.bad_crc_pages: [PageHeader] = []
         self.frame_offsets: [int] = []
+        self.page_headers: [PageHeader] = []
         self.data = None
+        self.mmap = None
         self.codec_header = None
+        self.toc_stats = None
+        self.use_mmap = use_mmap
         self.handle_file(filename)
 
     def handle_file(self, filename: str):
-        # read file
+        # read file or map it, mapped data is paged in by the os on access.
+        # Empty files can not be mapped.
         with open(filename, 'rb') as file:
-            self.data = file.read()
-
-            beginning = self.data[0:8]
-            print('File begins with:', beginning)
-            
-            # find page headers
-            self.headers = self.__get_headers(self.data)
-
-            # print codec
-            self.__get_codec(self.data)
+            if self.use_mmap and os.fstat(file.fileno()).st_size > 0:
+                self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = memoryview(self.mmap)
+            else:
+                self.data = file.read()
+
+        beginning = bytes(self.data[0:8])
+        print('File begins with:', beginning)
+        
+        # find page headers
+        self.headers = self.__get_headers(self.data)
+
+        # print codec
+        self.__get_codec(self.data)
+
+        # toc statistics of all audio packets
+        if self.format == Format.OPUS_PACKET and self.codec_header:
+            self.toc_stats = TocStats.from_pages(self.data, self.page_headers)
+
+    def close(self):
+        # release mapped file, page views must not be used afterwards. While
+        # views are still alive the mapping is closed when they are freed.
+        if self.mmap:
+            try:
+                self.data.release()
+                self.mmap.close()
+            except BufferError:
+                pass
+            self.mmap = None
+            self.data = None
 
     def print_summary(self, log_filename: str = ''):
         log_file = None
@@ -49,24 +80,28 @@ class OggLens:
         if self.codec_header:
             message += 'Codec: ' + self.codec_header.get_codec_name() + '\n'
         
-        message += 'Page headers: ' + str(len(self.headers)) + '\n'
+        message += 'Page headers: ' + str(len(self.page_headers)) + '\n'
+        for serial, granule_index in GranuleIndex.build(self.data, self.page_headers).items():
+            message += 'End of stream {0}: {1:.3f} s (last granule position)\n'.format(serial, granule_index.duration())
+        if self.verify_crc:
+            message += 'Bad crc pages: ' + str(len(self.bad_crc_pages)) + '\n'
         
         # tags
-        second_page_segment_offset = OggFormat.get_first_segment_offset(self.headers[1])
+        second_page_segment_offset = OggFormat.get_first_segment_offset(self.page_headers[1])
         message += 'Second page is OpusTags: ' + str(OpusFormat.is_magic_structure_tags(self.data, second_page_segment_offset)) + '\n'
 
         # check header configs
-        fresh = list(filter(lambda header: header.is_fresh == True, self.headers))
+        fresh = list(filter(lambda header: header.is_fresh == True, self.page_headers))
         message += 'fresh headers: ' + str(len(fresh)) + '\n'
-        bos = list(filter(lambda header: header.is_bos == True, self.headers))
+        bos = list(filter(lambda header: header.is_bos == True, self.page_headers))
         message += 'bos headers: ' + str(len(bos)) + '\n'
-        eos = list(filter(lambda header: header.is_eos == True, self.headers))
+        eos = list(filter(lambda header: header.is_eos == True, self.page_headers))
         message += 'eos headers: ' + str(len(eos)) + '\n'
 
         # check page numbers
         first_missing_page_num = -1
         current_page_num = -1
-        for header in self.headers:
+        for header in self.page_headers:
             if header.page_num != current_page_num + 1:
                 first_missing_page_num = current_page_num + 1
                 break
@@ -75,13 +110,17 @@ class OggLens:
 
         is_page_numbers_increasing = True
         current_page_num = -1
-        for header in self.headers:
+        for header in self.page_headers:
             if header.page_num < current_page_num:
                 is_page_numbers_increasing = False
                 break
             current_page_num = header.page_num
         message += 'Is page number contantely increasing: ' + str(is_page_numbers_increasing) + '\n'
 
+        if self.toc_stats:
+            message += 'Packet toc:\n'
+            message += self.toc_stats.format_string(False)
+
         print(message)
         
         # write to log file
@@ -119,47 +158,55 @@ class OggLens:
             log_file.write(message)
 
     def write_frames(self, path: str, base_filename: str):
-        if self.format == Format.OPUS_PACKET:
-            print('Write frames not implemented for OPUS_PACKET.')
-            return
-
+        # ogg bitstream: one file per page, opus packet: one file per packet
         frames_path = '{0}/frames/'.format(path)
         try:
             os.mkdir(frames_path)
         except Exception as _:
             pass
 
+        if self.format == Format.OPUS_PACKET:
+            frames = (packet.data for packet in OggPackets.iter_packets(self.data, self.page_headers))
+        else:
+            view = memoryview(self.data) # slices without copy
+            frames = (view[header.offset : header.offset + header.page_size] for header in self.page_headers)
+
         index = 0
-        for header in self.headers:
+        for frame in frames:
             filename = '{0}{1}_{2}'.format(frames_path, base_filename, index)
             with open(filename, 'wb') as file:
-                file.write(self.data[header.offset : header.offset + header.page_size])
+                file.write(frame)
+            if isinstance(frame, memoryview):
+                frame.release() # packets spanning pages are bytes
             index += 1
 
     # headers
     
     def __get_headers(self, data: bytearray):
-        bitstream_headers = OggFormat.get_all_headers(data)
-        # for header in bitstream_headers:
-        #     print("Found bitstream header at", header.offset)
+        self.page_headers = OggFormat.get_all_headers(data)
+        if self.verify_crc:
+            self.bad_crc_pages = OggFormat.get_bad_crc_pages(data, self.page_headers)
 
         if self.format == Format.OGG_BITSTREAM:
-            return bitstream_headers
+            return self.page_headers
         elif self.format == Format.OPUS_PACKET:
-            return OpusFormat.get_all_headers(data)
+            return OpusFormat.get_all_headers(data, self.page_headers)
 
     def __get_codec(self, data: bytearray):
-        if not self.headers:
+        if not self.page_headers:
             print("Can't identify codec. No headers.")
+            return
 
-        id_header = self.headers[0]
+        id_header = self.page_headers[0]
         if not id_header.segment_size_table:
             print("Can't identify codec. No segmentes in id header.")
+            return
 
         codec_segment_size = id_header.segment_size_table[0]
+        codec_offset = OggFormat.get_first_segment_offset(id_header)
         if codec_segment_size >= PacketHeader.HEADER_SIZE:
-            if OpusFormat.is_magic_structure(data, PageHeader.HEADER_SIZE):
-                header = OpusFormat.get_header(data, PageHeader.HEADER_SIZE)
+            if OpusFormat.is_magic_structure(data, codec_offset):
+                header = OpusFormat.get_header(data, codec_offset)
                 if header:
                     self.codec_header = header
         
@@ -167,7 +214,7 @@ class OggLens:
 
 def main():
     if len(sys.argv) < 5:
-        print('Please parse folder containing the file, filename, extension and if separate frames should be written to files.\n python3 -m concat FOLDER FILENAME EXTENSION WRITE_FRAMES\n e.g. python3 -m ogg_lens ./files music opus 1')
+        print('Please parse folder containing the file, filename, extension, if separate frames should be written to files and optionally if page checksums should be verified and if the file should be memory mapped.\n python3 -m ogg_lens FOLDER FILENAME EXTENSION WRITE_FRAMES [VERIFY_CRC] [USE_MMAP]\n e.g. python3 -m ogg_lens ./files music opus 1 1 1')
         sys.exit()
 
     args = sys.argv
@@ -175,6 +222,8 @@ def main():
     filename = args[2]
     extension = args[3]
     write_frames = int(args[4])
+    verify_crc = len(args) > 5 and int(args[5]) == 1
+    use_mmap = len(args) > 6 and int(args[6]) == 1
 
     # discard extension -> mp3 will be set
     filename = os.path.splitext(filename)[0]
@@ -182,15 +231,17 @@ def main():
     filepath = '{0}/{1}.{2}'.format(folder, filename, extension)
     log_filepath = '{0}/{1}_log'.format(folder, filename)
 
-    format = Format.OGG_BITSTREAM
+    # 1: ogg pages, 2: opus packets
+    format = Format.OPUS_PACKET if write_frames == 2 else Format.OGG_BITSTREAM
 
-    lens = OggLens(filepath, format)
+    lens = OggLens(filepath, format, use_mmap, verify_crc)
     lens.print_headers(log_filepath)
 
     lens.print_summary(log_filepath)
 
-    if write_frames == 1:
+    if write_frames > 0:
         lens.write_frames(folder, filename)
+    lens.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
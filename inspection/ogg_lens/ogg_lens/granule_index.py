@@ -0,0 +1,254 @@
+import numpy as np
+import os
+import sys
+from typing import Optional
+from ogg_lens.ogg_format import OggFormat, PageHeader
+from ogg_lens.opus_format import OpusFormat
+
+class GranuleIndex:
+    # Granule position and byte offset of all pages of one logical stream
+    # that end a packet (granule position != -1). Opus granules count 48 kHz
+    # samples including pre-skip.
+    #
+    # seek returns the offset of the page to start decoding at: the first page
+    # ending behind the target minus pre-roll. Packets on it started behind the
+    # granule of the page before.
+
+    GRANULE_RATE: int = 48000
+    PRE_ROLL: int = 3840 # 80 ms for decoder convergence, rfc 7845 section 4.6
+
+    def __init__(self, serial: int, granules: np.ndarray, offsets: np.ndarray, pre_skip: int = 0):
+        self.serial = serial
+        self.granules = granules
+        self.offsets = offsets
+        self.pre_skip = pre_skip
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @staticmethod
+    def build(data: bytearray, page_headers: [PageHeader]) -> {int: 'GranuleIndex'}:
+        # one index per logical stream
+        pre_skips = {}
+        for header in OpusFormat.get_all_headers(data, page_headers):
+            page = next(page for page in page_headers if OggFormat.get_first_segment_offset(page) == header.offset)
+            pre_skips[page.stream_serial] = header.pre_skip
+
+        pages = {}
+        for header in page_headers:
+            if header.absolute_pos != -1:
+                pages.setdefault(header.stream_serial, []).append((header.absolute_pos, header.offset))
+
+        indices = {}
+        for serial, entries in pages.items():
+            granules, offsets = zip(*entries)
+            indices[serial] = GranuleIndex(serial, np.array(granules, dtype=np.int64), np.array(offsets, dtype=np.int64), pre_skips.get(serial, 0))
+        return indices
+
+    def get_granule(self, seconds: float) -> int:
+        return int(round(seconds * GranuleIndex.GRANULE_RATE)) + self.pre_skip
+
+    def duration(self) -> float:
+        # seconds
+        if len(self.granules) == 0:
+            return 0.0
+        return max(int(self.granules[-1]) - self.pre_skip, 0) / GranuleIndex.GRANULE_RATE
+
+    def seek(self, seconds: float) -> int:
+        # page offset, -1 if behind the end
+        target = max(self.get_granule(seconds) - GranuleIndex.PRE_ROLL, 0)
+        index = int(np.searchsorted(self.granules, target, side='right'))
+        if index >= len(self.offsets):
+            return -1
+        return int(self.offsets[index])
+
+class OggBisection:
+    # Seeking in files without index: bisection over byte positions, only the
+    # probed chunks are read. A probe takes the first page behind its position
+    # with valid checksum, matching serial and a granule position. The last
+    # PROBE_SIZE bytes are walked page by page.
+
+    MAX_PAGE_SIZE: int = 27 + 255 + 255 * 255
+    PROBE_SIZE: int = 2 * MAX_PAGE_SIZE # holds at least one complete page
+
+    @staticmethod
+    def seek(file, seconds: float) -> int:
+        # page offset to start decoding at, -1 if behind the end
+        serial, pre_skip = OggBisection.get_stream_info(file)
+        target = max(int(round(seconds * GranuleIndex.GRANULE_RATE)) + pre_skip - GranuleIndex.PRE_ROLL, 0)
+        page = OggBisection.find_page(file, target, serial)
+        return page.offset if page else -1
+
+    @staticmethod
+    def get_stream_info(file) -> (int, int):
+        # serial and pre-skip of the first opus stream, -1 and 0 if there is none
+        chunk = OggBisection.__read(file, 0, OggBisection.PROBE_SIZE)
+        page_headers = OggFormat.get_all_headers(chunk)
+        for header in OpusFormat.get_all_headers(chunk, page_headers):
+            page = next(page for page in page_headers if OggFormat.get_first_segment_offset(page) == header.offset)
+            return page.stream_serial, header.pre_skip
+        return -1, 0
+
+    @staticmethod
+    def find_page(file, target: int, serial: int = -1) -> Optional[PageHeader]:
+        # first page with granule position above target
+        low = 0 # page boundary, all pages before end at or before target
+        high = OggBisection.__get_size(file)
+        best = None # page above target, the result if nothing before it is
+        while high - low > OggBisection.PROBE_SIZE:
+            middle = (low + high) // 2
+            page = OggBisection.__probe(file, middle, high, serial)
+            if not page:
+                high = middle # no usable page between middle and high
+            elif page.absolute_pos <= target:
+                low = page.offset + page.page_size
+            else:
+                best = page
+                high = middle
+        return OggBisection.__scan(file, low, target, serial, best)
+
+    @staticmethod
+    def cut(input_filename: str, output_filename: str, start: float, end: float = -1) -> int:
+        # clip of whole pages around start and end (seconds, -1 for end of
+        # file) behind the header pages, only pages of the opus stream. The
+        # clip starts with a page beginning a packet, copied pages are
+        # numbered on from the header pages and the last one ends the stream.
+        # Granule positions are kept. Returns the number of written bytes.
+        with open(input_filename, 'rb') as file:
+            size = OggBisection.__get_size(file)
+            serial, pre_skip = OggBisection.get_stream_info(file)
+
+            first_audio_page = OggBisection.find_page(file, 0, serial)
+            if not first_audio_page:
+                raise ValueError('No audio pages')
+            header_end = first_audio_page.offset
+
+            start_target = max(int(round(start * GranuleIndex.GRANULE_RATE)) + pre_skip - GranuleIndex.PRE_ROLL, 0)
+            start_page = OggBisection.find_page(file, start_target, serial)
+            if not start_page:
+                raise ValueError('Start behind end of file')
+            start_offset = max(start_page.offset, header_end)
+
+            end_offset = size
+            if end >= 0:
+                end_page = OggBisection.find_page(file, int(round(end * GranuleIndex.GRANULE_RATE)) + pre_skip - 1, serial)
+                if end_page:
+                    end_offset = end_page.offset + end_page.page_size
+
+            written = 0
+            with open(output_filename, 'wb') as output:
+                page_num = 0
+                for _, page in OggBisection.__iter_pages(file, 0, header_end, serial):
+                    output.write(page)
+                    written += len(page)
+                    page_num += 1
+
+                # one page behind, the last one gets the eos flag
+                previous = None
+                for header, page in OggBisection.__iter_pages(file, start_offset, end_offset, serial):
+                    if previous is None and header.is_fresh:
+                        continue # starts with the rest of a packet
+                    if previous:
+                        written += OggBisection.__write_page(output, previous, page_num, False)
+                        page_num += 1
+                    previous = page
+                if previous:
+                    written += OggBisection.__write_page(output, previous, page_num, True)
+        return written
+
+    @staticmethod
+    def __write_page(output, page: bytes, page_num: int, is_eos: bool) -> int:
+        # page with new page number and eos flag, checksum recomputed
+        page = bytearray(page)
+        page[5] = (page[5] | 0x04) if is_eos else (page[5] & ~0x04)
+        page[18:22] = page_num.to_bytes(4, 'little')
+        page[OggFormat.CHECKSUM_OFFSET : OggFormat.CHECKSUM_OFFSET + OggFormat.CHECKSUM_SIZE] = bytes(OggFormat.CHECKSUM_SIZE)
+        page[OggFormat.CHECKSUM_OFFSET : OggFormat.CHECKSUM_OFFSET + OggFormat.CHECKSUM_SIZE] = OggFormat.crc32(page).to_bytes(OggFormat.CHECKSUM_SIZE, 'little')
+        output.write(page)
+        return len(page)
+
+    @staticmethod
+    def __probe(file, position: int, end: int, serial: int) -> Optional[PageHeader]:
+        # first usable page starting between position and end, damaged regions
+        # and pages of other streams are stepped over chunk by chunk
+        while position < end:
+            chunk = OggBisection.__read(file, position, OggBisection.PROBE_SIZE)
+            for header in OggFormat.get_all_headers(chunk):
+                if position + header.offset >= end:
+                    return None
+                if OggBisection.__is_usable(chunk, header, serial):
+                    header.offset += position
+                    return header
+            if len(chunk) < OggBisection.PROBE_SIZE:
+                break
+            # pages starting before are complete in the chunk
+            position += OggBisection.PROBE_SIZE - OggBisection.MAX_PAGE_SIZE
+        return None
+
+    @staticmethod
+    def __scan(file, position: int, target: int, serial: int, best: Optional[PageHeader]) -> Optional[PageHeader]:
+        # page walk from a page boundary up to the best page found so far
+        end = best.offset if best else OggBisection.__get_size(file)
+        for header, _ in OggBisection.__iter_pages(file, position, end, serial):
+            if header.absolute_pos > target:
+                return header
+        return best
+
+    @staticmethod
+    def __iter_pages(file, position: int, end: int, serial: int):
+        # complete pages with valid checksum starting between position and end
+        # and page bytes, of one stream (serial -1 for all)
+        while position < end:
+            chunk = OggBisection.__read(file, position, OggBisection.PROBE_SIZE)
+            if not chunk:
+                break
+
+            next_position = position
+            for header in OggFormat.get_all_headers(chunk):
+                if position + header.offset >= end:
+                    return
+                if not OggFormat.is_crc_valid(chunk, header):
+                    continue
+                page = chunk[header.offset : header.offset + header.page_size]
+                next_position = position + header.offset + header.page_size
+                if serial < 0 or header.stream_serial == serial:
+                    header.offset += position
+                    yield header, page
+
+            if next_position == position:
+                # no complete page in chunk, continue behind it
+                if len(chunk) < OggBisection.PROBE_SIZE:
+                    break
+                next_position = position + OggBisection.PROBE_SIZE - OggBisection.MAX_PAGE_SIZE
+            position = next_position
+
+    @staticmethod
+    def __is_usable(chunk: bytes, header: PageHeader, serial: int) -> bool:
+        if header.absolute_pos == -1 or (serial >= 0 and header.stream_serial != serial):
+            return False
+        return OggFormat.is_crc_valid(chunk, header)
+
+    @staticmethod
+    def __read(file, position: int, size: int) -> bytes:
+        file.seek(position)
+        return file.read(size)
+
+    @staticmethod
+    def __get_size(file) -> int:
+        return os.fstat(file.fileno()).st_size
+
+# Main
+
+def main():
+    if len(sys.argv) < 4:
+        print('Please parse input file, output file, start and optionally end of the clip in seconds.\n python3 -m ogg_lens.granule_index INPUT OUTPUT START [END]\n e.g. python3 -m ogg_lens.granule_index ./files/recording.opus ./files/clip.opus 3600 3660')
+        sys.exit()
+
+    args = sys.argv
+    start = float(args[3])
+    end = float(args[4]) if len(args) > 4 else -1
+    size = OggBisection.cut(args[1], args[2], start, end)
+    print('Written:', size, 'bytes')
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 from enum import Enum
 from numpy import int64
 import numpy as np
+import struct
+import zlib
 from typing import Optional
 
 class PageHeader:
@@ -60,20 +62,72 @@ class OggFormat:
     # 8 bit segments in page (0-255)
     # X bit segment table (n = page_segments)
 
+    PAGE_HEADER = struct.Struct('<4sBBqIIIB') # fixed 27 bytes before the segment table
+    SYNC_WORD: bytes = b'OggS'
+    SEARCH_CHUNK_SIZE: int = 1 << 16
+    CHECKSUM_OFFSET: int = 22
+    CHECKSUM_SIZE: int = 4
+    # byte with reversed bit order, for each byte value
+    BIT_REVERSAL: bytes = bytes(int('{0:08b}'.format(value)[::-1], 2) for value in range(256))
+
     @staticmethod
-    def get_all_headers(data: bytearray):
+    def get_all_headers(data: bytearray) -> [PageHeader]:
+        # page walk: one unpack per header, the segment table as one slice and
+        # a jump over the page body. Only searched for the sync word again
+        # after a sync loss.
         headers = []
-        offset = 0
-        while offset < len(data) - PageHeader.HEADER_SIZE:
-            if OggFormat.is_magic_structure(data, offset):
-                header = OggFormat.get_header(data, offset)
-                if header:
-                    headers.append(header)
-                offset += header.page_size - 1
+        data_size = len(data)
+        header_size = OggFormat.PAGE_HEADER.size
+        offset = OggFormat.__find_sync(data, 0)
+        while 0 <= offset and offset + header_size <= data_size:
+            header = OggFormat.__get_page_header(data, offset)
+            if not header:
+                offset = OggFormat.__find_sync(data, offset + 1)
                 continue
-            offset += 1
+            headers.append(header)
+            offset += header.page_size
+            if offset + 4 <= data_size and data[offset : offset + 4] != OggFormat.SYNC_WORD:
+                offset = OggFormat.__find_sync(data, offset + 1)
         return headers
 
+    @staticmethod
+    def __get_page_header(data: bytearray, offset: int) -> Optional[PageHeader]:
+        magic, version, flags, absolute_pos, serial, page_num, checksum, segments = OggFormat.PAGE_HEADER.unpack_from(data, offset)
+        table_offset = offset + OggFormat.PAGE_HEADER.size
+        if magic != OggFormat.SYNC_WORD or version != 0 or table_offset + segments > len(data):
+            return None
+
+        table = data[table_offset : table_offset + segments]
+        header = PageHeader()
+        header.offset = offset
+        header.is_fresh = (flags & 0x01) == 0x01
+        header.is_bos = (flags & 0x02) == 0x02
+        header.is_eos = (flags & 0x04) == 0x04
+        header.absolute_pos = absolute_pos
+        header.stream_serial = serial
+        header.page_num = page_num
+        header.checksum = checksum.to_bytes(4, 'little')
+        header.segments = segments
+        header.segment_size_table = list(table)
+        header.page_size = table_offset - offset + segments + sum(table)
+        return header
+
+    @staticmethod
+    def __find_sync(data: bytearray, offset: int) -> int:
+        # next sync word at or behind offset, -1 if there is none. Memory views
+        # (mapped files) have no find, they are searched in overlapping chunks.
+        if not isinstance(data, memoryview):
+            return data.find(OggFormat.SYNC_WORD, offset)
+
+        overlap = len(OggFormat.SYNC_WORD) - 1
+        while offset < len(data):
+            chunk = bytes(data[offset : offset + OggFormat.SEARCH_CHUNK_SIZE])
+            index = chunk.find(OggFormat.SYNC_WORD)
+            if index >= 0:
+                return offset + index
+            offset += OggFormat.SEARCH_CHUNK_SIZE - overlap
+        return -1
+
     @staticmethod
     def get_page_size(header: PageHeader) -> int:
         page_size = PageHeader.HEADER_SIZE - 1 + len(header.segment_size_table)
@@ -93,7 +147,7 @@ class OggFormat:
         header.is_fresh = OggFormat.get_is_fresh(data, offset)
         header.is_bos = OggFormat.get_is_bos(data, offset)
         header.is_eos = OggFormat.get_is_eos(data, offset)
-        header.is_pos = OggFormat.get_absolute_position(data, offset)
+        header.absolute_pos = OggFormat.get_absolute_position(data, offset)
         header.stream_serial = OggFormat.get_serial(data, offset)
         header.page_num = OggFormat.get_page_num(data, offset)
         header.checksum = OggFormat.get_checksum(data, offset)
@@ -123,8 +177,10 @@ class OggFormat:
         return (fresh & 0x04) == 0x04
     
     @staticmethod
-    def get_absolute_position(data: bytearray, offset: int = 0) -> int64:
-        return np.frombuffer(data, int64, count=8, offset=offset+6)
+    def get_absolute_position(data: bytearray, offset: int = 0) -> int:
+        # an array on the data would keep a mapped file alive
+        data_offset = offset + 6
+        return int.from_bytes(data[data_offset:data_offset+8], byteorder='little', signed=True)
     
     @staticmethod
     def get_serial(data: bytearray, offset: int = 0) -> int:
@@ -139,7 +195,7 @@ class OggFormat:
     @staticmethod
     def get_checksum(data: bytearray, offset: int = 0) -> bytearray:
         data_offset = offset + 22
-        return data[data_offset:data_offset+4]
+        return bytes(data[data_offset:data_offset+4])
 
     @staticmethod
     def get_segments(data: bytearray, offset: int = 0) -> int:
@@ -157,4 +213,40 @@ class OggFormat:
 
     @staticmethod
     def get_first_segment_offset(header: PageHeader):
-        return header.offset + PageHeader.HEADER_SIZE
\ No newline at end of file
+        # behind header and segment table
+        return header.offset + OggFormat.PAGE_HEADER.size + header.segments
+
+    # checksum
+
+    @staticmethod
+    def crc32(data: bytearray, crc: int = 0) -> int:
+        # Ogg crc: polynomial 0x04C11DB7, initial value 0, no reflection, no
+        # final xor. zlib implements the reflected crc-32 in C, with bit
+        # reversed input bytes (and result) it is the same polynomial.
+        # Zlib's register is the complement of the value passed and returned.
+        register = OggFormat.__reverse_bits(crc) ^ 0xFFFFFFFF
+        register = zlib.crc32(bytes(data).translate(OggFormat.BIT_REVERSAL), register)
+        return OggFormat.__reverse_bits(register ^ 0xFFFFFFFF)
+
+    @staticmethod
+    def get_page_crc(data: bytearray, header: PageHeader) -> int:
+        # crc of the whole page with zeroed checksum field
+        checksum_offset = header.offset + OggFormat.CHECKSUM_OFFSET
+        crc = OggFormat.crc32(data[header.offset : checksum_offset])
+        crc = OggFormat.crc32(bytes(OggFormat.CHECKSUM_SIZE), crc)
+        return OggFormat.crc32(data[checksum_offset + OggFormat.CHECKSUM_SIZE : header.offset + header.page_size], crc)
+
+    @staticmethod
+    def is_crc_valid(data: bytearray, header: PageHeader) -> bool:
+        if header.offset + header.page_size > len(data):
+            return False # truncated page
+        return OggFormat.get_page_crc(data, header) == int.from_bytes(header.checksum, 'little')
+
+    @staticmethod
+    def get_bad_crc_pages(data: bytearray, headers: [PageHeader]) -> [PageHeader]:
+        return [header for header in headers if not OggFormat.is_crc_valid(data, header)]
+
+    @staticmethod
+    def __reverse_bits(value: int) -> int:
+        # 32 bit value with reversed bit order
+        return int.from_bytes(value.to_bytes(4, 'little').translate(OggFormat.BIT_REVERSAL), 'big')
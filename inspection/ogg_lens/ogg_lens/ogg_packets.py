@@ -0,0 +1,117 @@
+import numpy as np
+from typing import Iterator
+from ogg_lens.ogg_format import OggFormat, PageHeader
+
+class OggPacket:
+
+    def __init__(self, data: memoryview, offset: int, serial: int, page_index: int, granule: int = -1):
+        self.data = data # view into the file, bytes if the packet spans pages
+        self.offset = offset # of first byte in file
+        self.serial = serial
+        self.page_index = page_index # page the packet ends on
+        self.granule = granule # of the page if the packet is the last one ending on it, else -1
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+class OggPackets:
+    # Rebuilds the logical packets of all (or one) logical streams from the
+    # lacing values of the pages: a packet ends with the first lacing value
+    # below 255, a page ending with 255 continues the packet on the next page
+    # of the same stream (flag 0x01, is_fresh).
+    #
+    # Packets within one page are memoryview slices of the data, only packets
+    # spanning pages are joined to bytes. Parts of packets whose beginning or
+    # continuation is missing (sync loss, lost page, start of capture) are
+    # dropped.
+
+    @staticmethod
+    def iter_packets(data: bytearray, headers: [PageHeader], serial: int = -1) -> Iterator[OggPacket]:
+        # serial: only packets of this logical stream, -1 for all
+        view = data if isinstance(data, memoryview) else memoryview(data)
+        pending = {} # serial -> (parts, offset, page_num) of unfinished packet
+        for page_index, header in enumerate(headers):
+            if serial >= 0 and header.stream_serial != serial:
+                continue
+            if header.offset + header.page_size > len(view):
+                continue # truncated
+
+            parts = pending.pop(header.stream_serial, None)
+            if parts and (not header.is_fresh or header.page_num != (parts[2] + 1) & 0xFFFFFFFF):
+                parts = None # continuation lost
+            skip = header.is_fresh and parts is None # rest of an unknown packet
+
+            table = header.segment_size_table
+            last_index = OggPackets.__get_last_packet_index(table)
+            position = header.offset + OggFormat.PAGE_HEADER.size + header.segments
+            start = position
+            for index, lacing in enumerate(table):
+                position += lacing
+                if lacing == 255:
+                    continue
+
+                if skip:
+                    skip = False
+                elif parts is None:
+                    yield OggPacket(view[start : position], start, header.stream_serial, page_index, header.absolute_pos if index == last_index else -1)
+                else:
+                    parts[0].append(view[start : position])
+                    yield OggPacket(b''.join(parts[0]), parts[1], header.stream_serial, page_index, header.absolute_pos if index == last_index else -1)
+                    parts = None
+                start = position
+
+            # packet continues on next page
+            if table and table[-1] == 255 and not skip:
+                if parts is None:
+                    parts = ([], start, header.page_num)
+                parts[0].append(view[start : position])
+                pending[header.stream_serial] = (parts[0], parts[1], header.page_num)
+
+    @staticmethod
+    def get_packets(data: bytearray, headers: [PageHeader], serial: int = -1) -> [OggPacket]:
+        return list(OggPackets.iter_packets(data, headers, serial))
+
+    @staticmethod
+    def get_packet_starts(data: bytearray, headers: [PageHeader]) -> (np.ndarray, np.ndarray, np.ndarray):
+        # offset, first lacing value and serial of all packets starting on the
+        # pages, in page order, without building packets. A segment starts a
+        # packet if the segment before on its page ended one, the first
+        # segment of a page if the page does not continue a packet. Packets
+        # are not checked for completeness.
+        headers = [header for header in headers if header.offset + header.page_size <= len(data)]
+        if not headers:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+
+        counts = np.array([header.segments for header in headers], dtype=np.int64)
+        table_starts = np.array([header.offset for header in headers], dtype=np.int64) + OggFormat.PAGE_HEADER.size
+        is_continued = np.array([header.is_fresh for header in headers], dtype=bool)
+        serials = np.array([header.stream_serial for header in headers], dtype=np.int64)
+
+        # lacing values of all pages gathered at once
+        first_segments = np.cumsum(counts) - counts
+        page_indices = np.repeat(np.arange(len(headers)), counts)
+        segment_indices = np.arange(len(page_indices)) - first_segments[page_indices]
+        view = np.frombuffer(data, dtype=np.uint8)
+        lacing = view[table_starts[page_indices] + segment_indices].astype(np.int64)
+
+        # segment offsets: page data start plus lacing values before on the page
+        ends = np.cumsum(lacing)
+        page_bases = (ends - lacing)[first_segments[counts > 0]]
+        bases = np.zeros(len(headers), dtype=np.int64)
+        bases[counts > 0] = page_bases
+        offsets = (table_starts + counts)[page_indices] + (ends - lacing) - bases[page_indices]
+
+        is_start = np.empty(len(lacing), dtype=bool)
+        is_start[1:] = lacing[:-1] < 255
+        is_first = segment_indices == 0
+        is_start[is_first] = ~is_continued[page_indices[is_first]]
+        return offsets[is_start], lacing[is_start], serials[page_indices[is_start]]
+
+    @staticmethod
+    def __get_last_packet_index(table: [int]) -> int:
+        # index of last lacing value ending a packet, -1 if none
+        for index in range(len(table) - 1, -1, -1):
+            if table[index] < 255:
+                return index
+        return -1
@@ -1,5 +1,6 @@
 from enum import Enum
 from typing import Optional
+from ogg_lens.ogg_format import OggFormat, PageHeader
 from ogg_lens.opus_toc import PacketToc
 
 class PacketHeader:
@@ -19,7 +20,6 @@ class PacketHeader:
     gain: int = 0
     pre_skip: int = 0
     mapping_family: int = 0
-    toc: PacketToc
     offset: int = 0 # offset in file
 
     def print_me(self):
@@ -62,18 +62,22 @@ class OpusFormat:
     # X bit optional channel mapping table
 
     @staticmethod
-    def get_all_headers(data: bytearray):
-        
+    def get_all_headers(data: bytearray, page_headers: Optional[list] = None) -> [PacketHeader]:
+        # id header of each opus stream: first packet of its bos page
+        if page_headers is None:
+            page_headers = OggFormat.get_all_headers(data)
+
         headers = []
-        offset = 0
-        while offset < len(data) - PacketHeader.HEADER_SIZE:
+        for page_header in page_headers:
+            if not page_header.is_bos or not page_header.segment_size_table:
+                continue
+            if page_header.segment_size_table[0] < PacketHeader.HEADER_SIZE:
+                continue
+            offset = OggFormat.get_first_segment_offset(page_header)
             if OpusFormat.is_magic_structure(data, offset):
                 header = OpusFormat.get_header(data, offset)
                 if header:
                     headers.append(header)
-                offset += PacketHeader.HEADER_SIZE
-                continue
-            offset += 1
         return headers
 
     @staticmethod
@@ -89,13 +93,15 @@ class OpusFormat:
         header.sample_rate = OpusFormat.get_sample_rate(data, offset)
         header.gain = OpusFormat.get_gain(data, offset)
         header.mapping_family = OpusFormat.get_mapping_family(data, offset)
-        header.toc = PacketToc(data[offset])
         
         return header
 
     @staticmethod
     def get_packet_toc(data: bytearray, offset: int = 0) -> Optional[PacketToc]:
-        mode_mask = data[offset] >> 3
+        # offset = audio packet offset
+        if offset >= len(data):
+            return None
+        return PacketToc(data[offset])
 
     @staticmethod
     def is_magic_structure(data: bytearray, offset: int = 0) -> bool:
@@ -1,4 +1,7 @@
 from enum import Enum
+import numpy as np
+from ogg_lens.ogg_format import PageHeader
+from ogg_lens.ogg_packets import OggPackets
 
 # Toc
 
@@ -18,24 +21,28 @@ class PacketToc:
     # https://tools.ietf.org/html/rfc6716#section-3.1
     # 5 bit config
     # 1 bit stereo flag
-    # 2 bit channel count
+    # 2 bit frame count code: 0 (1 frame), 1, 2 (2 frames), 3 (arbitrary, in next byte)
+    config: int
     mode: CodecMode
     bandwidth: Bandwidth
-    duration: float # [ms]
+    duration: float # of one frame [ms]
     channels: int
     is_stereo: bool
+    frame_count_code: int
 
     def __init__(self, toc_byte: int):
-        self.set_channels(toc_byte)
+        self.config = toc_byte >> 3
+        self.frame_count_code = toc_byte & 0x03
         self.set_is_stereo(toc_byte)
+        self.set_channels(toc_byte)
         self.set_mode(toc_byte)
         self.set_duration_and_bandwidth(toc_byte)
 
     def set_channels(self, toc_byte: int):
-        self.channels = toc_byte & 0xFC
+        self.channels = 2 if self.is_stereo else 1
 
     def set_is_stereo(self, toc_byte: int):
-        self.is_stereo = (toc_byte >> 1) & 0xFE
+        self.is_stereo = (toc_byte >> 2) & 0x01 == 0x01
 
     # mode specific
 
@@ -49,68 +56,52 @@ class PacketToc:
             self.mode = CodecMode.CELT
 
     def set_duration_and_bandwidth(self, toc_byte: int):
+        config = toc_byte >> 3
         if self.mode == CodecMode.SILK:
-            self.set_duration_silk(toc_byte)
-            self.set_bandwidth_silk(toc_byte)
+            self.set_duration_silk(config)
+            self.set_bandwidth_silk(config)
         elif self.mode == CodecMode.HYBRID:
-            self.set_duration_hybrid(toc_byte)
-            self.set_bandwidth_hybrid(toc_byte)
+            self.set_duration_hybrid(config)
+            self.set_bandwidth_hybrid(config)
         else:
-            self.set_duration_celt(toc_byte)
-            self.set_bandwidth_celt(toc_byte)
-
-    # silk
-
-    def set_duration_silk(self, toc_byte: int):
-        if toc_byte % 4 == 0:
-            self.duration = 10
-        elif toc_byte == 1 or toc_byte == 5 or toc_byte == 9:
-            self.duration = 20
-        elif toc_byte % 2 == 0:
-            self.duration = 40
-        else:
-            self.duration = 60
+            self.set_duration_celt(config)
+            self.set_bandwidth_celt(config)
+
+    # silk: config 0-11
 
-    def set_bandwidth_silk(self, toc_byte: int):
-        if toc_byte < 4:
+    def set_duration_silk(self, config: int):
+        self.duration = [10, 20, 40, 60][config % 4]
+
+    def set_bandwidth_silk(self, config: int):
+        if config < 4:
             self.bandwidth = Bandwidth.NARROW_BAND
-        elif toc_byte < 8:
+        elif config < 8:
             self.bandwidth = Bandwidth.MID_BAND
         else:
             self.bandwidth = Bandwidth.WIDE_BAND
 
-    # hybrid
+    # hybrid: config 12-15
 
-    def set_duration_hybrid(self, toc_byte: int):
-        if toc_byte == 12 or toc_byte == 14:
-            self.duration = 10
-        else:
-            self.duration = 20
+    def set_duration_hybrid(self, config: int):
+        self.duration = [10, 20][config % 2]
 
-    def set_bandwidth_hybrid(self, toc_byte: int):
-        if toc_byte < 14:
+    def set_bandwidth_hybrid(self, config: int):
+        if config < 14:
             self.bandwidth = Bandwidth.SUPER_WIDE_BAND
         else:
             self.bandwidth = Bandwidth.FULL_BAND
 
-    # celt
+    # celt: config 16-31
 
-    def set_duration_celt(self, toc_byte: int):
-        if toc_byte % 4 == 0:
-            self.duration = 2.5
-        elif toc_byte == 21 or toc_byte == 25 or toc_byte == 29:
-            self.duration = 5
-        elif toc_byte % 2 == 0:
-            self.duration = 10
-        else:
-            self.duration = 20
+    def set_duration_celt(self, config: int):
+        self.duration = [2.5, 5, 10, 20][config % 4]
 
-    def set_bandwidth_celt(self, toc_byte: int):
-        if toc_byte < 20:
+    def set_bandwidth_celt(self, config: int):
+        if config < 20:
             self.bandwidth = Bandwidth.NARROW_BAND
-        elif toc_byte < 24:
+        elif config < 24:
             self.bandwidth = Bandwidth.WIDE_BAND
-        elif toc_byte < 28:
+        elif config < 28:
             self.bandwidth = Bandwidth.SUPER_WIDE_BAND
         else:
             self.bandwidth = Bandwidth.FULL_BAND
@@ -127,9 +118,92 @@ class PacketToc:
         if not is_printing:
             string += '----------\n'
         
+        string += 'config:      {0}\n'.format(self.config)
         string += 'mode:        {0}\n'.format(self.mode)
         string += 'band:        {0}\n'.format(self.bandwidth)
         string += 'duration:    {0}\n'.format(self.duration)
         string += 'channels:    {0}\n'.format(self.channels)
         string += 'stereo:      {0}\n'.format(self.is_stereo)
-        return string
\ No newline at end of file
+        string += 'frame code:  {0}\n'.format(self.frame_count_code)
+        return string
+
+# Statistics
+
+class TocStats:
+    # Mode, bandwidth and packet duration histograms of all audio packets.
+    # Toc bytes are decoded with lookup tables over all 256 values (built from
+    # PacketToc), all packets at once.
+
+    SAMPLE_RATE: int = 48000
+    HEADER_PACKET_COUNT: int = 2 # OpusHead, OpusTags
+    MAX_FRAME_COUNT_MASK: int = 0x3F # code 3: frame count in second byte
+
+    MODES = np.array([PacketToc(toc_byte).mode.value for toc_byte in range(256)], dtype=np.uint8)
+    BANDWIDTHS = np.array([PacketToc(toc_byte).bandwidth.value for toc_byte in range(256)], dtype=np.uint8)
+    FRAME_SAMPLES = np.array([PacketToc(toc_byte).duration * 48 for toc_byte in range(256)], dtype=np.uint32) # at 48 kHz
+    FRAME_COUNTS = np.array([1, 2, 2, 0], dtype=np.uint32)[np.arange(256) & 0x03] # code 3: from second byte
+
+    def __init__(self, toc_bytes: np.ndarray, second_bytes: np.ndarray):
+        # second_bytes: second byte of each packet, used for frame count code 3
+        toc_bytes = np.asarray(toc_bytes, dtype=np.uint8)
+        second_bytes = np.asarray(second_bytes, dtype=np.uint8)
+
+        frame_counts = TocStats.FRAME_COUNTS[toc_bytes]
+        arbitrary = (toc_bytes & 0x03) == 3
+        frame_counts[arbitrary] = second_bytes[arbitrary] & TocStats.MAX_FRAME_COUNT_MASK
+        packet_samples = frame_counts * TocStats.FRAME_SAMPLES[toc_bytes]
+
+        self.packet_count = len(toc_bytes)
+        self.stereo_count = int(np.count_nonzero(toc_bytes & 0x04))
+        self.samples = int(np.sum(packet_samples, dtype=np.uint64))
+        mode_counts = np.bincount(TocStats.MODES[toc_bytes], minlength=len(CodecMode))
+        self.mode_counts = {mode: int(mode_counts[mode.value]) for mode in CodecMode}
+        bandwidth_counts = np.bincount(TocStats.BANDWIDTHS[toc_bytes], minlength=len(Bandwidth))
+        self.bandwidth_counts = {bandwidth: int(bandwidth_counts[bandwidth.value]) for bandwidth in Bandwidth}
+        durations, duration_counts = np.unique(packet_samples, return_counts=True)
+        self.duration_counts = {float(samples) * 1000 / TocStats.SAMPLE_RATE: int(count) for samples, count in zip(durations, duration_counts)} # packet duration [ms]
+
+    def duration(self) -> float:
+        # decoded audio [s]
+        return self.samples / TocStats.SAMPLE_RATE
+
+    @staticmethod
+    def from_pages(data: bytearray, page_headers: [PageHeader]) -> 'TocStats':
+        # audio packets: all but the first two of each stream. Packet starts
+        # come from the lacing values of the pages, packets are not rebuilt.
+        offsets, first_lacing, serials = OggPackets.get_packet_starts(data, page_headers)
+
+        # rank of each packet in its stream
+        ranks = np.zeros(len(serials), dtype=np.int64)
+        for serial in np.unique(serials):
+            is_serial = serials == serial
+            ranks[is_serial] = np.arange(np.count_nonzero(is_serial))
+        is_audio = (ranks >= TocStats.HEADER_PACKET_COUNT) & (first_lacing > 0) # no empty packets
+        offsets = offsets[is_audio]
+        first_lacing = first_lacing[is_audio]
+
+        view = np.frombuffer(data, dtype=np.uint8)
+        second_offsets = np.minimum(offsets + 1, len(view) - 1)
+        second_bytes = np.where(first_lacing > 1, view[second_offsets], 0) # no frames if missing
+        return TocStats(view[offsets], second_bytes)
+
+    def print_me(self):
+        print('\033[0m----------')
+
+        print(self.format_string(is_printing=True))
+
+    def format_string(self, is_printing: bool = False):
+        string = ''
+        if not is_printing:
+            string += '----------\n'
+
+        string += 'packets:     {0}\n'.format(self.packet_count)
+        string += 'duration:    {0:.3f} s\n'.format(self.duration())
+        string += 'stereo:      {0}\n'.format(self.stereo_count)
+        for mode, count in self.mode_counts.items():
+            string += 'mode:        {0}: {1}\n'.format(mode.name, count)
+        for bandwidth, count in self.bandwidth_counts.items():
+            string += 'band:        {0}: {1}\n'.format(bandwidth.name, count)
+        for duration, count in self.duration_counts.items():
+            string += 'packet:      {0} ms: {1}\n'.format(duration, count)
+        return string
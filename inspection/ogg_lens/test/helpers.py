@@ -0,0 +1,21 @@
+import os
+import tempfile
+import unittest
+
+class FileTestCase(unittest.TestCase):
+    # test case with a temporary folder for input and output files
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def get_filename(self, name: str) -> str:
+        return os.path.join(self.folder.name, name)
+
+    def write_file(self, name: str, data: bytes) -> str:
+        filename = self.get_filename(name)
+        with open(filename, 'wb') as file:
+            file.write(data)
+        return filename
@@ -0,0 +1,17 @@
+from ogg_lens.ogg_format import OggFormat, PageHeader
+
+# Page walk before the struct based walker, reference for tests and benchmarks.
+
+def get_legacy_headers(data: bytearray) -> [PageHeader]:
+    # byte wise sync search, segment table in a python loop
+    headers = []
+    offset = 0
+    while offset < len(data) - PageHeader.HEADER_SIZE:
+        if OggFormat.is_magic_structure(data, offset):
+            header = OggFormat.get_header(data, offset)
+            if header:
+                headers.append(header)
+            offset += header.page_size - 1
+            continue
+        offset += 1
+    return headers
@@ -0,0 +1,39 @@
+import random
+import struct
+from ogg_lens.ogg_format import OggFormat
+
+# Synthetic ogg/opus pages, input of tests and benchmarks.
+
+PAGE_HEADER = struct.Struct('<4sBBqIIIB')
+
+# OpusHead: version 1, 2 channels, 312 pre-skip, 48 kHz, no gain, mapping 0
+OPUS_HEAD = b'OpusHead' + bytes([1, 2]) + (312).to_bytes(2, 'little') + (48000).to_bytes(4, 'little') + bytes(3)
+OPUS_TAGS = b'OpusTags' + (4).to_bytes(4, 'little') + b'test' + bytes(4)
+
+def make_page(packets: [bytes], granule: int, page_num: int, flags: int = 0, serial: int = 1) -> bytes:
+    # page with complete packets
+    table = bytearray()
+    for packet in packets:
+        table += b'\xff' * (len(packet) // 255)
+        table.append(len(packet) % 255)
+    return make_raw_page(bytes(table), b''.join(packets), granule, page_num, flags, serial)
+
+def make_raw_page(table: bytes, body: bytes, granule: int, page_num: int, flags: int = 0, serial: int = 1) -> bytes:
+    # page with given lacing values and valid checksum
+    header = PAGE_HEADER.pack(b'OggS', 0, flags, granule, serial, page_num, 0, len(table))
+    page = bytearray(header + table + body)
+    page[22:26] = OggFormat.crc32(page).to_bytes(4, 'little')
+    return bytes(page)
+
+def make_stream(page_count: int, packets_per_page: int = 50, packet_size: int = 160, seed: int = 0) -> bytes:
+    # Opus stream of 20 ms CELT packets (toc 0xFC)
+    rng = random.Random(seed)
+
+    pages = [make_page([OPUS_HEAD], 0, 0, flags=0x02), make_page([OPUS_TAGS], 0, 1)]
+    granule = 0
+    for page_num in range(2, page_count + 2):
+        packets = [b'\xfc' + rng.randbytes(packet_size - 1) for _ in range(packets_per_page)]
+        granule += packets_per_page * 960
+        flags = 0x04 if page_num == page_count + 1 else 0
+        pages.append(make_page(packets, granule, page_num, flags))
+    return b''.join(pages)
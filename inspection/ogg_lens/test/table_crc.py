@@ -0,0 +1,18 @@
+# Byte wise table implementation of the page checksum, reference for tests
+# and benchmarks.
+
+def get_table() -> [int]:
+    table = []
+    for value in range(256):
+        register = value << 24
+        for _ in range(8):
+            register = (register << 1) ^ 0x04C11DB7 if register & 0x80000000 else register << 1
+        table.append(register & 0xFFFFFFFF)
+    return table
+
+TABLE = get_table()
+
+def get_table_crc(data: bytearray, crc: int = 0) -> int:
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFFFFFF) ^ TABLE[(crc >> 24) ^ byte]
+    return crc
@@ -0,0 +1,96 @@
+import unittest
+from ogg_lens.granule_index import GranuleIndex, OggBisection
+from ogg_lens.ogg_format import OggFormat
+from test.helpers import FileTestCase
+from test.synthetic import OPUS_HEAD, OPUS_TAGS, make_page, make_raw_page, make_stream
+
+class GranuleIndexTests(FileTestCase):
+
+    # 1 s pages (50 packets of 20 ms), pre-skip 312
+
+    def setUp(self):
+        super().setUp()
+        self.data = make_stream(20)
+        self.headers = OggFormat.get_all_headers(self.data)
+        self.filename = self.write_file('a.opus', self.data)
+
+    def test_get_header_absolute_pos(self):
+        header = OggFormat.get_header(self.data, self.headers[3].offset)
+        self.assertEqual(header.absolute_pos, 2 * 48000)
+
+    def test_build(self):
+        indices = GranuleIndex.build(self.data, self.headers)
+        index = indices[1]
+        self.assertEqual(len(index), 22)
+        self.assertEqual(index.pre_skip, 312)
+        self.assertAlmostEqual(index.duration(), 20 - 312 / 48000)
+
+    def test_seek(self):
+        index = GranuleIndex.build(self.data, self.headers)[1]
+        self.assertEqual(index.seek(0), self.headers[2].offset)
+        self.assertEqual(index.seek(5.5), self.headers[7].offset) # page 7 ends at 6 s
+        self.assertEqual(index.seek(5.05), self.headers[6].offset) # pre-roll
+        self.assertEqual(index.seek(30), -1)
+
+    def test_bisection(self):
+        index = GranuleIndex.build(self.data, self.headers)[1]
+        with open(self.filename, 'rb') as file:
+            self.assertEqual(OggBisection.get_stream_info(file), (1, 312))
+            for seconds in [0, 1, 5.05, 5.5, 12.3, 19.9, 30]:
+                self.assertEqual(OggBisection.seek(file, seconds), index.seek(seconds))
+
+    def test_bisection_large_file(self):
+        data = make_stream(300)
+        index = GranuleIndex.build(data, OggFormat.get_all_headers(data))[1]
+        filename = self.write_file('large.opus', data)
+        with open(filename, 'rb') as file:
+            for seconds in [0, 17.4, 150, 299.5]:
+                self.assertEqual(OggBisection.seek(file, seconds), index.seek(seconds))
+
+    def test_bisection_damaged(self):
+        # damaged region of one probe size in the middle, below the target.
+        # The seek must not fall back to walking the upper half.
+        data = bytearray(make_stream(1000))
+        middle = len(data) // 2
+        data[middle : middle + OggBisection.PROBE_SIZE] = bytes(OggBisection.PROBE_SIZE)
+        index = GranuleIndex.build(data, OggFormat.get_all_headers(data))[1]
+        filename = self.write_file('damaged.opus', data)
+        with open(filename, 'rb') as file:
+            for seconds in [10, 499, 900]:
+                self.assertEqual(OggBisection.seek(file, seconds), index.seek(seconds))
+
+            read_sizes = []
+            read = file.read
+            file.read = lambda size: read_sizes.append(size) or read(size)
+            OggBisection.seek(file, 900)
+            self.assertLess(sum(read_sizes), len(data) // 4)
+
+    def cut(self, data: bytes, start: float, end: float = -1) -> bytes:
+        input_filename = self.write_file('input.opus', data)
+        output_filename = self.get_filename('clip.opus')
+        OggBisection.cut(input_filename, output_filename, start, end)
+        with open(output_filename, 'rb') as file:
+            return file.read()
+
+    def test_cut(self):
+        clip = self.cut(self.data, 5.5, 8.5)
+        headers = OggFormat.get_all_headers(clip)
+        self.assertEqual([header.page_num for header in headers], [0, 1, 2, 3, 4, 5])
+        self.assertEqual([header.absolute_pos for header in headers[2:]], [6 * 48000, 7 * 48000, 8 * 48000, 9 * 48000])
+        self.assertEqual([header.is_eos for header in headers], [False] * 5 + [True])
+        self.assertEqual(OggFormat.get_bad_crc_pages(clip, headers), [])
+
+    def test_cut_continued_start(self):
+        # page 3 starts with the rest of a packet, the clip starts behind it
+        data = make_page([OPUS_HEAD], 0, 0, flags=0x02) + make_page([OPUS_TAGS], 0, 1)
+        data += make_raw_page(b'\x64\xff', bytes(355), 960, 2)
+        data += make_raw_page(b'\x0a\x64', bytes(110), 2880, 3, flags=0x01)
+        data += make_page([bytes(100)], 3840, 4) + make_page([bytes(100)], 4800, 5)
+        headers = OggFormat.get_all_headers(self.cut(data, 0.1))
+        self.assertEqual([header.page_num for header in headers], [0, 1, 2, 3])
+        self.assertEqual([header.absolute_pos for header in headers], [0, 0, 3840, 4800])
+        self.assertFalse(headers[2].is_fresh)
+        self.assertTrue(headers[3].is_eos)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 import unittest
 import ogg_lens
 from ogg_lens.ogg_format import OggFormat, PageHeader
+from test.legacy import get_legacy_headers
+from test.synthetic import make_page, make_stream
+from test.table_crc import get_table_crc
 
 class OggFormatTests(unittest.TestCase):
 
@@ -21,5 +24,73 @@ class OggFormatTests(unittest.TestCase):
         result = OggFormat.is_magic_structure(data, 0)
         self.assertEqual(result, True)
 
+    # Granule position
+
+    def test_get_absolute_position(self):
+        data = bytes.fromhex('4f6767530000102700000000000000000000')
+        result = OggFormat.get_absolute_position(memoryview(data), 0)
+        self.assertEqual(result, 10000)
+
+    def test_get_absolute_position_unset(self):
+        data = bytes.fromhex('4f6767530000ffffffffffffffff000000000000')
+        result = OggFormat.get_absolute_position(data, 0)
+        self.assertEqual(result, -1)
+
+    # Page walk
+
+    def test_get_all_headers(self):
+        data = make_stream(10)
+        headers = OggFormat.get_all_headers(data)
+        self.assertEqual(len(headers), 12)
+        self.assertTrue(headers[0].is_bos)
+        self.assertTrue(headers[-1].is_eos)
+        self.assertEqual(headers[2].absolute_pos, 50 * 960)
+        self.assertEqual([header.page_num for header in headers], list(range(12)))
+        self.assertEqual(headers[-1].offset + headers[-1].page_size, len(data))
+
+    def test_get_all_headers_legacy(self):
+        data = make_stream(10)
+        for header, legacy_header in zip(OggFormat.get_all_headers(data), get_legacy_headers(data)):
+            self.assertEqual(header.offset, legacy_header.offset)
+            self.assertEqual(header.page_size, legacy_header.page_size)
+            self.assertEqual(header.segment_size_table, legacy_header.segment_size_table)
+            self.assertEqual(header.checksum, legacy_header.checksum)
+
+    def test_get_all_headers_sync_loss(self):
+        page = make_page([bytes(300)], 960, 0)
+        data = b'garbage' + page + bytes(100) + b'OggS\x01' + page + page[:20]
+        headers = OggFormat.get_all_headers(data)
+        self.assertEqual([header.offset for header in headers], [7, 7 + len(page) + 105])
+
+    def test_get_all_headers_memoryview(self):
+        page = make_page([bytes(300)], 960, 0)
+        data = bytes(OggFormat.SEARCH_CHUNK_SIZE + 2) + page
+        headers = OggFormat.get_all_headers(memoryview(data))
+        self.assertEqual([header.offset for header in headers], [OggFormat.SEARCH_CHUNK_SIZE + 2])
+
+    # Checksum
+
+    def test_crc32(self):
+        data = bytes(range(256)) * 3
+        self.assertEqual(OggFormat.crc32(b''), 0)
+        self.assertEqual(OggFormat.crc32(data), get_table_crc(data))
+        self.assertEqual(OggFormat.crc32(data[100:], OggFormat.crc32(data[:100])), get_table_crc(data))
+
+    def test_is_crc_valid(self):
+        data = make_stream(3)
+        headers = OggFormat.get_all_headers(data)
+        self.assertEqual(OggFormat.get_bad_crc_pages(data, headers), [])
+
+        page = headers[2]
+        damaged = bytearray(data)
+        damaged[page.offset + page.page_size - 1] ^= 0x01
+        self.assertEqual(OggFormat.get_bad_crc_pages(damaged, headers), [page])
+        self.assertTrue(OggFormat.is_crc_valid(memoryview(data), page))
+
+    def test_is_crc_valid_truncated(self):
+        data = make_stream(1)
+        headers = OggFormat.get_all_headers(data[:-1])
+        self.assertFalse(OggFormat.is_crc_valid(data[:-1], headers[-1]))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
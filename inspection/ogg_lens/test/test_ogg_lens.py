@@ -0,0 +1,36 @@
+import contextlib
+import io
+import os
+import unittest
+from ogg_lens.__main__ import Format, OggLens
+from test.helpers import FileTestCase
+from test.synthetic import make_stream
+
+class OggLensTests(FileTestCase):
+
+    def open_lens(self, data: bytes, format: Format, use_mmap: bool) -> OggLens:
+        filename = self.write_file('audio.opus', data)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return OggLens(filename, format, use_mmap)
+
+    def test_mmap_empty_file(self):
+        lens = self.open_lens(b'', Format.OGG_BITSTREAM, True)
+        self.assertIsNone(lens.mmap)
+        self.assertEqual(lens.page_headers, [])
+
+    def test_write_packets_and_close(self):
+        lens = self.open_lens(make_stream(3, packets_per_page=4), Format.OPUS_PACKET, True)
+        lens.write_frames(self.folder.name, 'audio')
+        self.assertEqual(len(os.listdir(self.get_filename('frames'))), 2 + 3 * 4)
+        lens.close()
+        self.assertIsNone(lens.mmap)
+
+    def test_close_with_view(self):
+        # a view still in use keeps the mapping open instead of raising
+        lens = self.open_lens(make_stream(3), Format.OGG_BITSTREAM, True)
+        view = lens.data[0:4]
+        lens.close()
+        self.assertEqual(bytes(view), b'OggS')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from ogg_lens.ogg_format import OggFormat
+from ogg_lens.ogg_packets import OggPackets
+from ogg_lens.opus_format import OpusFormat
+from test.synthetic import make_page, make_raw_page, make_stream
+
+class OggPacketsTests(unittest.TestCase):
+
+    def get_packets(self, data: bytes, serial: int = -1) -> list:
+        return OggPackets.get_packets(data, OggFormat.get_all_headers(data), serial)
+
+    def test_packets_in_page(self):
+        data = make_stream(3, packets_per_page=10)
+        packets = self.get_packets(data)
+        self.assertEqual(len(packets), 2 + 3 * 10)
+        self.assertEqual(bytes(packets[0].data[:8]), b'OpusHead')
+        self.assertIsInstance(packets[2].data, memoryview)
+        self.assertEqual(len(packets[2]), 160)
+        self.assertEqual(bytes(packets[2].data), data[packets[2].offset : packets[2].offset + 160])
+
+    def test_granule(self):
+        packets = self.get_packets(make_stream(2, packets_per_page=10))
+        self.assertEqual([packet.granule for packet in packets[2:12]], [-1] * 9 + [10 * 960])
+
+    def test_packet_across_pages(self):
+        # 600 byte packet: 255 + 255 on first page, 90 on second page
+        packet = bytes(range(200)) * 3
+        first = make_raw_page(b'\x0a\xff\xff', bytes(10) + packet[:510], 0, 0)
+        second = make_raw_page(b'\x5a\x05', packet[510:] + bytes(5), 1920, 1, flags=0x01)
+        packets = self.get_packets(first + second)
+        self.assertEqual([len(packet) for packet in packets], [10, 600, 5])
+        self.assertEqual(packets[1].data, packet)
+        self.assertEqual(packets[1].offset, 27 + 3 + 10)
+        self.assertEqual(packets[1].page_index, 1)
+        self.assertEqual(packets[2].granule, 1920)
+
+    def test_packet_over_three_pages(self):
+        packet = bytes(range(256)) * 3
+        first = make_raw_page(b'\xff', packet[:255], 0, 0)
+        second = make_raw_page(b'\xff', packet[255:510], -1, 1, flags=0x01)
+        third = make_raw_page(b'\xff\x03', packet[510:], 960, 2, flags=0x01)
+        packets = self.get_packets(first + second + third)
+        self.assertEqual(len(packets), 1)
+        self.assertEqual(packets[0].data, packet)
+
+    def test_missing_start(self):
+        # continued page without its start: rest of packet is dropped
+        page = make_raw_page(b'\x05\x0a', bytes(15), 960, 3, flags=0x01)
+        self.assertEqual([len(packet) for packet in self.get_packets(page)], [10])
+
+    def test_missing_continuation(self):
+        first = make_raw_page(b'\xff', bytes(255), 0, 0)
+        second = make_page([bytes(20)], 960, 2)
+        self.assertEqual([len(packet) for packet in self.get_packets(first + second)], [20])
+
+    def test_lost_page(self):
+        # page 1 with the middle of the packet is missing
+        first = make_raw_page(b'\xff', b'A' * 255, 0, 0)
+        third = make_raw_page(b'\x03\x14', b'CCC' + bytes(20), 960, 2, flags=0x01)
+        self.assertEqual([bytes(packet.data) for packet in self.get_packets(first + third)], [bytes(20)])
+
+    def test_interleaved_streams(self):
+        packet = bytes(300)
+        data = make_raw_page(b'\xff', packet[:255], 0, 0, serial=1)
+        data += make_page([bytes(7)], 0, 0, serial=2)
+        data += make_raw_page(b'\x2d', packet[255:], 960, 1, flags=0x01, serial=1)
+        self.assertEqual([len(packet) for packet in self.get_packets(data)], [7, 300])
+        self.assertEqual([len(packet) for packet in self.get_packets(data, serial=1)], [300])
+
+    def test_packet_starts(self):
+        # same starts as the rebuilt packets, also for packets across pages
+        data = make_raw_page(b'\x0a\xff\xff', bytes(520), 0, 0)
+        data += make_raw_page(b'\x5a\x00\x05', bytes(95), 1920, 1, flags=0x01)
+        data += make_stream(2, packets_per_page=3)
+        data += make_raw_page(b'\xff', bytes(255), -1, 0, serial=2) # never completed
+        headers = OggFormat.get_all_headers(data)
+        offsets, first_lacing, serials = OggPackets.get_packet_starts(data, headers)
+        packets = OggPackets.get_packets(data, headers)
+        self.assertEqual(offsets.tolist()[:-1], [packet.offset for packet in packets])
+        self.assertEqual(serials.tolist(), [1] * 12 + [2])
+        self.assertEqual(first_lacing.tolist()[:4], [10, 255, 0, 5])
+
+    def test_opus_headers(self):
+        data = make_stream(3)
+        headers = OpusFormat.get_all_headers(data)
+        self.assertEqual(len(headers), 1)
+        self.assertEqual(headers[0].offset, 28)
+        self.assertEqual(headers[0].pre_skip, 312)
+        self.assertEqual(headers[0].sample_rate, 48000)
+
+if __name__ == '__main__':
+    unittest.main()
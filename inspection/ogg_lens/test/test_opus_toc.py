@@ -0,0 +1,58 @@
+import numpy as np
+import unittest
+from ogg_lens.ogg_format import OggFormat
+from ogg_lens.ogg_packets import OggPackets
+from ogg_lens.opus_toc import Bandwidth, CodecMode, PacketToc, TocStats
+from test.synthetic import make_stream
+
+class OpusTocTests(unittest.TestCase):
+
+    # Toc
+
+    def test_toc_celt(self):
+        toc = PacketToc(0xFC) # config 31, stereo, 1 frame
+        self.assertEqual(toc.config, 31)
+        self.assertEqual(toc.mode, CodecMode.CELT)
+        self.assertEqual(toc.bandwidth, Bandwidth.FULL_BAND)
+        self.assertEqual(toc.duration, 20)
+        self.assertTrue(toc.is_stereo)
+        self.assertEqual(toc.channels, 2)
+        self.assertEqual(toc.frame_count_code, 0)
+
+    def test_toc_silk(self):
+        toc = PacketToc((9 << 3) | 0x01) # config 9, mono, 2 frames
+        self.assertEqual(toc.mode, CodecMode.SILK)
+        self.assertEqual(toc.bandwidth, Bandwidth.WIDE_BAND)
+        self.assertEqual(toc.duration, 20)
+        self.assertFalse(toc.is_stereo)
+        self.assertEqual(toc.channels, 1)
+        self.assertEqual(toc.frame_count_code, 1)
+
+    def test_toc_hybrid(self):
+        toc = PacketToc(14 << 3)
+        self.assertEqual(toc.mode, CodecMode.HYBRID)
+        self.assertEqual(toc.bandwidth, Bandwidth.FULL_BAND)
+        self.assertEqual(toc.duration, 10)
+
+    # Stats
+
+    def test_stats(self):
+        # celt 20 ms, silk 2 x 60 ms, hybrid 3 x 10 ms (code 3)
+        stats = TocStats(np.array([0xFC, (3 << 3) | 0x01, (12 << 3) | 0x03]), np.array([0, 0, 0x83]))
+        self.assertEqual(stats.packet_count, 3)
+        self.assertEqual(stats.stereo_count, 1)
+        self.assertEqual(stats.mode_counts[CodecMode.SILK], 1)
+        self.assertEqual(stats.mode_counts[CodecMode.HYBRID], 1)
+        self.assertEqual(stats.bandwidth_counts[Bandwidth.NARROW_BAND], 1)
+        self.assertEqual(stats.duration_counts, {20.0: 1, 30.0: 1, 120.0: 1})
+        self.assertAlmostEqual(stats.duration(), 0.17)
+
+    def test_stats_from_pages(self):
+        data = make_stream(4, packets_per_page=10)
+        stats = TocStats.from_pages(data, OggFormat.get_all_headers(data))
+        self.assertEqual(stats.packet_count, 40)
+        self.assertEqual(stats.mode_counts[CodecMode.CELT], 40)
+        self.assertAlmostEqual(stats.duration(), 0.8)
+
+if __name__ == '__main__':
+    unittest.main()
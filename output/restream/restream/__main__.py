@@ -1,5 +1,6 @@
 import sys
 import requests
+from typing import Callable, Optional
 from restream.network_client import NetworkClient
 from restream.util.log import Log
 
@@ -8,7 +9,8 @@ class Restreamer:
     def __init__(self):
         print('Init Restreamer')
         
-    def restream(self, url: str, client: NetworkClient, additional_headers: dict = None):
+    def restream(self, url: str, client: NetworkClient, additional_headers: dict = None, tap: Optional[Callable[[bytes], None]] = None):
+        # tap: called inline with every chunk before it is sent, e.g. feed of a stream parser
         session = requests.Session()
         if additional_headers:
             session.headers.update(additional_headers)
@@ -18,6 +20,8 @@ class Restreamer:
 
         for line in r.raw:
             if line:
+                if tap:
+                    tap(line)
                 if not client.send(line):
                     Log.error('Could not send.')
                     return